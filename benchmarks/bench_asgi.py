@@ -0,0 +1,89 @@
+"""
+Concurrency benchmark for slow ASGI applications served by the AsyncTCPListener
+through an ASGIHandler.
+
+Opens many client connections at once, each sending a request to an application
+that awaits for --delay seconds before streaming its response back in a few
+chunks. Reports how long it took for every response to come back and how many
+threads the server used: with one coroutine per request, the wall time stays close
+to a single delay and the thread count does not grow with the number of clients.
+
+    python benchmarks/bench_asgi.py --clients 1000 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import threading
+import time
+
+from edunet.core.networking.handlers.asgi_handler import ASGIHandler
+from edunet.core.networking.listeners.async_tcp_listener import AsyncTCPListener
+
+REQUEST = b"GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+
+
+def make_application(delay):
+    async def application(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for _ in range(3):
+            await asyncio.sleep(delay / 3)
+            await send({"type": "http.response.body", "body": b"x", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    return application
+
+
+async def fetch(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(REQUEST)
+    response = await reader.read()
+    writer.close()
+    return response.endswith(b"0\r\n\r\n")
+
+
+async def run_clients(port, clients):
+    results = await asyncio.gather(*(fetch(port) for _ in range(clients)))
+    return sum(results)
+
+
+def run(args):
+    listener = AsyncTCPListener(
+        "127.0.0.1", 0, ASGIHandler(make_application(args.delay)), backlog=args.clients
+    )
+    server = threading.Thread(target=listener.start)
+    server.start()
+    while not listener.is_listening:
+        time.sleep(0.01)
+    port = listener.server_socket.getsockname()[1]
+
+    try:
+        threads_before = threading.active_count()
+        started = time.perf_counter()
+        completed = asyncio.run(run_clients(port, args.clients))
+        elapsed = time.perf_counter() - started
+        threads_after = threading.active_count()
+    finally:
+        listener.stop()
+        server.join()
+
+    print(
+        f"{args.clients} concurrent requests to an application awaiting {args.delay}s"
+    )
+    print(f"  completed   : {completed}")
+    print(f"  wall time   : {elapsed:.2f}s ({elapsed / args.delay:.1f}x one request)")
+    print(f"  threads     : {threads_before} before, {threads_after} after")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark for answering repeated GETs from a CachingApplication.
+
+Times a SimpleHTTPConnectionHandler handling an already parsed request, with an
+application that renders a small page, on its own and behind a CachingApplication
+whose cache is warm. A hit skips the application and the serialization of the
+status line and headers.
+
+    python benchmarks/bench_cache.py --number 100000
+"""
+
+import argparse
+import logging
+import timeit
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.caching_application import CachingApplication
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.models.http import HTTPResponse
+
+REQUEST = (
+    b"GET /items?page=2 HTTP/1.1\r\n"
+    b"Host: localhost:8080\r\n"
+    b"User-Agent: bench\r\n"
+    b"Accept: text/html\r\n"
+    b"\r\n"
+)
+
+
+class PageApplication(Application):
+    def handle_request(self, request_data):
+        rows = "".join(f"<li>Item {index}</li>" for index in range(50))
+        return HTTPResponse(
+            status_code=200,
+            status_text="OK",
+            body=f"<ul>{rows}</ul>",
+            content_type="text/html; charset=utf-8",
+            additional_headers={"Cache-Control": "max-age=60", "X-Page": "2"},
+        )
+
+
+def measure(application, number):
+    handler = SimpleHTTPConnectionHandler(application)
+    request = HTTPRequestParser().feed(REQUEST)[0]
+    handler.handle_connection(request, None)
+    best = min(
+        timeit.repeat(lambda: handler.handle_connection(request, None), number=number)
+    )
+    return best / number * 1e6
+
+
+def run(args):
+    print(f"{args.number} repeated requests")
+    uncached = measure(PageApplication(), args.number)
+    cache = CachingApplication(PageApplication())
+    cached = measure(cache, args.number)
+    print(f"  uncached : {uncached:.2f} us/request")
+    print(f"  cached   : {cached:.2f} us/request ({uncached / cached:.1f}x)")
+    print(f"  hits {cache.hits}, misses {cache.misses}, evictions {cache.evictions}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Thundering-herd benchmark for a CoalescingApplication.
+
+Many threads send the same GET at once, like a burst of clients polling the same
+resource, to an application whose every request queries a backend that serves a
+few queries at a time and takes --delay seconds per query. Reports how many times
+the backend was queried and how long it took for every request to be answered,
+with and without coalescing.
+
+    python benchmarks/bench_coalescing.py --clients 200 --delay 0.02
+"""
+
+import argparse
+import logging
+import threading
+import time
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.coalescing_application import CoalescingApplication
+from edunet.models.http import HTTPRequest, HTTPResponse
+
+
+class BackendApplication(Application):
+    def __init__(self, delay, connections):
+        self.delay = delay
+        self.backend = threading.Semaphore(connections)
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def handle_request(self, request_data):
+        with self.backend:
+            with self._lock:
+                self.queries += 1
+            time.sleep(self.delay)
+        return HTTPResponse(status_code=200, status_text="OK", body="report")
+
+
+def measure(application, clients):
+    request = HTTPRequest(
+        method=b"GET", uri=b"/report", version=b"HTTP/1.1", headers={}, body=b""
+    )
+    start = threading.Barrier(clients + 1)
+
+    def client():
+        start.wait()
+        application.handle_request(request)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def run(args):
+    print(
+        f"{args.clients} identical requests at once, backend taking {args.delay}s "
+        f"with {args.connections} connections"
+    )
+    for label, coalesce in (("direct", False), ("coalesced", True)):
+        backend = BackendApplication(args.delay, args.connections)
+        application = CoalescingApplication(backend) if coalesce else backend
+        elapsed = measure(application, args.clients)
+        print(f"  {label:<10}: {elapsed:.3f}s, {backend.queries} backend queries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--connections", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark for compressing responses with a CompressingApplication.
+
+Times a SimpleHTTPConnectionHandler handling an already parsed request that accepts
+gzip, with an application that renders an HTML page, on its own, behind a
+CompressingApplication whose cache is disabled, so every body is compressed, and
+behind one whose cache is warm. For each it reports the bytes sent and the latency
+of a response over a link of the given bandwidth: the time to handle the request
+plus the time to transfer the response.
+
+    python benchmarks/bench_compression.py --number 10000 --bandwidth 10
+"""
+
+import argparse
+import logging
+import timeit
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.compressing_application import CompressingApplication
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.models.http import HTTPResponse
+
+REQUEST = (
+    b"GET /items HTTP/1.1\r\n"
+    b"Host: localhost:8080\r\n"
+    b"User-Agent: bench\r\n"
+    b"Accept: text/html\r\n"
+    b"Accept-Encoding: gzip, deflate, br\r\n"
+    b"\r\n"
+)
+
+
+class PageApplication(Application):
+    def handle_request(self, request_data):
+        rows = "".join(
+            f'<tr><td class="id">{index}</td><td class="name">Item {index}</td>'
+            f'<td class="price">{index * 3 % 100}.99</td></tr>'
+            for index in range(500)
+        )
+        return HTTPResponse(
+            status_code=200,
+            status_text="OK",
+            body=f"<table>{rows}</table>",
+            content_type="text/html; charset=utf-8",
+        )
+
+
+def measure(application, number):
+    handler = SimpleHTTPConnectionHandler(application)
+    request = HTTPRequestParser().feed(REQUEST)[0]
+    size = sum(len(buffer) for buffer in handler.handle_connection(request, None))
+    best = min(
+        timeit.repeat(lambda: handler.handle_connection(request, None), number=number)
+    )
+    return size, best / number * 1e6
+
+
+def run(args):
+    bytes_per_us = args.bandwidth * 1e6 / 8 / 1e6
+    print(f"{args.number} repeated requests, {args.bandwidth:g} Mbit/s link")
+    results = [
+        ("identity", measure(PageApplication(), args.number)),
+        (
+            "gzip",
+            measure(
+                CompressingApplication(PageApplication(), max_cached_body=0),
+                args.number,
+            ),
+        ),
+        (
+            "gzip cached",
+            measure(CompressingApplication(PageApplication()), args.number),
+        ),
+    ]
+    for name, (size, handling) in results:
+        latency = handling + size / bytes_per_us
+        print(
+            f"  {name:<11} : {size:6d} bytes, {handling:8.2f} us/request, "
+            f"{latency / 1000:6.2f} ms latency"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument(
+        "--bandwidth", type=float, default=10.0, help="link bandwidth in Mbit/s"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark for HTTPRequest.from_bytes.
+
+Compares the single-pass parser against the previous regular expression based path
+(split on the empty line, split into lines, match the request line and every header
+against a pattern, then split the request line again) on a typical request and on
+a header-heavy one.
+
+    python benchmarks/bench_http_parser.py --number 20000
+"""
+
+import argparse
+import logging
+import re
+import timeit
+
+from edunet.exceptions import HTTPDataModelError, HTTPValidationError
+from edunet.models.http import HTTPRequest
+
+REQUEST_LINE_PATTERN = re.compile(rb"^[A-Z]+ [^\r\n]* HTTP/(1\.[01]|2\.0)$")
+HEADER_PATTERN = re.compile(rb"^[^\r\n]+: [^\r\n]*$")
+
+TYPICAL_REQUEST = (
+    b"GET /index.html?page=2 HTTP/1.1\r\n"
+    b"Host: www.example.com\r\n"
+    b"User-Agent: Mozilla/5.0 (X11; Linux x86_64)\r\n"
+    b"Accept: text/html,application/xhtml+xml\r\n"
+    b"Accept-Language: en-US,en;q=0.5\r\n"
+    b"Accept-Encoding: gzip, deflate\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+)
+
+HEADER_HEAVY_REQUEST = (
+    b"POST /api/v1/items HTTP/1.1\r\n"
+    + b"".join(
+        b"X-Custom-Header-%d: value-%d-%s\r\n" % (i, i, b"x" * 40) for i in range(60)
+    )
+    + b"Content-Type: application/json\r\n"
+    + b"Content-Length: 16\r\n"
+    + b"\r\n"
+    + b'{"key": "value"}'
+)
+
+
+def regex_from_bytes(data: bytes) -> HTTPRequest:
+    """
+    The regular expression based parsing HTTPRequest.from_bytes used to do
+    """
+    try:
+        components = data.split(b"\r\n\r\n", 1)
+        lines = components[0].split(b"\r\n")
+        request_line, header_lines = lines[0], lines[1:]
+        body = components[1] if len(components) > 1 else b""
+
+        if not re.match(REQUEST_LINE_PATTERN, request_line):
+            raise HTTPValidationError(f"Invalid request line pattern: {request_line!r}")
+
+        headers = {}
+        for header in header_lines:
+            if not re.match(HEADER_PATTERN, header):
+                raise HTTPValidationError(f"Invalid header pattern: {header!r}")
+            name, value = header.split(b": ", 1)
+            headers[name] = value
+
+        method, uri, version = request_line.split(b" ")
+        return HTTPRequest(
+            method=method, uri=uri, version=version, headers=headers, body=body
+        )
+    except (AttributeError, HTTPValidationError) as e:
+        raise HTTPDataModelError(f"Error creating Request object: {e}")
+
+
+def run(args):
+    for name, request in (
+        ("typical", TYPICAL_REQUEST),
+        ("header-heavy", HEADER_HEAVY_REQUEST),
+    ):
+        assert regex_from_bytes(request) == HTTPRequest.from_bytes(request)
+
+        timings = {}
+        for label, parse in (
+            ("regex", regex_from_bytes),
+            ("single-pass", HTTPRequest.from_bytes),
+        ):
+            best = min(
+                timeit.repeat(
+                    lambda: parse(request), number=args.number, repeat=args.repeat
+                )
+            )
+            timings[label] = best / args.number * 1e6
+
+        print(f"{name} request ({len(request)} bytes)")
+        for label, per_call in timings.items():
+            print(f"  {label:<12}: {per_call:.2f} us/request")
+        print(f"  speedup     : {timings['regex'] / timings['single-pass']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
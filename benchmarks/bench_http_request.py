@@ -0,0 +1,101 @@
+"""
+Micro-benchmark for building HTTPRequest objects for an application that only routes
+on the path.
+
+Compares the previous HTTPRequest, an eager dataclass whose headers were split into
+a dict up front, against the current slotted one, which keeps its headers as the raw
+header block and splits the URI only when asked. Reports the time to build a request
+and read its path, and, through tracemalloc, the memory held per request while a
+batch of them is queued up.
+
+    python benchmarks/bench_http_request.py --number 100000
+"""
+
+import argparse
+import logging
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict
+
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.models.http import HTTPRequest
+from edunet.validators.http_validators import parse_http_request
+
+REQUEST = (
+    b"GET /api/v1/items?page=2 HTTP/1.1\r\n"
+    b"Host: www.example.com\r\n"
+    b"User-Agent: Mozilla/5.0 (X11; Linux x86_64)\r\n"
+    b"Accept: application/json\r\n"
+    b"Accept-Language: en-US,en;q=0.5\r\n"
+    b"Accept-Encoding: gzip, deflate\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+)
+
+
+@dataclass
+class PreviousHTTPRequest:
+    """
+    The HTTPRequest as it used to be
+    """
+
+    method: bytes
+    uri: bytes
+    version: bytes
+    headers: Dict[bytes, bytes]
+    body: bytes
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PreviousHTTPRequest":
+        return cls(*parse_http_request(data))
+
+    @property
+    def path(self) -> bytes:
+        return self.uri.partition(b"?")[0]
+
+
+def per_request_memory(build, count):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    queued = [build() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queued
+    return (after - before) / count
+
+
+def run(args):
+    parser = HTTPRequestParser()
+    assert PreviousHTTPRequest.from_bytes(REQUEST).path == b"/api/v1/items"
+    assert parser.feed(REQUEST)[0].path == b"/api/v1/items"
+
+    print(f"GET request with {REQUEST.count(b': ')} headers, application reads path")
+    for label, build in (
+        ("previous", lambda: PreviousHTTPRequest.from_bytes(REQUEST)),
+        ("lazy", lambda: HTTPRequest.from_bytes(REQUEST)),
+        ("lazy parser", lambda: parser.feed(REQUEST)[0]),
+    ):
+        best = min(
+            timeit.repeat(lambda: build().path, number=args.number, repeat=args.repeat)
+        )
+        memory = per_request_memory(build, args.queued)
+        print(
+            f"  {label:<12}: {best / args.number * 1e9:.0f} ns/request, "
+            f"{memory:.0f} bytes/queued request"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--queued", type=int, default=10000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
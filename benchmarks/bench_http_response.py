@@ -0,0 +1,83 @@
+"""
+Micro-benchmark for serializing the common 200 response.
+
+Compares the previous HTTPResponse.to_bytes, which formatted and encoded the status
+line and every header line on each call, against the current one, which takes them
+from the status line table and the header line cache, and against a response made
+from an HTTPResponseTemplate, whose static headers are serialized once.
+
+    python benchmarks/bench_http_response.py --number 200000
+"""
+
+import argparse
+import logging
+import timeit
+
+from edunet.models.http import HTTPResponse, HTTPResponseTemplate
+
+BODY = "Hello, world!"
+CONTENT_TYPE = "text/plain; charset=utf-8"
+HEADERS = {"Server": "edunet", "Cache-Control": "no-cache"}
+
+TEMPLATE = HTTPResponseTemplate(200, "OK", content_type=CONTENT_TYPE, headers=HEADERS)
+
+
+def previous_to_bytes(response: HTTPResponse) -> bytes:
+    """
+    The serialization HTTPResponse.to_bytes used to do
+    """
+    status_line = (
+        f"{response.http_version} {response.status_code} "
+        f"{response.status_text}\r\n".encode("utf-8")
+    )
+
+    headers = f"Content-Length: {len(response.body)}\r\n".encode("utf-8")
+    if response.content_type:
+        headers += f"Content-Type: {response.content_type}\r\n".encode("utf-8")
+    if response.additional_headers:
+        for key, value in response.additional_headers.items():
+            headers += f"{key}: {value}\r\n".encode("utf-8")
+    headers += b"\r\n"
+
+    return status_line + headers + response.body.encode("utf-8")
+
+
+def run(args):
+    response = HTTPResponse(
+        status_code=200,
+        status_text="OK",
+        body=BODY,
+        content_type=CONTENT_TYPE,
+        additional_headers=HEADERS,
+    )
+    templated = TEMPLATE.response(body=BODY)
+    assert previous_to_bytes(response) == response.to_bytes() == templated.to_bytes()
+
+    timings = {}
+    for label, serialize in (
+        ("previous", lambda: previous_to_bytes(response)),
+        ("cached", response.to_bytes),
+        ("template", templated.to_bytes),
+        ("template bufs", templated.to_buffers),
+    ):
+        best = min(timeit.repeat(serialize, number=args.number, repeat=args.repeat))
+        timings[label] = best / args.number * 1e9
+
+    print(f"200 response with {len(HEADERS) + 2} headers")
+    for label, per_call in timings.items():
+        speedup = timings["previous"] / per_call
+        print(f"  {label:<14}: {per_call:.0f} ns/response ({speedup:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for the per-request overhead of a MiddlewareApplication.
+
+Times handling a request with the bare application, with the application wrapped in
+a stack of no-op middlewares, and with the same stack walked per request the way a
+list of (request, call_next) middlewares is usually dispatched. The composed stack
+should cost about one function call per middleware on top of the bare application.
+
+    python benchmarks/bench_middleware.py --middlewares 10
+"""
+
+import argparse
+import logging
+import timeit
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.middleware_application import MiddlewareApplication
+from edunet.models.http import HTTPRequest, HTTPResponse
+
+RESPONSE = HTTPResponse(status_code=200, status_text="OK", body="")
+
+
+class BareApplication(Application):
+    def handle_request(self, request_data):
+        return RESPONSE
+
+
+def noop(next_handler):
+    def handler(request):
+        return next_handler(request)
+
+    return handler
+
+
+class DispatchingApplication(Application):
+    """
+    Middleware stack dispatched per request, for comparison
+    """
+
+    def __init__(self, application, middlewares):
+        self.application = application
+        self.middlewares = middlewares
+
+    def handle_request(self, request_data):
+        def call(index, request):
+            if index == len(self.middlewares):
+                return self.application.handle_request(request)
+            return self.middlewares[index](
+                request, lambda request: call(index + 1, request)
+            )
+
+        return call(0, request_data)
+
+
+def noop_dispatched(request, call_next):
+    return call_next(request)
+
+
+def measure(application, request, number):
+    best = min(
+        timeit.repeat(lambda: application.handle_request(request), number=number)
+    )
+    return best / number * 1e6
+
+
+def run(args):
+    request = HTTPRequest(
+        method=b"GET", uri=b"/", version=b"HTTP/1.1", headers={}, body=b""
+    )
+    bare = BareApplication()
+    print(f"{args.middlewares} no-op middlewares, {args.number} requests")
+    baseline = measure(bare, request, args.number)
+    for label, application in (
+        ("bare", bare),
+        ("composed", MiddlewareApplication(bare, [noop] * args.middlewares)),
+        (
+            "dispatched",
+            DispatchingApplication(bare, [noop_dispatched] * args.middlewares),
+        ),
+    ):
+        elapsed = measure(application, request, args.number)
+        print(f"  {label:<11}: {elapsed:.3f} us/request (+{elapsed - baseline:.3f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--middlewares", type=int, default=10)
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Micro-benchmark for the receive path: reading a request off a socket and parsing it.
+
+Compares recv() returning a fresh bytes object per read against recv_into() a buffer
+taken from a BufferPool and handed to the parser as a memoryview. Both sides read
+pipelined requests from a socketpair into an HTTPRequestParser. Reports the time per
+request and, through tracemalloc, the peak memory allocated while reading.
+
+    python benchmarks/bench_receive_path.py --requests 20000
+"""
+
+import argparse
+import logging
+import socket
+import threading
+import time
+import tracemalloc
+
+from edunet.core.networking.buffer_pool import BufferPool
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.core.networking.listeners.listener import READ_CHUNK_SIZE
+
+REQUEST = (
+    b"POST /api/v1/items HTTP/1.1\r\n"
+    b"Host: www.example.com\r\n"
+    b"User-Agent: Mozilla/5.0 (X11; Linux x86_64)\r\n"
+    b"Accept: application/json\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 16\r\n"
+    b"\r\n"
+    b'{"key": "value"}'
+)
+
+
+def read_with_recv(client_socket, parser):
+    count = 0
+    while True:
+        data = client_socket.recv(READ_CHUNK_SIZE)
+        if not data:
+            return count
+        count += len(parser.feed(data))
+
+
+def read_with_recv_into(client_socket, parser, pool=BufferPool(READ_CHUNK_SIZE)):
+    count = 0
+    buffer = pool.acquire()
+    view = memoryview(buffer)
+    try:
+        while True:
+            nbytes = client_socket.recv_into(buffer)
+            if not nbytes:
+                return count
+            count += len(parser.feed(view[:nbytes]))
+    finally:
+        view.release()
+        pool.release(buffer)
+
+
+def measure(read, requests, trace):
+    server_side, client_side = socket.socketpair()
+    payload = REQUEST * requests
+    sender = threading.Thread(
+        target=lambda: (client_side.sendall(payload), client_side.close())
+    )
+
+    if trace:
+        tracemalloc.start()
+    sender.start()
+    started = time.perf_counter()
+    count = read(server_side, HTTPRequestParser())
+    elapsed = time.perf_counter() - started
+    sender.join()
+    server_side.close()
+
+    peak = 0
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    assert count == requests, (count, requests)
+    return elapsed, peak
+
+
+def run(args):
+    print(f"{args.requests} pipelined requests of {len(REQUEST)} bytes")
+    for label, read in (("recv", read_with_recv), ("recv_into", read_with_recv_into)):
+        elapsed = min(
+            measure(read, args.requests, trace=False)[0] for _ in range(args.repeat)
+        )
+        _, peak = measure(read, args.requests, trace=True)
+        print(
+            f"  {label:<10}: {elapsed / args.requests * 1e6:.2f} us/request, "
+            f"peak traced memory {peak / 1024:.0f} KiB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
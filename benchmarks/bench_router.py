@@ -0,0 +1,113 @@
+"""
+Micro-benchmark for looking routes up in a RouterApplication as the number of
+registered routes grows.
+
+Registers a mix of static, parameter and wildcard routes and times dispatching a
+request to the last route registered, against a router that tries each route's
+regular expression in turn. The radix tree's lookup time should stay flat while
+the linear scan grows with the number of routes.
+
+    python benchmarks/bench_router.py --routes 10 100 1000 10000
+"""
+
+import argparse
+import logging
+import re
+import timeit
+
+from edunet.core.applications.router_application import RouterApplication
+from edunet.models.http import HTTPRequest, HTTPResponse
+
+RESPONSE = HTTPResponse(status_code=200, status_text="OK", body="")
+
+
+def handler(request, **params):
+    return RESPONSE
+
+
+def route_paths(count):
+    for index in range(count):
+        kind = index % 3
+        if kind == 0:
+            yield f"/api/v1/resource{index}/items"
+        elif kind == 1:
+            yield f"/api/v1/resource{index}/items/:item_id"
+        else:
+            yield f"/files/bucket{index}/*path"
+
+
+def concrete_path(route):
+    return route.replace(":item_id", "42").replace("*path", "a/b/c.txt").encode()
+
+
+class LinearRouter:
+    """
+    Tries the regular expression of every route in registration order
+    """
+
+    def __init__(self):
+        self.routes = []
+
+    def add_route(self, method, path, handler):
+        pattern = re.sub(r":(\w+)", r"(?P<\1>[^/]+)", path)
+        pattern = re.sub(r"\*(\w+)", r"(?P<\1>.*)", pattern)
+        self.routes.append((method.encode(), re.compile(pattern.encode()), handler))
+
+    def handle_request(self, request):
+        for method, pattern, route_handler in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match and method == request.method:
+                return route_handler(request, **match.groupdict())
+        return None
+
+
+def run(args):
+    print("Dispatching to the last route registered")
+    for count in args.routes:
+        routes = list(route_paths(count))
+        request = HTTPRequest(
+            method=b"GET",
+            uri=concrete_path(routes[-1]),
+            version=b"HTTP/1.1",
+            headers={},
+            body=b"",
+        )
+
+        timings = {}
+        for label, router in (
+            ("radix", RouterApplication()),
+            ("linear", LinearRouter()),
+        ):
+            for route in routes:
+                router.add_route("GET", route, handler)
+            assert router.handle_request(request) is RESPONSE
+
+            number = max(args.number // count, 10) if label == "linear" else args.number
+            best = min(
+                timeit.repeat(
+                    lambda: router.handle_request(request),
+                    number=number,
+                    repeat=args.repeat,
+                )
+            )
+            timings[label] = best / number * 1e9
+
+        print(
+            f"  {count:>6} routes: radix {timings['radix']:.0f} ns/lookup, "
+            f"linear {timings['linear']:.0f} ns/lookup"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--number", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Throughput benchmark for serving a large file with StaticFileApplication, against
+an application that reads the file into the response body on every request.
+
+Both are served over loopback by a TCPListener with a worker pool. Clients download
+the file over and over on kept-alive connections; with os.sendfile the file goes
+from the page cache to the socket without being copied through Python.
+
+    python benchmarks/bench_static.py --size-mb 64 --requests 50 --clients 4
+"""
+
+import argparse
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.static_file_application import StaticFileApplication
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.core.networking.listeners.tcp_listener import TCPListener
+from edunet.models.http import HTTPResponseTemplate
+
+OK = HTTPResponseTemplate(200, "OK", content_type="application/octet-stream")
+
+
+class ReadingApplication(Application):
+    """
+    Serves files by reading them into the response body, for comparison
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def handle_request(self, request_data):
+        with open(os.path.join(self.root, request_data.path.decode()[1:]), "rb") as f:
+            return OK.response(body=f.read())
+
+
+def download(port, path, requests):
+    request = b"GET /%s HTTP/1.1\r\nHost: localhost\r\n\r\n" % path.encode()
+    buffer = bytearray(1024 * 1024)
+    view = memoryview(buffer)
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        for _ in range(requests):
+            client.sendall(request)
+            received = client.recv_into(view)
+            head_end = buffer.find(b"\r\n\r\n", 0, received) + 4
+            length = int(
+                buffer[:head_end].split(b"Content-Length: ")[1].split(b"\r\n")[0]
+            )
+            remaining = length - (received - head_end)
+            while remaining:
+                remaining -= client.recv_into(view, min(remaining, len(buffer)))
+
+
+def measure(application, path, size, requests, clients):
+    listener = TCPListener(
+        "127.0.0.1",
+        0,
+        SimpleHTTPConnectionHandler(application),
+        max_workers=clients,
+        max_keep_alive_requests=requests + 1,
+    )
+    server = threading.Thread(target=listener.start)
+    server.start()
+    while not listener.is_listening:
+        time.sleep(0.01)
+    port = listener.server_socket.getsockname()[1]
+
+    try:
+        workers = [
+            threading.Thread(target=download, args=(port, path, requests))
+            for _ in range(clients)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        listener.stop()
+        server.join()
+    return size * requests * clients / elapsed / 1024 / 1024
+
+
+def run(args):
+    size = args.size_mb * 1024 * 1024
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, "artifact.bin"), "wb") as f:
+            f.write(os.urandom(size))
+
+        print(
+            f"{args.clients} clients downloading a {args.size_mb} MiB file "
+            f"{args.requests} times each"
+        )
+        for label, application in (
+            ("sendfile", StaticFileApplication(root)),
+            ("read", ReadingApplication(root)),
+        ):
+            throughput = measure(
+                application, "artifact.bin", size, args.requests, args.clients
+            )
+            print(f"  {label:<9}: {throughput:.0f} MiB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
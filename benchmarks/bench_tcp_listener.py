@@ -0,0 +1,211 @@
+"""
+Load benchmark for the TCP listeners.
+
+Starts a SimpleHTTP stack on a local port in a background thread, fires a burst of
+concurrent HTTP requests at it and reports throughput along with p50/p99 latency.
+
+    python benchmarks/bench_tcp_listener.py --mode thread --requests 5000
+    python benchmarks/bench_tcp_listener.py --mode pool --workers 32 --queue-size 512
+    python benchmarks/bench_tcp_listener.py --mode selector --slow-clients 2000
+
+Use --processes to run the listener in that many pre-forked worker processes sharing
+the port through SO_REUSEPORT.
+
+Use --keep-alive to send that many requests over each connection instead of opening a
+new connection per request.
+
+Use --slow-clients to hold a number of idle connections open during the burst, which
+shows whether a stalled client holds up accepting everybody else.
+"""
+
+import argparse
+import logging
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from edunet.core.applications.simple_http_application import SimpleHTTPApplication
+from edunet.core.concurrency.worker_pool import OverflowPolicy
+from edunet.core.networking.handlers.async_http_connection_handler import (
+    AsyncHTTPConnectionHandler,
+)
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.core.networking.listeners.async_tcp_listener import AsyncTCPListener
+from edunet.core.networking.listeners.selector_listener import SelectorListener
+from edunet.core.networking.listeners.tcp_listener import TCPListener
+from edunet.core.nodes.prefork_node import PreforkNode
+
+REQUEST = b"GET / HTTP/1.1\r\nHost: localhost\r\nUser-Agent: bench\r\n\r\n"
+CLOSE_REQUEST = (
+    b"GET / HTTP/1.1\r\nHost: localhost\r\nUser-Agent: bench\r\n"
+    b"Connection: close\r\n\r\n"
+)
+
+
+def build_listener(args):
+    handler = SimpleHTTPConnectionHandler(SimpleHTTPApplication())
+    reuse_port = args.processes > 1
+
+    if args.mode == "async":
+        return AsyncTCPListener(
+            args.host,
+            args.port,
+            AsyncHTTPConnectionHandler(SimpleHTTPApplication()),
+            reuse_port=reuse_port,
+        )
+
+    if args.mode == "selector":
+        return SelectorListener(args.host, args.port, handler, reuse_port=reuse_port)
+
+    if args.mode == "thread":
+        return TCPListener(
+            args.host,
+            args.port,
+            handler,
+            client_timeout=args.client_timeout,
+            reuse_port=reuse_port,
+        )
+
+    return TCPListener(
+        args.host,
+        args.port,
+        handler,
+        max_workers=args.workers,
+        queue_size=args.queue_size,
+        overflow=OverflowPolicy(args.overflow),
+        client_timeout=args.client_timeout,
+        reuse_port=reuse_port,
+    )
+
+
+def read_response(client, buffer):
+    """
+    Read one Content-Length delimited response, returning it and any bytes past it
+    """
+    while b"\r\n\r\n" not in buffer:
+        chunk = client.recv(65536)
+        if not chunk:
+            return None, b""
+        buffer += chunk
+
+    head, _, rest = buffer.partition(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+
+    while len(rest) < length:
+        chunk = client.recv(65536)
+        if not chunk:
+            return None, b""
+        rest += chunk
+    return head + b"\r\n\r\n" + rest[:length], rest[length:]
+
+
+def send_requests(host, port, count):
+    """
+    Send count requests over one connection, returning the latency of each one or
+    None for the requests that failed
+    """
+    latencies = []
+    try:
+        with socket.create_connection((host, port), timeout=30) as client:
+            buffer = b""
+            for index in range(count):
+                started = time.perf_counter()
+                client.sendall(CLOSE_REQUEST if index == count - 1 else REQUEST)
+                response, buffer = read_response(client, buffer)
+                if response is None or not response.startswith(b"HTTP/1.1 200"):
+                    break
+                latencies.append(time.perf_counter() - started)
+    except OSError:
+        pass
+
+    return latencies + [None] * (count - len(latencies))
+
+
+def percentile(samples, pct):
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def run(args):
+    if args.processes > 1:
+        server = PreforkNode(lambda: build_listener(args), workers=args.processes)
+    else:
+        server = build_listener(args)
+
+    server_thread = threading.Thread(target=server.start, daemon=True)
+    server_thread.start()
+    time.sleep(0.2 * args.processes)
+
+    # Idle clients that connect and never send a request
+    slow_clients = [
+        socket.create_connection((args.host, args.port))
+        for _ in range(args.slow_clients)
+    ]
+
+    started = time.perf_counter()
+    batches = [args.keep_alive] * (args.requests // args.keep_alive)
+    if args.requests % args.keep_alive:
+        batches.append(args.requests % args.keep_alive)
+    with ThreadPoolExecutor(max_workers=args.concurrency) as clients:
+        results = [
+            latency
+            for batch in clients.map(
+                lambda count: send_requests(args.host, args.port, count), batches
+            )
+            for latency in batch
+        ]
+    elapsed = time.perf_counter() - started
+
+    for slow_client in slow_clients:
+        slow_client.close()
+    server.stop()
+
+    latencies = sorted(r for r in results if r is not None)
+    failures = len(results) - len(latencies)
+
+    print(
+        f"mode={args.mode} requests={args.requests} concurrency={args.concurrency} "
+        f"slow_clients={args.slow_clients} processes={args.processes} "
+        f"keep_alive={args.keep_alive}"
+    )
+    print(f"  completed : {len(latencies)} ({failures} failed)")
+    print(f"  throughput: {len(latencies) / elapsed:,.0f} req/s")
+    if latencies:
+        print(f"  p50       : {statistics.median(latencies) * 1000:.2f} ms")
+        print(f"  p99       : {percentile(latencies, 99) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--mode", choices=["thread", "pool", "selector", "async"], default="pool"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9998)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--queue-size", type=int, default=1024)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--keep-alive", type=int, default=1)
+    parser.add_argument("--slow-clients", type=int, default=0)
+    parser.add_argument("--client-timeout", type=float, default=None)
+    parser.add_argument(
+        "--overflow", choices=[p.value for p in OverflowPolicy], default="block"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Throughput benchmark for serving a WSGI application through WSGIHandler, against
+the same response from an Application through SimpleHTTPConnectionHandler.
+
+Both handlers are fed requests already framed by an HTTPRequestParser, from several
+threads at once like a pooled TCPListener would, and every response is serialized.
+WSGIHandler is measured running the application on the calling thread and on its
+own bounded worker pool.
+
+    python benchmarks/bench_wsgi.py --requests 20000 --threads 8
+"""
+
+import argparse
+import logging
+import threading
+import time
+
+from edunet.core.applications.application import Application
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.core.networking.handlers.wsgi_handler import WSGIHandler
+from edunet.models.http import HTTPResponseTemplate
+
+REQUEST = (
+    b"GET /hello?name=edunet HTTP/1.1\r\n"
+    b"Host: localhost:8080\r\n"
+    b"User-Agent: bench\r\n"
+    b"Accept: */*\r\n"
+    b"\r\n"
+)
+BODY = b"Hello, world!"
+OK_TEXT = HTTPResponseTemplate(200, "OK", content_type="text/plain")
+
+
+class HelloApplication(Application):
+    def handle_request(self, request_data):
+        return OK_TEXT.response(body=BODY)
+
+
+def hello_wsgi_application(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [BODY]
+
+
+def measure(handler, requests, threads):
+    request = HTTPRequestParser().feed(REQUEST)[0]
+    per_thread = requests // threads
+
+    def serve():
+        for _ in range(per_thread):
+            b"".join(handler.handle_connection(request, None))
+
+    workers = [threading.Thread(target=serve) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def run(args):
+    print(f"{args.requests} requests from {args.threads} threads")
+    for label, make_handler in (
+        ("simple", lambda: SimpleHTTPConnectionHandler(HelloApplication())),
+        ("wsgi inline", lambda: WSGIHandler(hello_wsgi_application, max_workers=None)),
+        (
+            "wsgi pooled",
+            lambda: WSGIHandler(hello_wsgi_application, max_workers=args.workers),
+        ),
+    ):
+        best = 0.0
+        for _ in range(args.repeat):
+            handler = make_handler()
+            best = max(best, measure(handler, args.requests, args.threads))
+            if isinstance(handler, WSGIHandler):
+                handler.shutdown()
+        print(f"  {label:<12}: {best:.0f} requests/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+from edunet.models.base_types import Request, Response
+
+
+class AsyncApplication(ABC):
+    """
+    Coroutine counterpart of Application for applications that await I/O while
+    handling a request instead of blocking a thread.
+
+    class MyApplication(AsyncApplication):
+        async def handle_request(self, request):
+            data = await fetch_something(request)
+            return some_response(data)
+    """
+
+    @abstractmethod
+    async def handle_request(self, request_data: Request) -> Response:
+        """
+        Handling the request intended coming from an AsyncConnectionHandler
+        implementation
+        """
@@ -0,0 +1,246 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Tuple
+
+from edunet.core.applications.application import Application
+from edunet.models.http import HTTPRequest, HTTPResponse, HTTPResponseTemplate
+
+logger = logging.getLogger(__name__)
+
+# Statuses a response can be cached with when nothing says otherwise (RFC 9110 15.1)
+CACHEABLE_STATUSES = frozenset({200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501})
+
+# Cache-Control directives of a response that keep it out of a shared cache
+_UNCACHEABLE_DIRECTIVES = frozenset({"no-store", "no-cache", "private"})
+
+# Request headers identifying the client, whose responses are likely its own
+CREDENTIAL_HEADERS = (b"authorization", b"cookie")
+
+
+def carries_credentials(request: HTTPRequest, vary: Iterable[bytes] = ()) -> bool:
+    """
+    Whether a request has a credential header, Authorization or Cookie, that is not
+    one of the lowercase header names in vary, so its response must not be handed
+    to another client
+    """
+    return any(
+        name not in vary and name in request.headers for name in CREDENTIAL_HEADERS
+    )
+
+
+def is_private(response: HTTPResponse) -> bool:
+    """
+    Whether a response is meant for the client it was made for alone: it sets a
+    cookie, or its Cache-Control header says no-store, no-cache or private
+    """
+    for name, value in response.all_headers().items():
+        name = str(name).lower()
+        if name == "set-cookie":
+            return True
+        if name == "cache-control" and _UNCACHEABLE_DIRECTIVES.intersection(
+            _directives(value)
+        ):
+            return True
+    return False
+
+
+def _directives(cache_control: Any) -> List[str]:
+    return [directive.strip().lower() for directive in str(cache_control).split(",")]
+
+
+class _CachedResponse:
+    """
+    Internal entry of the cache of a CachingApplication: the serialized head of a
+    response, as a template, and its body
+    """
+
+    __slots__ = ("template", "body", "expires", "size")
+
+    def __init__(self, template: HTTPResponseTemplate, body: bytes, expires: float):
+        self.template = template
+        self.body = body
+        self.expires = expires
+        self.size = len(template.status_line) + len(template.header_lines) + len(body)
+
+
+class CachingApplication(Application):
+    """
+    Application that caches the responses of the application it wraps, so a request
+    answered recently is answered again without running the application.
+
+    application = CachingApplication(
+        RouterApplication(), max_size=64 * 1024 * 1024, ttl=30, vary=("Accept",)
+    )
+
+    Responses are cached per method, URI and the values of the request headers named
+    in vary. A cached response keeps its status line and headers serialized, as an
+    HTTPResponseTemplate, and its body as bytes, so a hit costs a dict lookup and
+    framing the body with its Content-Length.
+
+    Entries live for ttl seconds, or for the max-age of the response's Cache-Control
+    header when it has one. The cache holds up to max_size bytes of responses, the
+    least recently used ones being evicted to make room; responses larger than
+    max_entry_size are not cached. The hits, misses, evictions and expirations
+    attributes count what happened to lookups and entries since the cache was
+    created.
+
+    Only requests for one of methods are cached, and not when they carry an
+    Authorization or Cookie header, unless that header is named in vary so every
+    client's responses are cached apart. Only responses with one of
+    cacheable_statuses and a str or bytes-like body are cached, and not when their
+    Cache-Control header says no-store, no-cache or private, they set a cookie, or
+    their Vary header names a request header that is not in vary, or is "*". To
+    cache the responses of a CompressingApplication, for instance, pass
+    vary=("Accept-Encoding",).
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        max_size: int = 64 * 1024 * 1024,
+        max_entry_size: int = 1024 * 1024,
+        ttl: float = 60.0,
+        vary: Iterable[str] = (),
+        methods: Iterable[str] = ("GET", "HEAD"),
+        cacheable_statuses: Iterable[int] = CACHEABLE_STATUSES,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+
+        self.application = application
+        self.max_size = max_size
+        self.max_entry_size = min(max_entry_size, max_size)
+        self.ttl = ttl
+        self.vary = tuple(name.lower().encode("ascii") for name in vary)
+        self.methods = frozenset(method.upper().encode("ascii") for method in methods)
+        self.cacheable_statuses = frozenset(cacheable_statuses)
+
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[tuple, _CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def handle_request(self, request_data: HTTPRequest) -> HTTPResponse:
+        """
+        Provide a HTTPRequest object to receive the cached HTTPResponse for it, or the
+        wrapped application's response when there is none
+        """
+        if request_data.method not in self.methods or carries_credentials(
+            request_data, self.vary
+        ):
+            return self.application.handle_request(request_data)
+
+        key = self.cache_key(request_data)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.template.response(body=entry.body)
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+
+        response = self.application.handle_request(request_data)
+        entry = self._make_entry(response, now)
+        if entry is not None:
+            self._store(key, entry)
+        return response
+
+    def cache_key(self, request: HTTPRequest) -> tuple:
+        """
+        Key a request's response is cached under
+        """
+        key: Tuple[Optional[bytes], ...] = (request.method, request.uri)
+        if self.vary:
+            key += tuple(request.headers.get(name) for name in self.vary)
+        return key
+
+    def clear(self) -> None:
+        """
+        Drop every cached response
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _varies_by_key(self, vary: str) -> bool:
+        """
+        Whether every request header a response's Vary header names is one the cache
+        key is made of, so a request with other values can never get the response
+        """
+        names = [name.strip().lower() for name in vary.split(",")]
+        return (
+            all(name.encode("latin-1") in self.vary for name in names if name)
+            and "*" not in names
+        )
+
+    def _make_entry(
+        self, response: HTTPResponse, now: float
+    ) -> Optional[_CachedResponse]:
+        """
+        Serialize a response to be cached, or return None when it should not be
+        """
+        if response.status_code not in self.cacheable_statuses:
+            return None
+        if isinstance(response.body, str):
+            body = response.body.encode("utf-8")
+        elif isinstance(response.body, (bytes, bytearray, memoryview)):
+            body = bytes(response.body)
+        else:
+            # Streamed bodies and file regions are not held in memory
+            return None
+        if len(body) > self.max_entry_size:
+            return None
+
+        if is_private(response):
+            return None
+
+        headers = response.all_headers()
+        ttl = self.ttl
+        for name, value in headers.items():
+            name = str(name).lower()
+            if name == "vary" and not self._varies_by_key(str(value)):
+                return None
+            if name == "cache-control":
+                for directive in _directives(value):
+                    if directive.startswith("max-age="):
+                        try:
+                            ttl = int(directive[8:])
+                        except ValueError:
+                            return None
+        if ttl <= 0:
+            return None
+
+        template = HTTPResponseTemplate(
+            response.status_code,
+            response.status_text,
+            http_version=response.http_version,
+            content_type=response.content_type,
+            headers=headers,
+        )
+        return _CachedResponse(template, body, now + ttl)
+
+    def _store(self, key: tuple, entry: _CachedResponse) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+                logger.debug(f"Evicted cached response for {oldest!r}")
+
+    def _remove(self, key: tuple) -> None:
+        self.size -= self._entries.pop(key).size
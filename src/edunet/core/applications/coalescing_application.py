@@ -0,0 +1,163 @@
+import logging
+import threading
+from dataclasses import replace
+from typing import Dict, Iterable, Optional, Tuple
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.caching_application import (
+    carries_credentials,
+    is_private,
+)
+from edunet.core.networking.scatter_gather import FileRegion
+from edunet.models.http import HTTPRequest, HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """
+    Internal state of a request being handled by the wrapped application on behalf
+    of every identical request that arrives in the meantime
+    """
+
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[HTTPResponse] = None
+        self.error: Optional[Exception] = None
+
+
+class CoalescingApplication(Application):
+    """
+    Application that collapses identical requests arriving at the same time into a
+    single call to the application it wraps.
+
+    application = CoalescingApplication(RouterApplication(), timeout=5.0)
+
+    The first request for a method and URI (and the values of the request headers
+    named in vary) runs the application; identical requests arriving before it is
+    done wait for its response instead of running the application themselves, and
+    each of them gets its own copy of it. If the application raises, every waiting
+    request raises the same exception.
+
+    A request that has waited for timeout seconds gives up on the call it was waiting
+    for and runs the application itself, so a stuck call does not hold up the
+    requests behind it for longer than that. A response with a streamed body, which
+    can only be sent once, is not shared either, nor is a response private to its
+    client, one that sets a cookie or whose Cache-Control header says no-store,
+    no-cache or private: each waiting request runs the application itself.
+
+    Only requests for one of methods are coalesced, and not when they carry an
+    Authorization or Cookie header, unless that header is named in vary, so a
+    response made for one client is never handed to another. The coalesced and
+    timeouts attributes count the requests that were answered by another request's
+    call and the ones that gave up waiting for it.
+
+    Requests only run concurrently with a listener that handles them on several
+    threads, such as a TCPListener with a worker pool.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        timeout: float = 5.0,
+        vary: Iterable[str] = (),
+        methods: Iterable[str] = ("GET", "HEAD"),
+    ):
+        if timeout <= 0:
+            raise ValueError("timeout must be greater than 0")
+
+        self.application = application
+        self.timeout = timeout
+        self.vary = tuple(name.lower().encode("ascii") for name in vary)
+        self.methods = frozenset(method.upper().encode("ascii") for method in methods)
+
+        self.coalesced = 0
+        self.timeouts = 0
+        self._calls: Dict[tuple, _Call] = {}
+        self._lock = threading.Lock()
+
+    def handle_request(self, request_data: HTTPRequest) -> HTTPResponse:
+        """
+        Provide a HTTPRequest object to receive the HTTPResponse of the wrapped
+        application, computed once for any identical requests in flight
+        """
+        if request_data.method not in self.methods or carries_credentials(
+            request_data, self.vary
+        ):
+            return self.application.handle_request(request_data)
+
+        key = self.call_key(request_data)
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+
+        if leader:
+            return self._lead(key, call, request_data)
+
+        if not call.done.wait(self.timeout):
+            logger.warning(
+                f"Timed out after {self.timeout}s waiting for identical request "
+                f"{request_data.method!r} {request_data.uri!r}, handling it again"
+            )
+            with self._lock:
+                self.timeouts += 1
+            return self.application.handle_request(request_data)
+
+        if call.error is not None:
+            raise call.error
+        response = call.response
+        if response is None or not _is_shareable(response):
+            return self.application.handle_request(request_data)
+
+        with self._lock:
+            self.coalesced += 1
+        return _copy(response)
+
+    def call_key(self, request: HTTPRequest) -> tuple:
+        """
+        Key identical requests share a call under
+        """
+        key: Tuple[Optional[bytes], ...] = (request.method, request.uri)
+        if self.vary:
+            key += tuple(request.headers.get(name) for name in self.vary)
+        return key
+
+    def _lead(self, key: tuple, call: _Call, request: HTTPRequest) -> HTTPResponse:
+        try:
+            response = self.application.handle_request(request)
+        except Exception as e:
+            call.error = e
+            raise
+        else:
+            if _is_shareable(response):
+                # Kept as it was made for the waiting requests, whatever this
+                # request's connection handler does to its own copy
+                call.response = response
+                response = _copy(response)
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return response
+
+
+def _is_shareable(response: HTTPResponse) -> bool:
+    """
+    Whether a response can be sent to several clients: its body can be sent more
+    than once, and it is not private to the client it was made for, such as one
+    starting a session with a cookie
+    """
+    return isinstance(
+        response.body, (str, bytes, bytearray, memoryview, FileRegion)
+    ) and not is_private(response)
+
+
+def _copy(response: HTTPResponse) -> HTTPResponse:
+    headers = response.additional_headers
+    return replace(response, additional_headers=dict(headers) if headers else headers)
@@ -0,0 +1,279 @@
+import logging
+import zlib
+from functools import partial
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.lru_cache import LRUCache
+from edunet.core.networking.scatter_gather import FileRegion
+from edunet.models.http import Buffer, HTTPRequest, HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+# zlib window bits giving the gzip and zlib ("deflate" in HTTP) formats
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+# Content types whose bodies are compressed already and would not get any smaller
+INCOMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/gzip",
+        "application/x-gzip",
+        "application/zip",
+        "application/x-bzip2",
+        "application/x-xz",
+        "application/x-7z-compressed",
+        "application/x-rar-compressed",
+        "application/zstd",
+        "application/octet-stream",
+        "application/pdf",
+        "font/woff",
+        "font/woff2",
+    }
+)
+INCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/")
+COMPRESSIBLE_IMAGES = frozenset({"image/svg+xml", "image/x-icon", "image/bmp"})
+
+# Statuses whose responses have no body to compress, or one that is only a part of
+# the whole
+_SKIPPED_STATUSES = frozenset({204, 206, 304})
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[bytes], available: Iterable[str]
+) -> Optional[str]:
+    """
+    Pick the content coding of available the client prefers according to the value of
+    its Accept-Encoding header, or None when it prefers the body as it is.
+
+    negotiate_encoding(b"gzip, deflate, br", ("gzip", "deflate"))     # "gzip"
+    negotiate_encoding(b"deflate;q=1, gzip;q=0.5", ("gzip", "deflate"))  # "deflate"
+    negotiate_encoding(b"gzip;q=0", ("gzip", "deflate"))               # None
+
+    Codings the client rates equally are picked in the order of available.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.decode("latin-1").split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    if best is not None and weights.get("identity", 0.001) > best_weight:
+        return None
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """
+    Whether a body of the content type is worth compressing
+    """
+    if not content_type:
+        return True
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type in COMPRESSIBLE_IMAGES:
+        return True
+    return media_type not in INCOMPRESSIBLE_TYPES and not media_type.startswith(
+        INCOMPRESSIBLE_PREFIXES
+    )
+
+
+class CompressingApplication(Application):
+    """
+    Application that compresses the response bodies of the application it wraps with
+    gzip or deflate, whichever the client's Accept-Encoding header prefers.
+
+    application = CompressingApplication(RouterApplication(), min_size=1024)
+
+    Bodies smaller than min_size bytes are left as they are, the headers would cost
+    more than compression saves, as are bodies of content types that are compressed
+    already (see is_compressible), partial (206) responses, file regions, which are
+    sent straight from their file, and responses that have a Content-Encoding or ask
+    for no-transform in their Cache-Control header. Compressed responses get
+    Content-Encoding and Vary: Accept-Encoding headers.
+
+    A compressed body is not the representation a strong ETag of the response was
+    made for, so the encoding is added to the tag: "abc" is sent as "abc-gzip". To
+    answer conditional requests for compressed responses, wrap this application in
+    the ConditionalApplication, not the other way around, so If-None-Match is
+    compared with the tag the client was sent.
+
+    A streamed body is compressed a chunk at a time as it is produced, every chunk
+    being flushed so the client gets it without waiting for the next one.
+
+    The compressed forms of bodies up to max_cached_body bytes are kept in an
+    LRUCache of cache_size bytes, counting both forms, so a body the application
+    sends again, such as a response served from a CachingApplication or a static
+    page, is only compressed once. The cache_hits and cache_misses attributes count
+    lookups in that cache.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        min_size: int = 1024,
+        level: int = 6,
+        encodings: Iterable[str] = ("gzip", "deflate"),
+        cache_size: int = 16 * 1024 * 1024,
+        max_cached_body: int = 1024 * 1024,
+    ):
+        if not 0 <= level <= 9:
+            raise ValueError("level must be between 0 and 9")
+        self.encodings = tuple(encoding.lower() for encoding in encodings)
+        unknown = set(self.encodings) - set(_WBITS)
+        if unknown:
+            raise ValueError(f"Unsupported encodings: {', '.join(sorted(unknown))}")
+
+        self.application = application
+        self.min_size = min_size
+        self.level = level
+        self.cache_size = cache_size
+        self.max_cached_body = max_cached_body
+
+        self._cache: LRUCache[Tuple[str, bytes], bytes] = LRUCache(
+            cache_size, lambda key, compressed: len(key[1]) + len(compressed)
+        )
+
+    @property
+    def cache_hits(self) -> int:
+        """
+        Number of bodies found compressed already in the cache
+        """
+        return self._cache.hits
+
+    @property
+    def cache_misses(self) -> int:
+        """
+        Number of cacheable bodies that had to be compressed
+        """
+        return self._cache.misses
+
+    def handle_request(self, request_data: HTTPRequest) -> HTTPResponse:
+        """
+        Provide a HTTPRequest object to receive the HTTPResponse of the wrapped
+        application, compressed when the client accepts it
+        """
+        response = self.application.handle_request(request_data)
+        if not self._should_compress(response):
+            return response
+
+        encoding = negotiate_encoding(
+            request_data.headers.get(b"accept-encoding"), self.encodings
+        )
+        if encoding is None:
+            self._add_vary(response)
+            return response
+
+        body = response.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if isinstance(body, (bytes, bytearray, memoryview)):
+            if len(body) < self.min_size:
+                return response
+            response.body = self.compress(bytes(body), encoding)
+        else:
+            response.body = self._stream(body, encoding)
+
+        self._tag_encoding(response, encoding)
+        response.additional_headers = {
+            **(response.additional_headers or {}),
+            "Content-Encoding": encoding,
+        }
+        self._add_vary(response)
+        return response
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """
+        Compress a whole body with an encoding, from the cache when it was
+        compressed recently
+        """
+        if len(body) > self.max_cached_body:
+            return self._compress(body, encoding)
+        return self._cache.get(
+            (encoding, body), partial(self._compress, body, encoding)
+        )
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, _WBITS[encoding])
+        return compressor.compress(body) + compressor.flush()
+
+    def _stream(
+        self, chunks: Iterable[Union[str, Buffer]], encoding: str
+    ) -> Iterator[bytes]:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, _WBITS[encoding])
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+    def _should_compress(self, response: HTTPResponse) -> bool:
+        if (
+            response.status_code in _SKIPPED_STATUSES
+            or isinstance(response.body, FileRegion)
+            or not is_compressible(response.content_type)
+        ):
+            return False
+
+        headers = response.all_headers()
+        for name, value in headers.items():
+            name = str(name).lower()
+            if name == "content-encoding":
+                return False
+            if name == "cache-control" and "no-transform" in str(value).lower():
+                return False
+        return True
+
+    @staticmethod
+    def _tag_encoding(response: HTTPResponse, encoding: str) -> None:
+        """
+        Make a strong ETag of the response specific to the encoding of its body
+        """
+        headers = response.all_headers()
+        name = next((name for name in headers if str(name).lower() == "etag"), None)
+        if name is None:
+            return
+        etag = str(headers[name])
+        if etag.startswith("W/") or not etag.endswith('"'):
+            # Weak tags already stand for any equivalent representation
+            return
+
+        headers[name] = f'{etag[:-1]}-{encoding}"'
+        if response.template is not None and name in response.template.headers:
+            # The template has the original tag serialized in its header lines
+            response.template = None
+            response.additional_headers = headers
+        else:
+            response.additional_headers = {
+                **(response.additional_headers or {}),
+                name: headers[name],
+            }
+
+    @staticmethod
+    def _add_vary(response: HTTPResponse) -> None:
+        """
+        Let caches know the body depends on the request's Accept-Encoding
+        """
+        headers = dict(response.additional_headers or {})
+        name = next((name for name in headers if name.lower() == "vary"), "Vary")
+        vary = headers.get(name)
+        if vary and "accept-encoding" in vary.lower():
+            return
+        headers[name] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+        response.additional_headers = headers
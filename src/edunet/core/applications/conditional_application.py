@@ -0,0 +1,187 @@
+import hashlib
+import logging
+from email.utils import mktime_tz, parsedate_tz
+from typing import Optional, Union
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.lru_cache import LRUCache
+from edunet.models.http import HTTPRequest, HTTPResponse, NOT_MODIFIED
+
+logger = logging.getLogger(__name__)
+
+# Headers a 304 response keeps from the response it stands for (RFC 9110 15.4.5)
+_NOT_MODIFIED_HEADERS = frozenset(
+    {
+        "cache-control",
+        "content-location",
+        "date",
+        "etag",
+        "expires",
+        "last-modified",
+        "vary",
+    }
+)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Strong entity tag of a body: a quoted hash of its bytes
+
+    make_etag(b"Hello World")  # '"0cc84ab57c476d2385b899ca742a2790"'
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: bytes, etag: Optional[str]) -> bool:
+    """
+    Whether the value of an If-None-Match header matches the entity tag of a
+    response, with the weak comparison RFC 9110 13.1.2 asks for: W/ prefixes are
+    ignored. "*" matches any response, tagged or not.
+    """
+    value = if_none_match.decode("latin-1").strip()
+    if value == "*":
+        return True
+    if etag is None:
+        return False
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in value.split(",")
+    )
+
+
+def parse_http_date(value: Union[str, bytes, None]) -> Optional[int]:
+    """
+    Seconds since the epoch an HTTP date stands for, or None when it is not a date
+    """
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    parsed = parsedate_tz(value) if value else None
+    if parsed is None:
+        return None
+    try:
+        return mktime_tz(parsed)
+    except (OverflowError, ValueError):
+        return None
+
+
+class ConditionalApplication(Application):
+    """
+    Application that tags the responses of the application it wraps with a strong
+    ETag and answers conditional requests for a representation the client already
+    has with a 304 (Not Modified) response, which carries no body.
+
+    application = ConditionalApplication(RouterApplication())
+
+    The ETag of a 200 response to a GET or HEAD request is a hash of its body, unless
+    the response has one already. Streamed bodies and file regions are not held in
+    memory, so they are not tagged, but their Last-Modified header, such as the one
+    a StaticFileApplication sends, is still checked against If-Modified-Since.
+
+    If-None-Match is evaluated when the request has it, If-Modified-Since only when
+    it does not, as RFC 9110 13.2.2 orders them.
+
+    The tags of bodies up to max_cached_body bytes are kept in an LRUCache of
+    cache_size bytes of bodies. Bodies key it as they are, str or bytes, since both
+    remember their hash, so a body the application sends again, such as one from a
+    CachingApplication or a template, is looked up without being read. The
+    cache_hits and cache_misses attributes count lookups in that cache.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        cache_size: int = 16 * 1024 * 1024,
+        max_cached_body: int = 1024 * 1024,
+    ):
+        self.application = application
+        self.cache_size = cache_size
+        self.max_cached_body = max_cached_body
+
+        self._cache: LRUCache[Union[str, bytes], str] = LRUCache(
+            cache_size, lambda body, etag: len(body)
+        )
+
+    @property
+    def cache_hits(self) -> int:
+        """
+        Number of bodies whose tag was found in the cache
+        """
+        return self._cache.hits
+
+    @property
+    def cache_misses(self) -> int:
+        """
+        Number of cacheable bodies that had to be hashed
+        """
+        return self._cache.misses
+
+    def handle_request(self, request_data: HTTPRequest) -> HTTPResponse:
+        """
+        Provide a HTTPRequest object to receive the HTTPResponse of the wrapped
+        application, or a 304 response standing for it when the client's copy is
+        still current
+        """
+        response = self.application.handle_request(request_data)
+        if response.status_code != 200 or request_data.method not in (b"GET", b"HEAD"):
+            return response
+
+        headers = response.all_headers()
+        etag = last_modified = None
+        for name, value in headers.items():
+            name = str(name).lower()
+            if name == "etag":
+                etag = str(value)
+            elif name == "last-modified":
+                last_modified = str(value)
+
+        if etag is None and isinstance(
+            response.body, (str, bytes, bytearray, memoryview)
+        ):
+            etag = self.etag(response.body)
+            response.additional_headers = {
+                **(response.additional_headers or {}),
+                "ETag": etag,
+            }
+            headers["ETag"] = etag
+
+        if not self._not_modified(request_data, etag, last_modified):
+            return response
+
+        return HTTPResponse(
+            status_code=NOT_MODIFIED,
+            status_text="Not Modified",
+            body=b"",
+            http_version=response.http_version,
+            additional_headers={
+                name: value
+                for name, value in headers.items()
+                if str(name).lower() in _NOT_MODIFIED_HEADERS
+            },
+        )
+
+    def etag(self, body: Union[str, bytes, bytearray, memoryview]) -> str:
+        """
+        Strong entity tag of a body, from the cache when it was hashed recently
+        """
+        if isinstance(body, (bytearray, memoryview)):
+            # Mutable buffers cannot key the cache
+            body = bytes(body)
+        if len(body) > self.max_cached_body:
+            return make_etag(_encode(body))
+        return self._cache.get(body, lambda: make_etag(_encode(body)))
+
+    @staticmethod
+    def _not_modified(
+        request: HTTPRequest, etag: Optional[str], last_modified: Optional[str]
+    ) -> bool:
+        if_none_match = request.headers.get(b"if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, etag)
+
+        since = parse_http_date(request.headers.get(b"if-modified-since"))
+        modified = parse_http_date(last_modified)
+        return since is not None and modified is not None and modified <= since
+
+
+def _encode(body: Union[str, bytes]) -> bytes:
+    return body.encode("utf-8") if isinstance(body, str) else body
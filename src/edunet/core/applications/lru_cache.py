@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe cache of values that cost the same to compute every time, such as the
+    compressed form or the hash of a response body, keyed by what they are computed
+    from.
+
+    cache = LRUCache(max_size=16 * 1024 * 1024, size_of=lambda body, etag: len(body))
+    etag = cache.get(body, lambda: make_etag(body))
+
+    Entries are weighed in bytes with size_of, and the least recently used ones are
+    evicted once they weigh more than max_size together. Values are computed outside
+    the cache's lock, so a slow one does not hold up lookups of the others. The hits
+    and misses attributes count lookups since the cache was created.
+    """
+
+    def __init__(self, max_size: int, size_of: Callable[[K, V], int]):
+        self.max_size = max_size
+        self.size_of = size_of
+
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K, compute: Callable[[], V]) -> V:
+        """
+        Value cached under key, or the result of compute() when there is none, which
+        is cached under it
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self.size += self.size_of(key, value)
+            while self.size > self.max_size and self._entries:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self.size -= self.size_of(evicted_key, evicted)
+        return value
+
+    def clear(self) -> None:
+        """
+        Drop every cached value
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
@@ -0,0 +1,72 @@
+import logging
+from typing import Callable, Iterable, List
+
+from edunet.core.applications.application import Application
+from edunet.models.base_types import Request, Response
+
+logger = logging.getLogger(__name__)
+
+RequestHandler = Callable[[Request], Response]
+Middleware = Callable[[RequestHandler], RequestHandler]
+
+
+class MiddlewareApplication(Application):
+    """
+    Application that runs requests through a stack of middlewares before they reach
+    the application it wraps.
+
+    A middleware is a factory: it is given the handler of the next layer and returns
+    the handler of its own layer, which can look at or replace the request, call the
+    next handler or answer the request itself, and look at or replace the response.
+
+    def timing(next_handler):
+        def handler(request):
+            started = time.perf_counter()
+            response = next_handler(request)
+            logger.info(f"{request.path} took {time.perf_counter() - started:.6f}s")
+            return response
+
+        return handler
+
+    application = MiddlewareApplication(RouterApplication(), [timing, auth])
+
+    Middlewares run in the order given, the first one being the outermost layer.
+    The stack is composed once, when the application is created or a middleware is
+    added with use(), into a single callable: handling a request then costs one call
+    per middleware and no more, with no list of middlewares to walk or closures to
+    build per request.
+    """
+
+    def __init__(
+        self, application: Application, middlewares: Iterable[Middleware] = ()
+    ):
+        self.application = application
+        self.middlewares: List[Middleware] = list(middlewares)
+        self._handler = self._compose()
+
+    def use(self, middleware: Middleware) -> Middleware:
+        """
+        Add a middleware as the innermost layer of the stack, and recompose it. Can
+        be used as a decorator.
+        """
+        self.middlewares.append(middleware)
+        self._handler = self._compose()
+        return middleware
+
+    def handle_request(self, request_data: Request) -> Response:
+        """
+        Provide a request to receive the response of the middleware stack
+        """
+        return self._handler(request_data)
+
+    def _compose(self) -> RequestHandler:
+        handler: RequestHandler = self.application.handle_request
+        for middleware in reversed(self.middlewares):
+            handler = middleware(handler)
+            if not callable(handler):
+                raise TypeError(
+                    f"Middleware {middleware!r} must return a callable handler, "
+                    f"not {handler!r}"
+                )
+        logger.debug(f"Composed {len(self.middlewares)} middlewares")
+        return handler
@@ -0,0 +1,230 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+from edunet.core.applications.application import Application
+from edunet.models.http import HTTPRequest, HTTPResponse, HTTPResponseTemplate
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., HTTPResponse]
+
+NOT_FOUND = HTTPResponseTemplate(404, "Not Found", content_type="text/plain")
+METHOD_NOT_ALLOWED = HTTPResponseTemplate(
+    405, "Method Not Allowed", content_type="text/plain"
+)
+INTERNAL_SERVER_ERROR = HTTPResponseTemplate(500, "Internal Server Error")
+
+
+class _Node:
+    """
+    Internal node of the radix tree a RouterApplication looks routes up in.
+
+    A node matches its prefix of the path. Static children are keyed on the first
+    byte of their prefix, so picking the child to go down to is a single dict lookup
+    however many routes share the node. A node can also have one parameter child,
+    which matches a whole path segment, and one wildcard child, which matches the
+    rest of the path.
+    """
+
+    __slots__ = ("prefix", "children", "param", "wildcard", "name", "handlers")
+
+    def __init__(self, prefix: bytes = b"", name: str = ""):
+        self.prefix = prefix
+        self.children: Dict[int, _Node] = {}
+        self.param: Optional[_Node] = None
+        self.wildcard: Optional[_Node] = None
+        # Name of the path parameter a parameter or wildcard node captures
+        self.name = name
+        self.handlers: Dict[bytes, Handler] = {}
+
+
+class RouterApplication(Application):
+    """
+    HTTP application that dispatches each request to the handler routed for its
+    method and path.
+
+    Paths are made of static segments, ":name" parameters that match a whole path
+    segment and a "*name" wildcard, allowed as the last segment only, that matches
+    the rest of the path. Matched parameters are passed to the handler as keyword
+    arguments, percent-decoded.
+
+    router = RouterApplication()
+
+    @router.route("/users/:user_id", methods=("GET", "PUT"))
+    def user(request, user_id):
+        return HTTPResponse(status_code=200, status_text="OK", body=user_id)
+
+    router.add_route("GET", "/static/*path", serve_static)
+
+    Routes are kept in a compressed radix tree, so looking a path up costs about the
+    same whether a handful of routes or thousands are registered. When several
+    routes could match, static segments win over parameters, which win over
+    wildcards.
+
+    A path no route matches gets a 404, and a path routed for other methods only
+    gets a 405 listing them in its Allow header. A handler that raises gets a 500.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add_route(self, method: str, path: str, handler: Handler) -> None:
+        """
+        Route requests for method and path to handler
+        """
+        if not path.startswith("/"):
+            raise ValueError(f"Route path must start with '/': {path!r}")
+
+        node = self._root
+        segments = path.split("/")
+        static = b""
+        for index, segment in enumerate(segments):
+            if index:
+                static += b"/"
+            if not segment.startswith((":", "*")):
+                static += segment.encode("latin-1")
+                continue
+
+            name = segment[1:]
+            if not name:
+                raise ValueError(f"Route parameter must be named: {path!r}")
+            node = self._insert_static(node, static)
+            static = b""
+            if segment[0] == ":":
+                node = self._insert_param(node, name, path)
+            elif index != len(segments) - 1:
+                raise ValueError(f"Route wildcard must be the last segment: {path!r}")
+            else:
+                node = self._insert_wildcard(node, name, path)
+        node = self._insert_static(node, static)
+
+        method_name = method.upper().encode("ascii")
+        if method_name in node.handlers:
+            raise ValueError(f"Route already registered: {method} {path}")
+        node.handlers[method_name] = handler
+
+    def route(
+        self, path: str, methods: Iterable[str] = ("GET",)
+    ) -> Callable[[Handler], Handler]:
+        """
+        Decorator that routes requests for path to the decorated handler, for each of
+        methods
+        """
+
+        def decorator(handler: Handler) -> Handler:
+            for method in methods:
+                self.add_route(method, path, handler)
+            return handler
+
+        return decorator
+
+    def handle_request(self, request_data: HTTPRequest) -> HTTPResponse:
+        """
+        Provide a HTTPRequest object to receive the HTTPResponse of the handler routed
+        for its method and path.
+        """
+        params: List[Tuple[str, bytes]] = []
+        node = self._match(self._root, request_data.path, params)
+        if node is None:
+            return NOT_FOUND.response(body="Not Found")
+
+        handler = node.handlers.get(request_data.method)
+        if handler is None:
+            allow = ", ".join(sorted(method.decode() for method in node.handlers))
+            return METHOD_NOT_ALLOWED.response(
+                body="Method Not Allowed", additional_headers={"Allow": allow}
+            )
+
+        kwargs = {name: unquote(value.decode("latin-1")) for name, value in params}
+        try:
+            return handler(request_data, **kwargs)
+        except Exception as e:
+            logger.exception(f"Unexpected server error: {e}")
+            return INTERNAL_SERVER_ERROR.response(body="")
+
+    def _match(
+        self, node: _Node, path: bytes, params: List[Tuple[str, bytes]]
+    ) -> Optional[_Node]:
+        """
+        Find the node routed for the rest of a path, below a node whose prefix has
+        been matched already. Values of the parameters matched on the way are
+        appended to params.
+        """
+        if not path:
+            if node.handlers:
+                return node
+        else:
+            child = node.children.get(path[0])
+            if child is not None and path.startswith(child.prefix):
+                matched = len(child.prefix)
+                found = self._match(child, path[matched:], params)
+                if found is not None:
+                    return found
+
+            param = node.param
+            if param is not None:
+                end = path.find(b"/")
+                if end == -1:
+                    end = len(path)
+                if end:
+                    params.append((param.name, path[:end]))
+                    found = self._match(param, path[end:], params)
+                    if found is not None:
+                        return found
+                    params.pop()
+
+        wildcard = node.wildcard
+        if wildcard is not None:
+            params.append((wildcard.name, path))
+            return wildcard
+        return None
+
+    @staticmethod
+    def _insert_static(node: _Node, prefix: bytes) -> _Node:
+        """
+        Add the static prefix below node, splitting the node it shares a part of its
+        prefix with if there is one, and return the node it ends at
+        """
+        while prefix:
+            child = node.children.get(prefix[0])
+            if child is None:
+                child = node.children[prefix[0]] = _Node(prefix)
+                return child
+
+            common = 0
+            limit = min(len(prefix), len(child.prefix))
+            while common < limit and prefix[common] == child.prefix[common]:
+                common += 1
+
+            if common < len(child.prefix):
+                # Split the child where the prefixes part ways
+                parent = _Node(child.prefix[:common])
+                child.prefix = child.prefix[common:]
+                parent.children[child.prefix[0]] = child
+                node.children[prefix[0]] = parent
+                child = parent
+
+            prefix = prefix[common:]
+            node = child
+        return node
+
+    @staticmethod
+    def _insert_param(node: _Node, name: str, path: str) -> _Node:
+        if node.param is None:
+            node.param = _Node(name=name)
+        elif node.param.name != name:
+            raise ValueError(
+                f"Route parameter :{name} conflicts with :{node.param.name}: {path!r}"
+            )
+        return node.param
+
+    @staticmethod
+    def _insert_wildcard(node: _Node, name: str, path: str) -> _Node:
+        if node.wildcard is None:
+            node.wildcard = _Node(name=name)
+        elif node.wildcard.name != name:
+            raise ValueError(
+                f"Route wildcard *{name} conflicts with *{node.wildcard.name}: {path!r}"
+            )
+        return node.wildcard
@@ -0,0 +1,282 @@
+import io
+import logging
+import mimetypes
+import mmap
+import os
+import stat
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Optional, Tuple, Union
+from urllib.parse import unquote_to_bytes
+
+from edunet.core.applications.application import Application
+from edunet.core.networking.scatter_gather import FileRegion
+from edunet.models.http import HTTPRequest, HTTPResponse, HTTPResponseTemplate
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND = HTTPResponseTemplate(404, "Not Found", content_type="text/plain")
+METHOD_NOT_ALLOWED = HTTPResponseTemplate(
+    405, "Method Not Allowed", content_type="text/plain", headers={"Allow": "GET, HEAD"}
+)
+RANGE_NOT_SATISFIABLE = HTTPResponseTemplate(
+    416, "Range Not Satisfiable", content_type="text/plain"
+)
+
+_SEPARATORS = {os.sep.encode(), (os.altsep or os.sep).encode(), b"\0"}
+
+
+def parse_range(value: bytes, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse the value of a Range header asking for a single range of bytes of a body
+    of size bytes, and return the (start, end) offsets it covers, end excluded.
+
+    parse_range(b"bytes=0-499", 10000)    # (0, 500)
+    parse_range(b"bytes=9500-", 10000)    # (9500, 10000)
+    parse_range(b"bytes=-500", 10000)     # (9500, 10000)
+
+    None is returned for a header that should be ignored, leaving the whole body to
+    be sent: one that is malformed, or asks for several ranges. ValueError is raised
+    when the range is well-formed but none of it is in the body.
+    """
+    unit, _, spec = value.partition(b"=")
+    if unit.strip().lower() != b"bytes" or b"," in spec:
+        return None
+
+    first, dash, last = spec.strip().partition(b"-")
+    if not dash or not (first.isdigit() or last.isdigit()):
+        return None
+    if first and last and not (first.isdigit() and last.isdigit()):
+        return None
+
+    if not first:
+        # A suffix range: the last bytes of the body
+        suffix = int(last)
+        if not suffix or not size:
+            raise ValueError(f"Range {value!r} not satisfiable for {size} bytes")
+        return max(size - suffix, 0), size
+
+    start = int(first)
+    end = int(last) + 1 if last else size
+    if last and end <= start:
+        return None
+    if start >= size:
+        raise ValueError(f"Range {value!r} not satisfiable for {size} bytes")
+    return start, min(end, size)
+
+
+class _SharedFile(io.FileIO):
+    """
+    File opened for the FileRegions of any number of responses at once, closed once
+    it has been evicted from the cache and the last of them has been sent
+    """
+
+    def __del__(self):
+        self.close()
+
+
+class _CachedFile:
+    """
+    Internal entry of the open file cache of a StaticFileApplication
+    """
+
+    __slots__ = ("identity", "size", "file", "mapped", "ok", "partial")
+
+    def __init__(
+        self,
+        identity: tuple,
+        size: int,
+        file: Optional[_SharedFile],
+        mapped: Optional[memoryview],
+        headers: dict,
+        content_type: str,
+    ):
+        # Tells whether the file on disk is still the one that was opened
+        self.identity = identity
+        self.size = size
+        self.file = file
+        self.mapped = mapped
+        self.ok = HTTPResponseTemplate(
+            200, "OK", content_type=content_type, headers=headers
+        )
+        self.partial = HTTPResponseTemplate(
+            206, "Partial Content", content_type=content_type, headers=headers
+        )
+
+    def body(self, start: int, end: int) -> Union[bytes, memoryview, FileRegion]:
+        if start == end:
+            return b""
+        if self.mapped is not None:
+            return self.mapped[start:end]
+        return FileRegion(self.file, start, end - start)
+
+
+class StaticFileApplication(Application):
+    """
+    HTTP application serving the files under a root directory to GET and HEAD
+    requests.
+
+    application = StaticFileApplication("/srv/artifacts")
+    listener = TCPListener("0.0.0.0", 8080, SimpleHTTPConnectionHandler(application))
+
+    Responses never copy a file's content through Python: a file is sent as a
+    FileRegion, which the listener hands to os.sendfile on the client socket, and a
+    small file (up to mmap_threshold bytes) is memory-mapped and sent from the
+    mapping as it is. Open files and mappings are cached, up to max_open_files of
+    them, along with their serialized headers, so serving a file that was served
+    recently costs a stat() call to make sure it has not changed since. Files are
+    expected to be replaced rather than rewritten in place while being served.
+
+    A single byte range can be asked for with a Range header, which gets a 206
+    with the range's Content-Range, or a 416 when none of the range is in the file;
+    other Range headers are ignored. A request for a directory is served its
+    index_file, if it has one.
+
+    A HEAD request gets the same response as a GET, body included, so the connection
+    handler sends its head with the file's Content-Length and leaves the body out;
+    see HTTPResponse.to_buffers. A path that is not a regular file under root gets a
+    404, and any other method a 405.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        index_file: Optional[str] = "index.html",
+        mmap_threshold: int = 65536,
+        max_open_files: int = 256,
+    ):
+        if mmap_threshold < 0:
+            raise ValueError("mmap_threshold must be at least 0")
+        if max_open_files < 1:
+            raise ValueError("max_open_files must be at least 1")
+
+        self.root = os.path.abspath(root)
+        self.index_file = index_file
+        self.mmap_threshold = mmap_threshold
+        self.max_open_files = max_open_files
+        self._files: "OrderedDict[str, _CachedFile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def handle_request(self, request_data: HTTPRequest) -> HTTPResponse:
+        """
+        Provide a HTTPRequest object to receive a HTTPResponse with the content of the
+        file its path points to
+        """
+        if request_data.method not in (b"GET", b"HEAD"):
+            return METHOD_NOT_ALLOWED.response(body="Method Not Allowed")
+
+        found = self._find_file(request_data.path)
+        if found is None:
+            return NOT_FOUND.response(body="Not Found")
+
+        path, info = found
+        try:
+            entry = self._open(path, info)
+        except OSError as e:
+            logger.error(f"Could not open {path}: {e}")
+            return NOT_FOUND.response(body="Not Found")
+
+        range_header = request_data.headers.get(b"range")
+        if range_header is not None:
+            try:
+                byte_range = parse_range(range_header, entry.size)
+            except ValueError:
+                return RANGE_NOT_SATISFIABLE.response(
+                    body="Range Not Satisfiable",
+                    additional_headers={"Content-Range": f"bytes */{entry.size}"},
+                )
+            if byte_range is not None:
+                start, end = byte_range
+                return entry.partial.response(
+                    body=entry.body(start, end),
+                    additional_headers={
+                        "Content-Range": f"bytes {start}-{end - 1}/{entry.size}"
+                    },
+                )
+        return entry.ok.response(body=entry.body(0, entry.size))
+
+    def close(self) -> None:
+        """
+        Drop every cached file. Files still being sent are closed once they are.
+        """
+        with self._lock:
+            self._files.clear()
+
+    def _find_file(self, path: bytes) -> Optional[Tuple[str, os.stat_result]]:
+        """
+        Map a request path to the regular file it points to under root, along with
+        its stat() result, or None when there is none. Segments that could step out
+        of root are refused rather than resolved.
+        """
+        segments = []
+        for segment in unquote_to_bytes(path).split(b"/"):
+            if segment in (b"", b"."):
+                continue
+            if segment == b".." or any(sep in segment for sep in _SEPARATORS):
+                return None
+            segments.append(os.fsdecode(segment))
+
+        file_path = os.path.join(self.root, *segments)
+        try:
+            info = os.stat(file_path)
+            if stat.S_ISDIR(info.st_mode) and self.index_file:
+                file_path = os.path.join(file_path, self.index_file)
+                info = os.stat(file_path)
+        except (OSError, ValueError):
+            return None
+
+        if not stat.S_ISREG(info.st_mode):
+            return None
+        return file_path, info
+
+    def _open(self, path: str, info: os.stat_result) -> _CachedFile:
+        """
+        Return the cached entry of a file, opening it again when it is not cached or
+        has changed since it was opened
+        """
+        identity = (info.st_dev, info.st_ino, info.st_size, info.st_mtime_ns)
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry.identity == identity:
+                self._files.move_to_end(path)
+                return entry
+
+        entry = self._load(path)
+        with self._lock:
+            self._files[path] = entry
+            self._files.move_to_end(path)
+            while len(self._files) > self.max_open_files:
+                self._files.popitem(last=False)
+        return entry
+
+    def _load(self, path: str) -> _CachedFile:
+        opened = _SharedFile(path, "rb")
+        # Describe the file that was opened, in case it was replaced since stat()
+        info = os.fstat(opened.fileno())
+        identity = (info.st_dev, info.st_ino, info.st_size, info.st_mtime_ns)
+
+        file: Optional[_SharedFile] = opened
+        mapped = None
+        if 0 < info.st_size <= self.mmap_threshold:
+            mapped = memoryview(
+                mmap.mmap(opened.fileno(), info.st_size, access=mmap.ACCESS_READ)
+            )
+            # The mapping stays valid without the file
+            opened.close()
+            file = None
+
+        content_type, _ = mimetypes.guess_type(path)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Last-Modified": formatdate(info.st_mtime, usegmt=True),
+        }
+        logger.debug(f"Opened {path} ({info.st_size} bytes, mapped: {bool(mapped)})")
+        return _CachedFile(
+            identity,
+            info.st_size,
+            file,
+            mapped,
+            headers,
+            content_type or "application/octet-stream",
+        )
@@ -0,0 +1,151 @@
+import logging
+import queue
+import threading
+from enum import Enum
+from typing import Any, Callable, List, Optional
+
+from edunet.exceptions import WorkerPoolError, WorkerPoolFullError
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    """
+    What a WorkerPool should do when its work queue is full.
+
+    BLOCK: the submitting thread waits until a slot frees up (back-pressure)
+    REJECT: the submission fails immediately with a WorkerPoolFullError
+    """
+
+    BLOCK = "block"
+    REJECT = "reject"
+
+
+class WorkerPool:
+    """
+    A fixed number of worker threads fed from a bounded work queue.
+
+    Unlike spawning a thread per unit of work, the number of OS threads stays constant
+    no matter how much work arrives, and the queue size caps how much work can pile
+    up in front of the workers.
+
+    pool = WorkerPool(max_workers=16, queue_size=128, overflow=OverflowPolicy.REJECT)
+    pool.start()
+    pool.submit(do_work, arg1, arg2)
+    pool.shutdown()
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        max_workers: int,
+        queue_size: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        name: str = "edunet-worker",
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if queue_size < 0:
+            raise ValueError("queue_size cannot be negative")
+
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.overflow = OverflowPolicy(overflow)
+        self.name = name
+
+        # A queue_size of 0 means an unbounded queue
+        self._work_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._workers: List[threading.Thread] = []
+        self._is_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Read only property to check whether the pool's workers are accepting work.
+        """
+        return self._is_running
+
+    @property
+    def pending(self) -> int:
+        """
+        Approximate number of work items waiting for a free worker
+        """
+        return self._work_queue.qsize()
+
+    def start(self) -> None:
+        """
+        Spin up the worker threads. Calling it on a running pool does nothing.
+        """
+        with self._lock:
+            if self._is_running:
+                logger.info("Worker pool already running. Nothing to do")
+                return
+
+            for index in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._run_worker, name=f"{self.name}-{index}", daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+            self._is_running = True
+            logger.info(f"Worker pool started with {self.max_workers} workers")
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None
+    ) -> None:
+        """
+        Queue fn(*args) to run on the next free worker.
+
+        With the BLOCK policy this waits for room in the queue (up to timeout seconds
+        when given); with the REJECT policy a full queue fails immediately. Either way
+        a WorkerPoolFullError is raised when the work could not be queued.
+        """
+        if not self._is_running:
+            raise WorkerPoolError("Worker pool is not running. Please start it.")
+
+        try:
+            if self.overflow is OverflowPolicy.REJECT:
+                self._work_queue.put_nowait((fn, args))
+            else:
+                self._work_queue.put((fn, args), timeout=timeout)
+        except queue.Full:
+            raise WorkerPoolFullError(
+                f"Worker pool queue is full ({self.queue_size} pending)"
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers once they have drained the work already queued.
+        """
+        with self._lock:
+            if not self._is_running:
+                logger.warning("Worker pool is already stopped. Nothing to do.")
+                return
+
+            self._is_running = False
+            for _ in self._workers:
+                self._work_queue.put(self._STOP)
+
+            if wait:
+                for worker in self._workers:
+                    worker.join()
+
+            self._workers = []
+            logger.info("Worker pool stopped")
+
+    def _run_worker(self) -> None:
+        while True:
+            item = self._work_queue.get()
+            try:
+                if item is self._STOP:
+                    return
+
+                fn, args = item
+                fn(*args)
+            except Exception as e:
+                logger.exception(f"Unhandled error in worker: {e}")
+            finally:
+                self._work_queue.task_done()
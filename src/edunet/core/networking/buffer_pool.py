@@ -0,0 +1,61 @@
+import threading
+from typing import List
+
+
+class BufferPool:
+    """
+    Thread-safe pool of fixed-size bytearrays to read sockets into with recv_into.
+
+    Reading with recv() allocates a new bytes object for every read. Reading into a
+    buffer taken from the pool reuses the same memory from one read, and one
+    connection, to the next.
+
+    pool = BufferPool(buffer_size=65536)
+    buffer = pool.acquire()
+    try:
+        nbytes = client_socket.recv_into(buffer)
+        framer.feed(memoryview(buffer)[:nbytes])
+    finally:
+        pool.release(buffer)
+
+    At most max_buffers idle buffers are kept; buffers released beyond that are left
+    to the garbage collector.
+    """
+
+    def __init__(self, buffer_size: int = 65536, max_buffers: int = 64):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        if max_buffers < 0:
+            raise ValueError("max_buffers cannot be negative")
+
+        self.buffer_size = buffer_size
+        self.max_buffers = max_buffers
+        self._buffers: List[bytearray] = []
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> int:
+        """
+        Number of idle buffers ready to be acquired
+        """
+        return len(self._buffers)
+
+    def acquire(self) -> bytearray:
+        """
+        Take an idle buffer from the pool, or allocate a new one if there is none
+        """
+        with self._lock:
+            if self._buffers:
+                return self._buffers.pop()
+        return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray) -> None:
+        """
+        Hand a buffer back to the pool once nothing refers to its contents anymore
+        """
+        if len(buffer) != self.buffer_size:
+            return
+
+        with self._lock:
+            if len(self._buffers) < self.max_buffers:
+                self._buffers.append(buffer)
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Union
+from urllib.parse import unquote
+
+from edunet.core.networking.handlers.async_connection_handler import (
+    AsyncConnectionHandler,
+)
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    HTTPHandlerMixin,
+    connection_header,
+    to_http_request,
+)
+from edunet.models.http import HTTPRequest, STATUS_LINES, encode_status_line
+
+logger = logging.getLogger(__name__)
+
+Message = dict
+ASGIApplication = Callable[
+    [dict, Callable[[], Awaitable[Message]], Callable[[Message], Awaitable[None]]],
+    Awaitable[None],
+]
+
+# Ends the queue of buffers an application sends a response through
+_END = object()
+
+
+class _Exchange:
+    """
+    Internal state of one request handed to an ASGI application: the receive and
+    send callables it is given, and the queue the buffers of its response are put
+    on for the listener to write
+    """
+
+    def __init__(
+        self,
+        request: HTTPRequest,
+        body_chunk_size: int,
+        keep_alive: Optional[bool] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.request = request
+        self.keep_alive = keep_alive
+        self.body = request.open_body()
+        self.body_spooled = request.body_file is not None
+        self.body_chunk_size = body_chunk_size
+        self.executor = executor
+        self.body_done = False
+        # Holding a single buffer makes send() wait for the listener to catch up
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.response_done = asyncio.Event()
+
+        self.status = 0
+        self.headers: List[List[bytes]] = []
+        self.started = False
+        self.chunked = False
+        # Body of an HTTP/1.0 response, held until it is complete
+        self.buffered: Optional[List[bytes]] = None
+
+    async def receive(self) -> Message:
+        if not self.body_done:
+            if self.body_spooled:
+                # A large body was spooled to a temporary file by the parser, so it
+                # is read a chunk at a time, on the executor since reading a file
+                # blocks
+                loop = asyncio.get_running_loop()
+                chunk = await loop.run_in_executor(
+                    self.executor, self.body.read, self.body_chunk_size
+                )
+            else:
+                chunk = self.body.read(self.body_chunk_size)
+            self.body_done = len(chunk) < self.body_chunk_size
+            return {
+                "type": "http.request",
+                "body": chunk,
+                "more_body": not self.body_done,
+            }
+
+        # There is nothing else to receive until the response has been sent
+        await self.response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: Message) -> None:
+        message_type = message.get("type")
+        if message_type == "http.response.start":
+            if self.status:
+                raise RuntimeError("http.response.start was already sent")
+            self.status = int(message["status"])
+            self.headers = list(message.get("headers", ()))
+        elif message_type == "http.response.body":
+            if not self.status:
+                raise RuntimeError("http.response.body sent before http.response.start")
+            if self.response_done.is_set():
+                raise RuntimeError("http.response.body sent after the response ended")
+            await self._send_body(
+                bytes(message.get("body", b"")), message.get("more_body", False)
+            )
+        else:
+            raise RuntimeError(f"Unexpected ASGI message type: {message_type!r}")
+
+    async def _send_body(self, body: bytes, more_body: bool) -> None:
+        if self.buffered is not None:
+            self.buffered.append(body)
+            if more_body:
+                return
+            body = b"".join(self.buffered)
+            self.buffered = None
+
+        if not self.started:
+            has_length = any(
+                name.lower() == b"content-length" for name, _ in self.headers
+            )
+            if not more_body:
+                # The whole body is here, so it goes out in one piece
+                framing = b"" if has_length else b"Content-Length: %d\r\n" % len(body)
+                await self.queue.put(self.encode_head(framing) + body)
+                self.started = True
+                self.response_done.set()
+                return
+
+            if self.request.version == b"HTTP/1.0" and not has_length:
+                # No chunked transfer coding to stream with, so wait for the rest
+                self.buffered = [body]
+                return
+
+            self.chunked = not has_length
+            framing = b"Transfer-Encoding: chunked\r\n" if self.chunked else b""
+            await self.queue.put(self.encode_head(framing))
+            self.started = True
+
+        if self.chunked:
+            if body:
+                await self.queue.put(b"%x\r\n%s\r\n" % (len(body), body))
+            if not more_body:
+                await self.queue.put(b"0\r\n\r\n")
+        elif body:
+            await self.queue.put(body)
+
+        if not more_body:
+            self.response_done.set()
+
+    def encode_head(self, framing: bytes) -> bytes:
+        try:
+            phrase = HTTPStatus(self.status).phrase
+        except ValueError:
+            phrase = ""
+        key = ("HTTP/1.1", self.status, phrase)
+        lines = [STATUS_LINES.get(key) or encode_status_line(*key), framing]
+        for name, value in self.headers:
+            lines.append(b"%s: %s\r\n" % (bytes(name), bytes(value)))
+        connection = connection_header(self.request, self.keep_alive)
+        if connection is not None:
+            lines.append(b"Connection: %s\r\n" % connection.encode("ascii"))
+        lines.append(b"\r\n")
+        return b"".join(lines)
+
+
+class ASGIHandler(HTTPHandlerMixin, AsyncConnectionHandler):
+    """
+    HTTP connection handler running an ASGI 3 application on the AsyncTCPListener, so
+    coroutine applications serve many slow requests at once on a single thread.
+
+    async def application(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello, world!"})
+
+    listener = AsyncTCPListener("127.0.0.1", 9999, ASGIHandler(application))
+
+    The request body is handed to the application through receive() in
+    http.request messages of up to body_chunk_size bytes. It is not streamed: the
+    listener frames the whole request before the application is started, so the
+    first message comes once the last byte of the body has been received. A body
+    spooled to a temporary file (see HTTPHandlerMixin) is read back on executor (the
+    loop's default one when it is None), so the file reads do not block the event
+    loop.
+
+    The response is streamed: every http.response.body message is written as the
+    listener gets to it, and send() waits until the listener has taken the previous
+    one, so a slow client holds the application back instead of piling its response
+    up in memory. A response sent in a single message gets a Content-Length, any
+    other response uses chunked transfer coding unless the application set a
+    Content-Length itself. HTTP/1.0 clients get the whole response at once.
+
+    An application that fails before starting its response gets a 500; once the
+    response has started, the connection is cut short instead.
+    """
+
+    def __init__(
+        self,
+        application: ASGIApplication,
+        server: Optional[tuple] = None,
+        root_path: str = "",
+        body_chunk_size: int = 65536,
+        spool_threshold: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        if body_chunk_size < 1:
+            raise ValueError("body_chunk_size must be at least 1")
+
+        self.application = application
+        self.server = server
+        self.root_path = root_path
+        self.body_chunk_size = body_chunk_size
+        self.spool_threshold = spool_threshold
+        self.executor = executor
+
+    async def handle_connection(
+        self,
+        data: Union[HTTPRequest, bytes],
+        writer: asyncio.StreamWriter,
+        keep_alive: Optional[bool] = None,
+    ) -> AsyncIterator[bytes]:
+        request = to_http_request(data)
+        exchange = _Exchange(request, self.body_chunk_size, keep_alive, self.executor)
+        scope = self.make_scope(request, writer)
+        task = asyncio.ensure_future(self._run(scope, exchange))
+        return self._stream(exchange, task)
+
+    def make_scope(self, request: HTTPRequest, writer: Any) -> dict:
+        """
+        Build the ASGI HTTP connection scope of a request
+        """
+        client = server = None
+        if writer is not None:
+            client = writer.get_extra_info("peername")
+            server = writer.get_extra_info("sockname")
+
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": request.version.partition(b"/")[2].decode("ascii"),
+            "method": request.method.decode("ascii"),
+            "scheme": "http",
+            "path": unquote(request.path.decode("latin-1")),
+            "raw_path": request.path,
+            "query_string": request.query,
+            "root_path": self.root_path,
+            "headers": [
+                [name.lower(), value] for name, value in request.headers.fields()
+            ],
+            "client": tuple(client[:2]) if client else None,
+            "server": self.server or (tuple(server[:2]) if server else None),
+        }
+
+    async def _run(self, scope: dict, exchange: _Exchange) -> None:
+        try:
+            await self.application(scope, exchange.receive, exchange.send)
+            if not exchange.response_done.is_set():
+                raise RuntimeError("Application returned before ending its response")
+        except Exception as e:
+            logger.exception(f"Error running ASGI application: {e}")
+            if exchange.started:
+                await exchange.queue.put(e)
+                return
+            exchange.status, exchange.headers = 500, []
+            await exchange.queue.put(exchange.encode_head(b"Content-Length: 0\r\n"))
+        finally:
+            exchange.response_done.set()
+        await exchange.queue.put(_END)
+
+    async def _stream(
+        self, exchange: _Exchange, task: "asyncio.Future[None]"
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the buffers of the response as the application sends them
+        """
+        try:
+            while True:
+                buffer = await exchange.queue.get()
+                if buffer is _END:
+                    return
+                if isinstance(buffer, Exception):
+                    raise buffer
+                yield buffer
+        finally:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,117 @@
+import asyncio
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Iterable, Optional, TypeVar, cast
+
+from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.request_framer import (
+    RequestFramer,
+    SingleReadFramer,
+)
+from edunet.core.networking.scatter_gather import is_streamed
+
+T = TypeVar("T")
+
+# Tells an exhausted iterator apart from any item it could produce
+_DONE = object()
+
+
+async def iterate_in_executor(
+    items: Iterable[T], executor: Optional[Executor] = None
+) -> AsyncIterator[T]:
+    """
+    Yield the items of a blocking iterable, such as a streamed response produced by
+    a synchronous application, pulling every one of them on an executor so the work
+    done to produce it never runs on the event loop
+    """
+    loop = asyncio.get_running_loop()
+    iterator = iter(items)
+    while True:
+        item = await loop.run_in_executor(executor, next, iterator, _DONE)
+        if item is _DONE:
+            return
+        yield cast(T, item)
+
+
+class AsyncConnectionHandler(ABC):
+    """
+    Coroutine counterpart of ConnectionHandler used by the AsyncTCPListener.
+
+    class MyHandler(AsyncConnectionHandler):
+        async def handle_connection(self, data, writer):
+            return await build_response(data)
+    """
+
+    @abstractmethod
+    async def handle_connection(
+        self,
+        request_data: Any,
+        writer: asyncio.StreamWriter,
+        keep_alive: Optional[bool] = None,
+    ):
+        """
+        Handle one complete request read off the connection and return the bytes to
+        send back, or a list of buffers to be written back one after the other.
+
+        See ConnectionHandler.handle_connection for keep_alive.
+        """
+
+    def create_request_framer(self) -> RequestFramer:
+        """
+        Provides a fresh RequestFramer for every new connection.
+
+        See ConnectionHandler.create_request_framer
+        """
+        return SingleReadFramer()
+
+    def keep_alive(self, request_data: Any) -> bool:
+        """
+        Tells the listener whether the connection may stay open for further requests.
+
+        See ConnectionHandler.keep_alive
+        """
+        return False
+
+
+class ExecutorConnectionHandler(AsyncConnectionHandler):
+    """
+    Runs a synchronous ConnectionHandler on an executor so it can be served by an
+    asyncio listener without blocking the event loop.
+
+    When no executor is given, the event loop's default thread pool is used. A
+    streamed response is pulled on the executor too, one buffer at a time, since
+    producing each buffer runs the synchronous code behind it.
+    """
+
+    def __init__(
+        self, connection_handler: ConnectionHandler, executor: Optional[Executor] = None
+    ):
+        self.connection_handler = connection_handler
+        self.executor = executor
+
+    async def handle_connection(
+        self,
+        request_data: Any,
+        writer: asyncio.StreamWriter,
+        keep_alive: Optional[bool] = None,
+    ):
+        loop = asyncio.get_running_loop()
+        res = await loop.run_in_executor(
+            self.executor,
+            functools.partial(
+                self.connection_handler.handle_connection,
+                request_data,
+                writer.get_extra_info("socket"),
+                keep_alive=keep_alive,
+            ),
+        )
+        if is_streamed(res):
+            return iterate_in_executor(res, self.executor)
+        return res
+
+    def create_request_framer(self) -> RequestFramer:
+        return self.connection_handler.create_request_framer()
+
+    def keep_alive(self, request_data: Any) -> bool:
+        return self.connection_handler.keep_alive(request_data)
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Optional, Union
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.async_application import AsyncApplication
+from edunet.core.networking.handlers.async_connection_handler import (
+    AsyncConnectionHandler,
+    iterate_in_executor,
+)
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    HTTPHandlerMixin,
+    apply_connection_header,
+    buffer_streamed_body,
+    to_http_request,
+)
+from edunet.core.networking.scatter_gather import is_streamed
+from edunet.models.http import HTTPRequest, HTTPResponse
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHTTPConnectionHandler(HTTPHandlerMixin, AsyncConnectionHandler):
+    """
+    HTTP connection handler for the AsyncTCPListener.
+
+    An AsyncApplication is awaited directly on the event loop. A regular Application,
+    such as SimpleHTTPApplication, is run on an executor so it cannot stall the loop,
+    and so is every next() on a streamed body it responds with.
+
+    As with SimpleHTTPConnectionHandler, HTTP/1.0 clients get a streamed body whole,
+    with a Content-Length. Requests are framed as described in HTTPHandlerMixin.
+    """
+
+    def __init__(
+        self,
+        application: Union[Application, AsyncApplication],
+        executor: Optional[Executor] = None,
+        spool_threshold: Optional[int] = None,
+    ):
+        self.application = application
+        self.executor = executor
+        self.spool_threshold = spool_threshold
+
+    async def handle_connection(
+        self,
+        data: Union[HTTPRequest, bytes],
+        writer: asyncio.StreamWriter,
+        keep_alive: Optional[bool] = None,
+    ) -> Union[List[bytes], AsyncIterator[bytes]]:
+        request = to_http_request(data)
+
+        if isinstance(self.application, AsyncApplication):
+            response = await self.application.handle_request(request)
+            buffer_streamed_body(request, response)
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                self.executor, self._handle_sync_request, request
+            )
+
+        apply_connection_header(request, response, keep_alive)
+        buffers = response.to_buffers(head_only=request.method == b"HEAD")
+        if is_streamed(buffers) and not isinstance(self.application, AsyncApplication):
+            return iterate_in_executor(buffers, self.executor)
+        return buffers
+
+    def _handle_sync_request(self, request: HTTPRequest) -> HTTPResponse:
+        response = self.application.handle_request(request)  # type: ignore
+        buffer_streamed_body(request, response)
+        return response
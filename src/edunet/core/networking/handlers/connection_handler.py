@@ -1,4 +1,10 @@
 from abc import ABC, abstractmethod
+from typing import Any
+
+from edunet.core.networking.handlers.request_framer import (
+    RequestFramer,
+    SingleReadFramer,
+)
 
 
 class ConnectionHandler(ABC):
@@ -13,9 +19,39 @@ class ConnectionHandler(ABC):
         TCPListener. The main idea is that a connection handler is provided to the
         TCPListener to handle the socket data as at comes in.
 
+        The response can be returned as bytes, or as a list of buffers (say a status
+        line, a header block and a body) that listeners write back with a single
+        vectored send rather than joining them together.
+
+        Listeners call it with the request, the client socket and a keep_alive
+        keyword telling whether the connection stays open after this response, which
+        may differ from what keep_alive() said when the listener has limits of its
+        own, so a protocol that announces it (such as HTTP's Connection: close) can
+        tell the client the truth.
+
         As an example, you can implement a wsgi handler to handle connections.
 
         class WSGIHandler(ConnectionHandler):
             def handle_connection(foo, bar):
                 pass
         """
+
+    def create_request_framer(self) -> RequestFramer:
+        """
+        Provides a fresh RequestFramer for every new connection. Listeners that read
+        a connection in pieces use it to know when a full request has arrived.
+
+        By default whatever a single read returns is treated as the whole request.
+        Protocol handlers should override this with a framer that understands their
+        message boundaries.
+        """
+        return SingleReadFramer()
+
+    def keep_alive(self, request_data: Any) -> bool:
+        """
+        Tells the listener whether the connection a request arrived on may stay open
+        for further requests once the response has been sent.
+
+        By default connections are closed after a single response.
+        """
+        return False
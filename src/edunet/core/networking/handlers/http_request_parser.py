@@ -0,0 +1,411 @@
+import logging
+import tempfile
+from enum import Enum
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+from edunet.core.networking.handlers.request_framer import RequestFramer
+from edunet.exceptions import HTTPValidationError
+from edunet.models.http import HTTPHeaders, HTTPRequest
+from edunet.validators.http_validators import (
+    parse_request_line,
+    validate_header_block,
+)
+
+logger = logging.getLogger(__name__)
+
+CRLF = b"\r\n"
+HEAD_END = CRLF + CRLF
+# Spaces and tabs that may surround a field value or precede a chunk extension
+OWS = b" \t"
+HEXDIGITS = frozenset(b"0123456789abcdefABCDEF")
+
+# Longest chunk-size line, extensions included, or chunk terminator line accepted
+MAX_CHUNK_LINE_SIZE = 4096
+
+
+class ParserState(Enum):
+    REQUEST_LINE = "request_line"
+    HEADERS = "headers"
+    BODY = "body"
+    CHUNK_SIZE = "chunk_size"
+    CHUNK_DATA = "chunk_data"
+    CHUNK_END = "chunk_end"
+    TRAILERS = "trailers"
+
+
+# States in which the parser reads header fields, bounded by max_header_size
+_HEADER_STATES = frozenset(
+    {ParserState.REQUEST_LINE, ParserState.HEADERS, ParserState.TRAILERS}
+)
+
+
+class HTTPRequestParser(RequestFramer):
+    """
+    Incremental HTTP/1.x request parser fed with chunks as they come off a socket.
+
+    It works through the request line, the headers and then the body, framed either by
+    Content-Length or by chunked transfer coding, and keeps its place between feed()
+    calls so no byte is looked at twice. Every request is returned as an HTTPRequest
+    as soon as its last byte has arrived, which makes the parser a RequestFramer that
+    any listener can use.
+
+    parser = HTTPRequestParser()
+    parser.feed(b"GET / HTTP/1.1\\r\\nHost: exa")    # []
+    parser.feed(b"mple.com\\r\\n\\r\\n")             # [HTTPRequest(method=b"GET", ...)]
+
+    A malformed request raises HTTPValidationError, after which the parser should be
+    thrown away along with its connection. So does a line that grows past its limit
+    before its CRLF arrives: max_header_size bytes for the request line and headers,
+    and again for the trailers of a chunked body, MAX_CHUNK_LINE_SIZE bytes for a
+    chunk-size line.
+
+    Bodies are kept in memory unless spool_threshold is set: a body that grows past
+    that many bytes is written to a temporary file as it arrives, and the request
+    carries the file as body_file (read it through HTTPRequest.open_body()) instead of
+    a body. Memory held by an upload is then bounded by the threshold whatever its
+    size.
+    """
+
+    def __init__(
+        self,
+        max_header_size: int = 65536,
+        max_body_size: Optional[int] = None,
+        spool_threshold: Optional[int] = None,
+    ):
+        if spool_threshold is not None and spool_threshold < 0:
+            raise ValueError("spool_threshold cannot be negative")
+
+        self.max_header_size = max_header_size
+        self.max_body_size = max_body_size
+        self.spool_threshold = spool_threshold
+
+        self._buffer = bytearray()
+        self._view = memoryview(self._buffer)
+        self._view.release()
+        # Start of the bytes that have not been consumed yet
+        self._position = 0
+        # Where the search for the next CRLF picks up again
+        self._scan_position = 0
+        self._reset()
+
+    @property
+    def state(self) -> ParserState:
+        """
+        Read only property for the part of a request the parser is waiting on
+        """
+        return self._state
+
+    def feed(self, data: Union[bytes, memoryview]) -> List[HTTPRequest]:
+        self._buffer += data
+        requests = []
+
+        # Fields are copied straight out of the buffer through this view, once each
+        self._view = memoryview(self._buffer)
+        try:
+            while True:
+                if self._state in (ParserState.BODY, ParserState.CHUNK_DATA):
+                    if not self._read_body():
+                        break
+                elif self._state is ParserState.HEADERS:
+                    if not self._read_headers():
+                        break
+                else:
+                    end = self._find_line_end()
+                    if end == -1:
+                        break
+                    self._handle_line(end)
+
+                request_line = self._request_line
+                if self._state is ParserState.REQUEST_LINE and request_line:
+                    requests.append(self._build_request(request_line))
+                    self._reset()
+        finally:
+            # The buffer cannot be resized while a view on it is alive
+            self._view.release()
+
+        self._compact()
+        return requests
+
+    def _reset(self) -> None:
+        self._state = ParserState.REQUEST_LINE
+        self._request_line: Optional[Tuple[bytes, bytes, bytes]] = None
+        # Where the header block starts, at the CRLF that ends the request line
+        self._head_start = 0
+        # End of the header lines validated so far, while the block is incomplete
+        self._checked_end = 0
+        self._headers = HTTPHeaders.from_raw(b"")
+        self._header_size = 0
+        self._body_parts: List[bytes] = []
+        self._body_file: Optional[BinaryIO] = None
+        self._body_size = 0
+        self._remaining = 0
+        self._chunked = False
+        self._content_length = 0
+
+    def _find_line_end(self) -> int:
+        """
+        Return where the line starting at the current position ends, or -1 if its CRLF
+        has not arrived yet
+        """
+        end = self._buffer.find(CRLF, self._scan_position)
+        if end == -1:
+            # A CR at the very end could be the start of the next CRLF
+            self._scan_position = max(len(self._buffer) - 1, self._position)
+            self._check_line_size(len(self._buffer) - self._position)
+            return -1
+
+        if self._state in _HEADER_STATES:
+            self._header_size += end - self._position + len(CRLF)
+            self._check_header_size(0)
+        else:
+            self._check_line_size(end - self._position)
+        return end
+
+    def _take_line(self, end: int) -> bytes:
+        """
+        Copy the line ending at end out of the buffer and move past its CRLF
+        """
+        start = self._position
+        line = self._view[start:end].tobytes()
+        self._position = self._scan_position = end + len(CRLF)
+        return line
+
+    def _read_body(self) -> bool:
+        """
+        Move whatever body bytes are available into the request body. Returns whether
+        the expected bytes have all arrived.
+        """
+        available = len(self._buffer) - self._position
+        if available == 0 and self._remaining:
+            return False
+
+        taken = min(available, self._remaining)
+        start = self._position
+        end = start + taken
+        self._write_body(self._view[start:end])
+        self._position = self._scan_position = end
+        self._remaining -= taken
+        if self._remaining:
+            return False
+
+        if self._state is ParserState.CHUNK_DATA:
+            self._state = ParserState.CHUNK_END
+        else:
+            self._state = ParserState.REQUEST_LINE
+        return True
+
+    def _write_body(self, data: memoryview) -> None:
+        """
+        Keep a piece of body, spooling the whole body to a temporary file once it
+        grows past spool_threshold
+        """
+        self._body_size += len(data)
+        if (
+            self._body_file is None
+            and self.spool_threshold is not None
+            and self._body_size > self.spool_threshold
+        ):
+            self._body_file = tempfile.TemporaryFile()
+            for part in self._body_parts:
+                self._body_file.write(part)
+            self._body_parts = []
+
+        if self._body_file is not None:
+            self._body_file.write(data)
+        else:
+            self._body_parts.append(data.tobytes())
+
+    def _handle_line(self, end: int) -> None:
+        empty = end == self._position
+
+        if self._state is ParserState.REQUEST_LINE:
+            # Empty lines ahead of a request line are tolerated, see RFC 9112 2.2
+            line = self._take_line(end)
+            if line:
+                self._request_line = parse_request_line(line)
+                # The empty line ending the block may come right after the request line
+                self._head_start = self._checked_end = self._scan_position = end
+                self._state = ParserState.HEADERS
+        elif self._state is ParserState.CHUNK_SIZE:
+            self._start_chunk(self._take_line(end))
+        elif self._state is ParserState.CHUNK_END:
+            line = self._take_line(end)
+            if line:
+                raise HTTPValidationError(f"Invalid chunk terminator: {line!r}")
+            self._state = ParserState.CHUNK_SIZE
+        elif self._state is ParserState.TRAILERS:
+            # Trailer fields are accepted but not exposed on the request; they count
+            # towards max_header_size again
+            self._take_line(end)
+            if empty:
+                self._state = ParserState.REQUEST_LINE
+
+    def _read_headers(self) -> bool:
+        """
+        Take the whole header block in one go once the empty line that ends it has
+        arrived. Returns whether it had.
+        """
+        end = self._buffer.find(HEAD_END, self._scan_position)
+        if end == -1:
+            # The end of the buffer could be the start of the empty line
+            scan_position = len(self._buffer) - len(HEAD_END) + 1
+            self._scan_position = max(scan_position, self._head_start)
+            self._check_header_size(len(self._buffer) - self._position)
+            # Reject a bad header as soon as its line is complete
+            last_line_end = self._buffer.rfind(CRLF, self._checked_end)
+            if last_line_end > self._checked_end:
+                lines = self._check_headers(last_line_end)
+                self._read_framing(HTTPHeaders.from_raw(lines))
+            return False
+
+        head_end = end + len(HEAD_END)
+        self._header_size += head_end - self._position
+        self._check_header_size(0)
+        self._check_headers(end)
+
+        # The block is copied out once, up to the end of its last header line
+        head_start = self._head_start
+        self._headers = HTTPHeaders.from_raw(self._view[head_start:end].tobytes())
+        self._read_framing(self._headers)
+        self._position = self._scan_position = head_end
+        self._start_body()
+        return True
+
+    def _check_headers(self, end: int) -> bytes:
+        """
+        Validate the header lines between the last ones checked and end, and return
+        them
+        """
+        start = self._checked_end
+        lines = self._view[start:end].tobytes()
+        validate_header_block(lines)
+        self._checked_end = end
+        return lines
+
+    def _read_framing(self, headers: HTTPHeaders) -> None:
+        """
+        Look up the only headers the parser needs, those that frame the body.
+
+        Framing that two servers could read differently is refused, as RFC 9112 6.1
+        and 6.3 ask, since that is what request smuggling relies on: Content-Length
+        along with Transfer-Encoding, Content-Length headers that disagree, and a
+        Transfer-Encoding whose last coding is not chunked.
+        """
+        transfer_encodings = headers.get_all(b"transfer-encoding")
+        content_lengths = headers.get_all(b"content-length")
+        if transfer_encodings and content_lengths:
+            raise HTTPValidationError(
+                "Request has both Transfer-Encoding and Content-Length headers"
+            )
+
+        if transfer_encodings:
+            codings = [
+                coding.strip().lower()
+                for value in transfer_encodings
+                for coding in value.split(b",")
+            ]
+            if codings[-1] != b"chunked" or codings.count(b"chunked") > 1:
+                raise HTTPValidationError(
+                    f"Invalid Transfer-Encoding header: {b', '.join(codings)!r}"
+                )
+            self._chunked = True
+
+        if content_lengths:
+            # A repeated header, or a list in one, is only fine when all agree
+            values = {
+                value.strip(OWS)
+                for header in content_lengths
+                for value in header.split(b",")
+            }
+            if len(values) > 1:
+                raise HTTPValidationError(
+                    f"Conflicting Content-Length headers: {sorted(values)!r}"
+                )
+            content_length = values.pop()
+            try:
+                # 1*DIGIT only: int() alone would also take signs, underscores and
+                # spaces
+                if not content_length.isdigit():
+                    raise ValueError(content_length)
+                self._content_length = int(content_length)
+            except ValueError:
+                raise HTTPValidationError(
+                    f"Invalid Content-Length header: {content_length!r}"
+                )
+
+    def _start_body(self) -> None:
+        if self._chunked:
+            self._state = ParserState.CHUNK_SIZE
+        elif self._content_length:
+            self._check_body_size(self._content_length)
+            self._remaining = self._content_length
+            self._state = ParserState.BODY
+        else:
+            self._state = ParserState.REQUEST_LINE
+
+    def _start_chunk(self, line: bytes) -> None:
+        size, _, _ = line.partition(b";")
+        # 1*HEXDIG, maybe followed by whitespace ahead of an extension (RFC 9112 7.1)
+        size = size.rstrip(OWS)
+        if not size or not HEXDIGITS.issuperset(size):
+            raise HTTPValidationError(f"Invalid chunk size: {line!r}")
+        self._remaining = int(size, 16)
+
+        if self._remaining == 0:
+            self._state = ParserState.TRAILERS
+        else:
+            self._check_body_size(self._body_size + self._remaining)
+            self._state = ParserState.CHUNK_DATA
+
+    def _check_header_size(self, pending: int) -> None:
+        """
+        Make sure the header block read so far, plus pending bytes of a line that is
+        not complete yet, stays under max_header_size
+        """
+        if self._state not in _HEADER_STATES:
+            return
+        if self._header_size + pending > self.max_header_size:
+            raise HTTPValidationError("Request header block too large")
+
+    def _check_line_size(self, size: int) -> None:
+        """
+        Make sure a line, or the part of it that has arrived so far, stays under the
+        limit of the part of the request it is in
+        """
+        if self._state in _HEADER_STATES:
+            self._check_header_size(size)
+        elif size > MAX_CHUNK_LINE_SIZE:
+            raise HTTPValidationError("Chunk line too long")
+
+    def _check_body_size(self, size: int) -> None:
+        if self.max_body_size is not None and size > self.max_body_size:
+            raise HTTPValidationError("Request body too large")
+
+    def _build_request(self, request_line: Tuple[bytes, bytes, bytes]) -> HTTPRequest:
+        method, uri, version = request_line
+        if self._body_file is not None:
+            self._body_file.seek(0)
+        return HTTPRequest(
+            method=method,
+            uri=uri,
+            version=version,
+            headers=self._headers,
+            # A body that arrived in one piece is not copied again
+            body=b"".join(self._body_parts),
+            body_file=self._body_file,
+        )
+
+    def _compact(self) -> None:
+        """
+        Drop the consumed bytes from the front of the buffer, keeping the header block
+        of a request whose headers are still arriving
+        """
+        consumed = self._position
+        if self._state is ParserState.HEADERS:
+            consumed = min(consumed, self._head_start)
+        if consumed:
+            del self._buffer[:consumed]
+            self._position -= consumed
+            self._scan_position -= consumed
+            self._head_start -= consumed
+            self._checked_end -= consumed
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import Any, List, Union
+
+
+class RequestFramer(ABC):
+    """
+    Per-connection object that listeners feed raw socket data into as it arrives.
+
+    Data off a socket comes in arbitrary chunks: a request can be split across several
+    reads, or one read can hold more than one request. A framer buffers what it has
+    been fed and hands back only complete requests, in the order they arrived, ready
+    to be passed on to ConnectionHandler.handle_connection.
+
+    Listeners may pass a memoryview into a buffer they reuse for the next read, so a
+    framer has to copy whatever it keeps hold of before feed() returns.
+
+    class LineFramer(RequestFramer):
+        def __init__(self):
+            self.buffer = b""
+
+        def feed(self, data):
+            self.buffer += data
+            *lines, self.buffer = self.buffer.split(b"\\n")
+            return lines
+    """
+
+    @abstractmethod
+    def feed(self, data: Union[bytes, memoryview]) -> List[Any]:
+        """
+        Take the next chunk read off the socket and return every request that is now
+        complete. An empty list means more data is needed.
+        """
+
+
+class SingleReadFramer(RequestFramer):
+    """
+    Treats whatever a single read returned as one complete request
+    """
+
+    def feed(self, data: Union[bytes, memoryview]) -> List[Any]:
+        return [bytes(data)] if data else []
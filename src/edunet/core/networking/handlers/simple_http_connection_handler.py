@@ -1,16 +1,120 @@
 import logging
 import socket
+from typing import Any, List, Optional, Union
 
 from edunet.core.applications.application import Application
 from edunet.core.networking.handlers.connection_handler import ConnectionHandler
-from edunet.models.http import HTTPRequest
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.core.networking.scatter_gather import FileRegion
+from edunet.models.http import HTTPRequest, HTTPResponse
 
 logger = logging.getLogger(__name__)
 
 
-class SimpleHTTPConnectionHandler(ConnectionHandler):
-    def __init__(self, application: Application):
+def to_http_request(data: Union[HTTPRequest, bytes]) -> HTTPRequest:
+    """
+    Requests framed by an HTTPRequestParser arrive already parsed; raw bytes from any
+    other framer are parsed here.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return HTTPRequest.from_bytes(bytes(data))
+    return data
+
+
+def connection_header(
+    request: HTTPRequest, keep_alive: Optional[bool] = None
+) -> Optional[str]:
+    """
+    The Connection header that lets the client know whether the connection stays
+    open, or None when that is the default for its HTTP version anyway.
+
+    keep_alive is what the listener decided for the connection; when it is not given
+    the request's own wish is taken for it.
+    """
+    if keep_alive is None:
+        keep_alive = request.keep_alive
+    if not keep_alive:
+        return "close"
+    if request.version == b"HTTP/1.0":
+        return "keep-alive"
+    return None
+
+
+def apply_connection_header(
+    request: HTTPRequest, response: HTTPResponse, keep_alive: Optional[bool] = None
+) -> None:
+    """
+    Set the Connection header of a response, when it needs one; see
+    connection_header.
+    """
+    value = connection_header(request, keep_alive)
+    if value is None:
+        return
+
+    response.additional_headers = {
+        **(response.additional_headers or {}),
+        "Connection": value,
+    }
+
+
+def buffer_streamed_body(request: HTTPRequest, response: HTTPResponse) -> None:
+    """
+    Read a streamed response body whole when the request is HTTP/1.0, whose clients
+    cannot decode chunked transfer coding, so it is sent with a Content-Length
+    instead
+    """
+    if request.version != b"HTTP/1.0":
+        return
+    body = response.body
+    if isinstance(body, (str, bytes, bytearray, memoryview, FileRegion)):
+        return
+
+    response.body = b"".join(
+        chunk.encode("utf-8") if isinstance(chunk, str) else bytes(chunk)
+        for chunk in body
+    )
+
+
+class HTTPHandlerMixin:
+    """
+    Request framing and keep-alive shared by the connection handlers speaking HTTP,
+    synchronous or not: every connection gets an HTTPRequestParser, and a connection
+    stays open as long as its requests ask for it.
+
+    spool_threshold (bytes) makes request bodies larger than it be spooled to a
+    temporary file as they arrive; see HTTPRequestParser.
+    """
+
+    spool_threshold: Optional[int] = None
+
+    def create_request_framer(self) -> HTTPRequestParser:
+        return HTTPRequestParser(spool_threshold=self.spool_threshold)
+
+    def keep_alive(self, request_data: Any) -> bool:
+        return to_http_request(request_data).keep_alive
+
+
+class SimpleHTTPConnectionHandler(HTTPHandlerMixin, ConnectionHandler):
+    """
+    HTTP connection handler passing every request to an Application.
+
+    Streamed response bodies are sent with chunked transfer coding, except to HTTP/1.0
+    clients, which get the whole body at once; see buffer_streamed_body. Requests are
+    framed as described in HTTPHandlerMixin.
+    """
+
+    def __init__(self, application: Application, spool_threshold: Optional[int] = None):
         self.application = application
+        self.spool_threshold = spool_threshold
 
-    def handle_connection(self, data: bytes, client_socket: socket.socket) -> bytes:
-        return self.application.handle_request(HTTPRequest.from_bytes(data)).to_bytes()
+    def handle_connection(
+        self,
+        data: Union[HTTPRequest, bytes],
+        client_socket: socket.socket,
+        keep_alive: Optional[bool] = None,
+    ) -> List[bytes]:
+        request = to_http_request(data)
+        response = self.application.handle_request(request)
+        buffer_streamed_body(request, response)
+        apply_connection_header(request, response, keep_alive)
+        return response.to_buffers(head_only=request.method == b"HEAD")
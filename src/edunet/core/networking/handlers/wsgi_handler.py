@@ -1,8 +1,331 @@
+import logging
 import socket
+import sys
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import unquote_to_bytes
 
+from edunet.core.concurrency.worker_pool import OverflowPolicy, WorkerPool
 from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    HTTPHandlerMixin,
+    connection_header,
+    to_http_request,
+)
+from edunet.exceptions import WorkerPoolFullError
+from edunet.models.http import (
+    HTTPRequest,
+    STATUS_LINES,
+    encode_header_line,
+    encode_status_line,
+)
 
+logger = logging.getLogger(__name__)
 
-class WSGIHandler(ConnectionHandler):
-    def handle_connection(self, client_socket: socket.socket):
-        pass
+WSGIApplication = Callable[[dict, Callable], Iterable[bytes]]
+Headers = List[Tuple[str, str]]
+
+# Headers that make it into the environ without an HTTP_ prefix
+UNPREFIXED_HEADERS = {"CONTENT_TYPE", "CONTENT_LENGTH"}
+
+
+class _StartResponse:
+    """
+    The start_response callable handed to a WSGI application for a single request,
+    remembering the status and headers it was called with
+    """
+
+    __slots__ = (
+        "status",
+        "status_code",
+        "status_text",
+        "headers",
+        "written",
+        "headers_sent",
+    )
+
+    def __init__(self) -> None:
+        self.status: Optional[str] = None
+        self.status_code = 0
+        self.status_text = ""
+        self.headers: Headers = []
+        # Body passed to the write() callable, sent ahead of the returned iterable
+        self.written: List[bytes] = []
+        self.headers_sent = False
+
+    def __call__(
+        self, status: str, headers: Headers, exc_info: Optional[tuple] = None
+    ) -> Callable[[bytes], None]:
+        if exc_info:
+            try:
+                if self.headers_sent:
+                    # Too late to change the response, so the error goes on up
+                    raise exc_info[1].with_traceback(exc_info[2])
+            finally:
+                exc_info = None
+        elif self.status is not None:
+            raise RuntimeError("start_response was already called")
+
+        status_code, _, status_text = status.partition(" ")
+        if len(status_code) != 3 or not status_code.isdigit():
+            raise ValueError(f"Invalid WSGI status: {status!r}")
+
+        self.status = status
+        self.status_code = int(status_code)
+        self.status_text = status_text
+        self.headers = headers
+        return self.written.append
+
+
+class WSGIHandler(HTTPHandlerMixin, ConnectionHandler):
+    """
+    HTTP connection handler running a PEP 3333 WSGI application, so existing WSGI
+    applications can be served by any edunet listener.
+
+    def application(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"Hello, world!"]
+
+    listener = TCPListener("127.0.0.1", 9999, WSGIHandler(application))
+
+    Applications run on a WorkerPool of max_workers threads, whatever the number of
+    threads the listener calls the handler from, and requests queue up in front of
+    it as set by queue_size and overflow. A request that cannot be queued is
+    answered with a 503. With max_workers set to None the application runs on the
+    calling thread instead. Call shutdown() to stop the pool's workers.
+
+    A result that is complete once its first chunk has been produced, such as a list
+    of one body, is sent with a Content-Length. Any other result is streamed as the
+    listener writes it, with chunked transfer coding unless the application set a
+    Content-Length itself; the rest of it is produced on the listener's thread.
+    Streaming needs HTTP/1.1, so a streamed result is buffered for an HTTP/1.0
+    client.
+
+    Requests are framed as described in HTTPHandlerMixin; wsgi.input reads the body
+    whether it was spooled or not.
+    """
+
+    def __init__(
+        self,
+        application: WSGIApplication,
+        server_name: str = "localhost",
+        server_port: int = 80,
+        max_workers: Optional[int] = 16,
+        queue_size: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        spool_threshold: Optional[int] = None,
+    ):
+        self.application = application
+        self.spool_threshold = spool_threshold
+
+        self.worker_pool: Optional[WorkerPool] = None
+        if max_workers is not None:
+            self.worker_pool = WorkerPool(
+                max_workers, queue_size, overflow, name="edunet-wsgi"
+            )
+
+        # Every environ starts as a copy of the keys that never change
+        self._base_environ = {
+            "SCRIPT_NAME": "",
+            "SERVER_NAME": server_name,
+            "SERVER_PORT": str(server_port),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": self.worker_pool is not None,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+
+    def handle_connection(
+        self,
+        data: Union[HTTPRequest, bytes],
+        client_socket: socket.socket,
+        keep_alive: Optional[bool] = None,
+    ) -> Union[List[bytes], Iterator[bytes]]:
+        request = to_http_request(data)
+        environ = self.make_environ(request, client_socket)
+        if keep_alive is None:
+            keep_alive = request.keep_alive
+
+        if self.worker_pool is None:
+            return self._run_application(request, environ, keep_alive)
+
+        if not self.worker_pool.is_running:
+            self.worker_pool.start()
+        future: Future = Future()
+        try:
+            self.worker_pool.submit(
+                self._run_on_worker, request, environ, keep_alive, future
+            )
+        except WorkerPoolFullError as e:
+            logger.warning(f"Rejecting request: {e}")
+            return self._error_response(request, keep_alive, 503, "Service Unavailable")
+        return future.result()
+
+    def make_environ(self, request: HTTPRequest, client_socket: socket.socket) -> dict:
+        """
+        Build the WSGI environ of a request. Following PEP 3333, every value taken
+        from the request is decoded as latin-1.
+        """
+        environ = dict(self._base_environ)
+        environ["REQUEST_METHOD"] = request.method.decode("latin-1")
+        environ["PATH_INFO"] = unquote_to_bytes(request.path).decode("latin-1")
+        environ["QUERY_STRING"] = request.query.decode("latin-1")
+        environ["SERVER_PROTOCOL"] = request.version.decode("latin-1")
+        environ["wsgi.input"] = request.open_body()
+
+        headers = request.headers
+        for name in headers:
+            key = name.decode("latin-1").upper().replace("-", "_")
+            if key not in UNPREFIXED_HEADERS:
+                key = "HTTP_" + key
+            # Repeated headers are folded into one comma separated value
+            environ[key] = b",".join(headers.get_all(name)).decode("latin-1")
+
+        try:
+            environ["REMOTE_ADDR"], environ["REMOTE_PORT"] = map(
+                str, client_socket.getpeername()[:2]
+            )
+        except (AttributeError, OSError, TypeError, ValueError):
+            pass
+        return environ
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers applications run on, once they are done with the requests
+        already queued
+        """
+        if self.worker_pool is not None and self.worker_pool.is_running:
+            self.worker_pool.shutdown(wait=wait)
+
+    def _run_on_worker(
+        self, request: HTTPRequest, environ: dict, keep_alive: bool, future: Future
+    ):
+        try:
+            future.set_result(self._run_application(request, environ, keep_alive))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _run_application(
+        self, request: HTTPRequest, environ: dict, keep_alive: bool
+    ) -> Union[List[bytes], Iterator[bytes]]:
+        """
+        Call the application and pull its result up to the first chunk of body, which
+        is as far as it has to run for its status and headers to be known
+        """
+        start_response = _StartResponse()
+        result = None
+        streaming = False
+        try:
+            result = self.application(environ, start_response)
+            chunks: Optional[Iterator[bytes]] = None
+            if isinstance(result, (list, tuple)):
+                body = b"".join(result)
+            else:
+                chunks = iter(result)
+                first = next((chunk for chunk in chunks if chunk), None)
+                if first is None:
+                    body, chunks = b"", None
+                elif request.version == b"HTTP/1.0":
+                    # No chunked transfer coding to stream with, so read the rest now
+                    body, chunks = first + b"".join(chunks), None
+                else:
+                    body = first
+            if start_response.status is None:
+                raise RuntimeError("Application did not call start_response")
+
+            if start_response.written:
+                body = b"".join(start_response.written) + body
+                start_response.written.clear()
+            start_response.headers_sent = True
+
+            has_length = any(
+                name.lower() == "content-length" for name, _ in start_response.headers
+            )
+            if chunks is None:
+                framing = b"" if has_length else b"Content-Length: %d\r\n" % len(body)
+                head = self._encode_head(request, keep_alive, start_response, framing)
+                return [head, body]
+
+            framing = b"" if has_length else b"Transfer-Encoding: chunked\r\n"
+            head = self._encode_head(request, keep_alive, start_response, framing)
+            streaming = True
+            return self._stream(head, body, chunks, result, start_response, has_length)
+        except Exception as e:
+            logger.exception(f"Error running WSGI application: {e}")
+            return self._error_response(
+                request, keep_alive, 500, "Internal Server Error"
+            )
+        finally:
+            if not streaming:
+                self._close(result)
+
+    def _stream(
+        self,
+        head: bytes,
+        first: bytes,
+        chunks: Iterator[bytes],
+        result: Iterable[bytes],
+        start_response: _StartResponse,
+        has_length: bool,
+    ) -> Iterator[bytes]:
+        """
+        Yield the head and the body of a streamed result as the listener pulls them,
+        closing the result once it is done with, as PEP 3333 requires
+        """
+        try:
+            yield head
+            yield first if has_length else b"%x\r\n%s\r\n" % (len(first), first)
+            for chunk in chunks:
+                written = start_response.written
+                if written:
+                    chunk = b"".join(written) + chunk
+                    written.clear()
+                if not chunk:
+                    continue
+                yield chunk if has_length else b"%x\r\n%s\r\n" % (len(chunk), chunk)
+            if not has_length:
+                yield b"0\r\n\r\n"
+        finally:
+            self._close(result)
+
+    def _encode_head(
+        self,
+        request: HTTPRequest,
+        keep_alive: bool,
+        start_response: _StartResponse,
+        framing: bytes,
+    ) -> bytes:
+        key = ("HTTP/1.1", start_response.status_code, start_response.status_text)
+        status_line = STATUS_LINES.get(key) or encode_status_line(*key)
+
+        lines = [status_line, framing]
+        for name, value in start_response.headers:
+            lines.append(encode_header_line(name, value))
+        connection = connection_header(request, keep_alive)
+        if connection is not None:
+            lines.append(encode_header_line("Connection", connection))
+        lines.append(b"\r\n")
+        return b"".join(lines)
+
+    def _error_response(
+        self,
+        request: HTTPRequest,
+        keep_alive: bool,
+        status_code: int,
+        status_text: str,
+    ) -> List[bytes]:
+        start_response = _StartResponse()
+        start_response(f"{status_code} {status_text}", [])
+        framing = b"Content-Length: 0\r\n"
+        return [self._encode_head(request, keep_alive, start_response, framing)]
+
+    @staticmethod
+    def _close(result: Any) -> None:
+        close = getattr(result, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                logger.error(f"Error closing WSGI application result: {e}")
@@ -0,0 +1,355 @@
+import asyncio
+import logging
+import socket
+from typing import Any, AsyncIterable, List, Optional, Set, Tuple, Union
+
+from edunet.core.networking.handlers.async_connection_handler import (
+    AsyncConnectionHandler,
+    ExecutorConnectionHandler,
+)
+from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.listeners.listener import (
+    READ_CHUNK_SIZE,
+    Listener,
+    bind_server_socket,
+    keep_connection_alive,
+)
+from edunet.core.networking.scatter_gather import (
+    FILE_CHUNK_SIZE,
+    FileRegion,
+    ResponseData,
+    describe,
+    is_streamed,
+)
+from edunet.exceptions import TCPListenerError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTCPListener(Listener):
+    """
+    TCP listener built on asyncio streams (asyncio.start_server).
+
+    Every connection is a coroutine on a single event loop, so thousands of mostly
+    idle connections cost no threads. An AsyncConnectionHandler is awaited directly;
+    a regular ConnectionHandler is wrapped in an ExecutorConnectionHandler and run on
+    the loop's default executor.
+
+    listener = AsyncTCPListener("127.0.0.1", 9999, AsyncHTTPConnectionHandler(app))
+    listener.start()
+
+    A client has client_timeout seconds to send a complete request, counted from
+    when its connection was accepted or its previous response was sent, so one that
+    trickles a request in a byte at a time cannot hold its connection forever.
+
+    When the connection handler allows it, a connection stays open for further
+    requests until it has been idle for keep_alive_timeout seconds or has served
+    max_keep_alive_requests requests.
+
+    Pipelined requests are answered in the order they arrived. With
+    concurrent_pipelining set, the requests framed from a single read are handled
+    concurrently and their responses written back in request order.
+
+    Besides the responses any listener accepts, an AsyncConnectionHandler can return
+    an async iterable of buffers, which is written a buffer at a time as it produces
+    them. FileRegions are sent with loop.sendfile.
+
+    To share an already running event loop, await listener.serve() instead of calling
+    start().
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        connection_handler: Union[ConnectionHandler, AsyncConnectionHandler],
+        backlog: int = socket.SOMAXCONN,
+        reuse_port: bool = False,
+        keep_alive_timeout: Optional[float] = 5.0,
+        max_keep_alive_requests: int = 100,
+        concurrent_pipelining: bool = False,
+        client_timeout: Optional[float] = 30.0,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.backlog = backlog
+        self.client_timeout = client_timeout
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_keep_alive_requests = max_keep_alive_requests
+        self.concurrent_pipelining = concurrent_pipelining
+
+        self.server_socket = bind_server_socket(self.hostname, self.port, reuse_port)
+        self._is_listening = False
+
+        if isinstance(connection_handler, ConnectionHandler):
+            connection_handler = ExecutorConnectionHandler(connection_handler)
+        self.connection_handler: AsyncConnectionHandler = connection_handler
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._connections: Set[asyncio.Task] = set()
+
+    @property
+    def is_listening(self) -> bool:
+        """
+        Read only property to check whether the AsyncTCPListener is listening and
+        active.
+        """
+        return self._is_listening
+
+    @property
+    def connection_count(self) -> int:
+        """
+        Number of client connections currently open
+        """
+        return len(self._connections)
+
+    async def accept_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve a client connection: read until the framer has complete requests and
+        hand each one to handle_request, closing the connection once a response should
+        not be followed by another request.
+        """
+        logger.info("Connection established.")
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+
+        framer = self.connection_handler.create_request_framer()
+        requests_served = 0
+        deadline = self._request_deadline()
+        try:
+            while True:
+                try:
+                    data = await self._read(reader, requests_served > 0, deadline)
+                except asyncio.TimeoutError:
+                    if deadline is not None and self._loop_time() >= deadline:
+                        logger.info(
+                            "Client did not send a request in time. Closing connection"
+                        )
+                    else:
+                        logger.info("Keep-alive connection idle. Closing connection")
+                    break
+
+                if not data:
+                    logger.info("Client closed the connection")
+                    break
+
+                batch = []
+                for request_data in framer.feed(data):
+                    requests_served += 1
+                    keep_alive = keep_connection_alive(
+                        self.connection_handler,
+                        request_data,
+                        requests_served,
+                        self.max_keep_alive_requests,
+                    )
+                    batch.append((request_data, keep_alive))
+                    if not keep_alive:
+                        # Anything pipelined after the last request is never answered
+                        break
+
+                if self.concurrent_pipelining and len(batch) > 1:
+                    await self._handle_pipelined(batch, writer)
+                else:
+                    for request_data, keep_alive in batch:
+                        await self.handle_request(request_data, writer, keep_alive)
+
+                if batch:
+                    if not batch[-1][1]:
+                        break
+                    deadline = self._request_deadline()
+        except asyncio.CancelledError:
+            logger.info("Connection cancelled while service stops")
+        except Exception as e:
+            logger.error(f"Error handling client socket: {e}")
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+            await self._close_writer(writer)
+
+    async def handle_request(
+        self,
+        request_data: Any,
+        writer: asyncio.StreamWriter,
+        keep_alive: bool = False,
+    ):
+        """
+        Pass a complete request to the connection handler and write its response back.
+        keep_alive tells the handler whether the connection stays open afterwards.
+        """
+        res = await self.connection_handler.handle_connection(
+            request_data, writer, keep_alive=keep_alive
+        )
+        await self._send(res, writer)
+
+    async def _handle_pipelined(
+        self, batch: List[Tuple[Any, bool]], writer: asyncio.StreamWriter
+    ) -> None:
+        tasks = [
+            asyncio.ensure_future(
+                self.connection_handler.handle_connection(
+                    request_data, writer, keep_alive=keep_alive
+                )
+            )
+            for request_data, keep_alive in batch
+        ]
+        try:
+            for task in tasks:
+                await self._send(await task, writer)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(
+        self,
+        res: Union[ResponseData, AsyncIterable[bytes]],
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        logger.info("Data to be sent back: %s", describe(res))
+        if isinstance(res, (bytes, bytearray, memoryview)):
+            writer.write(res)
+        elif isinstance(res, AsyncIterable):
+            # Produced by a coroutine, such as an ASGI application calling send()
+            async for buffer in res:
+                writer.write(buffer)
+                await writer.drain()
+        elif is_streamed(res):
+            # Waiting for every buffer to drain keeps a streamed response from piling
+            # up in memory when the client reads slowly
+            for buffer in res:
+                writer.write(buffer)
+                await writer.drain()
+        else:
+            start = 0
+            for index, buffer in enumerate(res):
+                if isinstance(buffer, FileRegion):
+                    writer.writelines(res[start:index])
+                    await writer.drain()
+                    await self._sendfile(buffer, writer)
+                    start = index + 1
+            # Transports that support it write the buffers with a single sendmsg
+            writer.writelines(res[start:] if start else res)
+        await writer.drain()
+        logger.info("Response sent back to client.")
+
+    @staticmethod
+    async def _sendfile(region: FileRegion, writer: asyncio.StreamWriter) -> None:
+        """
+        Write a FileRegion with loop.sendfile, which hands it to os.sendfile, or a
+        chunk at a time on transports that cannot
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            sent = await loop.sendfile(
+                writer.transport,
+                region.file,
+                region.offset,
+                region.count,
+                fallback=False,
+            )
+        except asyncio.SendfileNotAvailableError:
+            sent = 0
+            while sent < region.count:
+                chunk = region[sent:].read(FILE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+                sent += len(chunk)
+        if sent < region.count:
+            raise OSError(f"File ended {region.count - sent} bytes short of region")
+
+    async def _read(
+        self, reader: asyncio.StreamReader, idle: bool, deadline: Optional[float]
+    ) -> bytes:
+        """
+        Read what the client sent next, giving up once it has been idle for
+        keep_alive_timeout (when idle is set) or the deadline for its request is past
+        """
+        timeout = self.keep_alive_timeout if idle else None
+        if deadline is not None:
+            remaining = deadline - self._loop_time()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        if timeout is None:
+            return await reader.read(READ_CHUNK_SIZE)
+        return await asyncio.wait_for(reader.read(READ_CHUNK_SIZE), timeout)
+
+    def _request_deadline(self) -> Optional[float]:
+        """
+        Loop time by which the request the connection now waits on must be complete
+        """
+        if self.client_timeout is None:
+            return None
+        return self._loop_time() + self.client_timeout
+
+    @staticmethod
+    def _loop_time() -> float:
+        return asyncio.get_running_loop().time()
+
+    def start(self) -> None:
+        """
+        Will run an event loop for the listener until stop() is called
+        """
+        if self.is_listening:
+            logger.info("Service already starting. Nothing to do")
+            return
+
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        """
+        Serve connections on the running event loop until stop() is called
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+
+        try:
+            logger.info("Starting service.")
+            self.server_socket.listen(self.backlog)
+            server = await asyncio.start_server(
+                self.accept_connection, sock=self.server_socket
+            )
+            self._is_listening = True
+            logger.info(f"Service listening on {self.hostname}:{self.port}")
+        except Exception as e:
+            logger.error(f"Could not start service: {e}")
+            raise TCPListenerError(f"Could not start service: {e}")
+
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            for task in list(self._connections):
+                task.cancel()
+            if self._connections:
+                await asyncio.gather(*self._connections, return_exceptions=True)
+            await server.wait_closed()
+            self._is_listening = False
+            logger.info("Service has been stopped.")
+
+    def stop(self) -> None:
+        """
+        Will stop the listener. Safe to call from any thread.
+        """
+        logger.info("Stopping service")
+        if not self.is_listening or self._loop is None or self._stopped is None:
+            logger.warning("Service is already stopped. Nothing to do.")
+            return
+
+        try:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        except RuntimeError as e:
+            logger.error(f"Error shutting down service: {e}")
+            raise TCPListenerError(f"Error shutting down service: {e}")
+
+    async def _close_writer(self, writer: asyncio.StreamWriter) -> None:
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except (OSError, asyncio.CancelledError) as e:
+            logger.error(f"Socket error closing client socket: {e}")
+        else:
+            logger.info("Client socket closed successfully")
@@ -1,4 +1,12 @@
+import logging
+import socket
 from abc import abstractmethod, ABC
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bytes asked of a client socket per read
+READ_CHUNK_SIZE = 65536
 
 
 class Listener(ABC):
@@ -32,3 +40,41 @@ class Listener(ABC):
         """
         Used to implement the stopping of the listener
         """
+
+
+def bind_server_socket(
+    hostname: str, port: int, reuse_port: bool = False
+) -> socket.socket:
+    """
+    Create a TCP socket bound to hostname and port for a listener to listen on.
+
+    reuse_port sets SO_REUSEPORT, which lets several processes bind the same port and
+    have the kernel spread incoming connections between them.
+    """
+    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if reuse_port:
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server_socket.bind((hostname, port))
+    return server_socket
+
+
+def keep_connection_alive(
+    connection_handler: Any,
+    request_data: Any,
+    requests_served: int,
+    max_keep_alive_requests: int,
+) -> bool:
+    """
+    Decide whether a connection stays open once the response to request_data has
+    been sent: the connection handler has to allow it, and the connection must not
+    have served max_keep_alive_requests requests already. A handler that fails to
+    tell gets its connection closed.
+    """
+    if requests_served >= max_keep_alive_requests:
+        return False
+
+    try:
+        return bool(connection_handler.keep_alive(request_data))
+    except Exception as e:
+        logger.warning(f"Could not tell whether to keep connection alive: {e}")
+        return False
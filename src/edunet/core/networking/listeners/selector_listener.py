@@ -0,0 +1,411 @@
+import logging
+import selectors
+import socket
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.request_framer import RequestFramer
+from edunet.core.networking.listeners.listener import (
+    READ_CHUNK_SIZE,
+    Listener,
+    bind_server_socket,
+    keep_connection_alive,
+)
+from edunet.core.networking.scatter_gather import (
+    IOV_MAX,
+    FileRegion,
+    as_buffers,
+    consume,
+    describe,
+    is_streamed,
+    sendfile_some,
+)
+from edunet.exceptions import TCPListenerError
+
+logger = logging.getLogger(__name__)
+
+
+class _Connection:
+    """
+    Internal per-connection state kept by the SelectorListener
+    """
+
+    __slots__ = (
+        "client_socket",
+        "framer",
+        "out_buffers",
+        "writing",
+        "close_when_flushed",
+        "requests_served",
+        "last_active",
+        "awaiting_request_since",
+    )
+
+    def __init__(self, client_socket: socket.socket, framer: RequestFramer):
+        self.client_socket = client_socket
+        self.framer = framer
+        # Responses waiting to be written, kept as the buffers and FileRegions they
+        # were made of, or as the iterator a streamed response is still producing its
+        # buffers from
+        self.out_buffers: Deque[Union[memoryview, FileRegion, Iterator[bytes]]] = (
+            deque()
+        )
+        self.writing = False
+        self.close_when_flushed = False
+        self.requests_served = 0
+        self.last_active = time.monotonic()
+        # When the connection was left waiting on its next request
+        self.awaiting_request_since = self.last_active
+
+
+class SelectorListener(Listener):
+    """
+    Single-threaded, non-blocking TCP listener built on the selectors module (epoll on
+    Linux, kqueue/poll/select elsewhere).
+
+    Every socket is non-blocking and multiplexed on one thread, so an idle connection
+    costs a little buffer space instead of a thread. Reads are fed to the connection
+    handler's RequestFramer until a complete request has arrived, and responses are
+    written back as the socket becomes writable, so partial reads and partial writes
+    are both expected. Queued response buffers are written with vectored sends
+    (socket.sendmsg) without being joined together first. A streamed response is
+    pulled a buffer at a time whenever the socket is ready for more, so a slow
+    client never makes it pile up in memory. A FileRegion is sent with os.sendfile,
+    as much of it as the socket takes each time.
+
+    A client has client_timeout seconds to send a complete request, counted from
+    when its connection was accepted or its previous response was sent, so one that
+    trickles a request in a byte at a time cannot hold its connection forever.
+
+    When the connection handler allows it, a connection is kept open after its
+    response. Kept-alive connections are closed after keep_alive_timeout idle seconds
+    or max_keep_alive_requests requests. Pipelined requests are answered as soon as
+    they are framed and their responses queued in request order, so a batch of them
+    usually goes back to the client in a single write.
+
+    The connection handler runs on the event loop thread, so it should not block.
+
+    listener = SelectorListener("127.0.0.1", 9999, handler)
+    listener.start()
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        connection_handler: ConnectionHandler,
+        backlog: int = socket.SOMAXCONN,
+        reuse_port: bool = False,
+        keep_alive_timeout: Optional[float] = 5.0,
+        max_keep_alive_requests: int = 100,
+        client_timeout: Optional[float] = 30.0,
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.backlog = backlog
+        self.client_timeout = client_timeout
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_keep_alive_requests = max_keep_alive_requests
+
+        self.server_socket = bind_server_socket(self.hostname, self.port, reuse_port)
+        self.server_socket.setblocking(False)
+        self._is_listening = False
+
+        self.connection_handler = connection_handler
+
+        # Every read happens on the loop thread, so one buffer serves all connections
+        self._read_buffer = bytearray(READ_CHUNK_SIZE)
+        self._read_view = memoryview(self._read_buffer)
+
+        self.selector = selectors.DefaultSelector()
+        self._connections: Dict[socket.socket, _Connection] = {}
+
+        # Lets stop() wake the event loop up from another thread
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+
+    @property
+    def is_listening(self) -> bool:
+        """
+        Read only property to check whether the SelectorListener is listening and
+        active.
+        """
+        return self._is_listening
+
+    @property
+    def connection_count(self) -> int:
+        """
+        Number of client connections currently open
+        """
+        return len(self._connections)
+
+    def accept_connection(self) -> None:
+        """
+        Accept every connection waiting on the listening socket and register each one
+        with the selector for reading.
+        """
+        if not self.is_listening:
+            raise RuntimeError("Service is not running. Please start service.")
+
+        while True:
+            try:
+                client_socket, _ = self.server_socket.accept()
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logger.error(f"Error accepting connection: {e}")
+                return
+
+            logger.info("Connection established.")
+            client_socket.setblocking(False)
+            connection = _Connection(
+                client_socket, self.connection_handler.create_request_framer()
+            )
+            self._connections[client_socket] = connection
+            self.selector.register(client_socket, selectors.EVENT_READ, connection)
+
+    def handle_request(
+        self, request_data: Any, connection: _Connection, keep_alive: bool = False
+    ) -> None:
+        """
+        Pass a complete request to the connection handler and queue its response to
+        be written back once the client socket is writable, after any response queued
+        before it. The connection is closed once the queue is flushed unless keep_alive
+        is set.
+        """
+        res = self.connection_handler.handle_connection(
+            request_data, connection.client_socket, keep_alive=keep_alive
+        )
+        logger.info("Data to be sent back: %s", describe(res))
+        if is_streamed(res):
+            connection.out_buffers.append(iter(res))
+        else:
+            connection.out_buffers.extend(as_buffers(res))
+        connection.close_when_flushed = not keep_alive
+        if not connection.writing:
+            connection.writing = True
+            self.selector.modify(
+                connection.client_socket, selectors.EVENT_WRITE, connection
+            )
+
+    def start(self) -> None:
+        """
+        Will start listening and run the event loop until stop() is called
+        """
+        if self.is_listening:
+            logger.info("Service already starting. Nothing to do")
+            return
+
+        try:
+            logger.info("Starting service.")
+            self.server_socket.listen(self.backlog)
+            self.selector.register(self.server_socket, selectors.EVENT_READ)
+            self.selector.register(self._wakeup_reader, selectors.EVENT_READ)
+            self._is_listening = True
+            logger.info(f"Service listening on {self.hostname}:{self.port}")
+        except Exception as e:
+            logger.error(f"Could not start service: {e}")
+            raise TCPListenerError(f"Could not start service: {e}")
+
+        try:
+            self._run()
+        finally:
+            self._shutdown()
+
+    def stop(self) -> None:
+        """
+        Will stop the event loop. Safe to call from any thread.
+        """
+        logger.info("Stopping service")
+        if not self.is_listening:
+            logger.warning("Service is already stopped. Nothing to do.")
+            return
+
+        self._is_listening = False
+        try:
+            self._wakeup_writer.send(b"\0")
+        except OSError as e:
+            logger.error(f"Error shutting down service: {e}")
+            raise TCPListenerError(f"Error shutting down service: {e}")
+
+    def _run(self) -> None:
+        timeouts = [
+            timeout
+            for timeout in (self.client_timeout, self.keep_alive_timeout)
+            if timeout is not None
+        ]
+        sweep_interval = min(timeouts + [1.0]) if timeouts else None
+        last_sweep = time.monotonic()
+
+        while self.is_listening:
+            for key, events in self.selector.select(sweep_interval):
+                if key.fileobj is self.server_socket:
+                    self.accept_connection()
+                elif key.fileobj is self._wakeup_reader:
+                    self._drain_wakeup()
+                elif events & selectors.EVENT_READ:
+                    self._read(key.data)
+                elif events & selectors.EVENT_WRITE:
+                    self._write(key.data)
+
+            if sweep_interval is not None:
+                now = time.monotonic()
+                if now - last_sweep >= sweep_interval:
+                    self._close_idle_connections(now)
+                    last_sweep = now
+
+    def _read(self, connection: _Connection) -> None:
+        try:
+            nbytes = connection.client_socket.recv_into(self._read_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            logger.error(f"Could not receive data: {e}")
+            self._close_connection(connection)
+            return
+
+        if not nbytes:
+            logger.info("Client closed the connection")
+            self._close_connection(connection)
+            return
+
+        connection.last_active = time.monotonic()
+        try:
+            for request_data in connection.framer.feed(self._read_view[:nbytes]):
+                if connection.close_when_flushed:
+                    # Anything pipelined after the last request is never answered
+                    break
+                connection.requests_served += 1
+                keep_alive = keep_connection_alive(
+                    self.connection_handler,
+                    request_data,
+                    connection.requests_served,
+                    self.max_keep_alive_requests,
+                )
+                self.handle_request(request_data, connection, keep_alive=keep_alive)
+        except Exception as e:
+            logger.error(f"Error handling client socket: {e}")
+            self._close_connection(connection)
+
+    def _write(self, connection: _Connection) -> None:
+        try:
+            buffers = self._ready_buffers(connection.out_buffers)
+        except Exception as e:
+            # The head of the response is out already, so all that can be done is to
+            # cut it short
+            logger.error(f"Error streaming response: {e}")
+            self._close_connection(connection)
+            return
+
+        if connection.out_buffers:
+            try:
+                if not buffers:
+                    # A FileRegion is up first
+                    sent = sendfile_some(
+                        connection.client_socket, connection.out_buffers[0]
+                    )
+                elif hasattr(connection.client_socket, "sendmsg"):
+                    sent = connection.client_socket.sendmsg(buffers)
+                else:
+                    sent = connection.client_socket.send(buffers[0])
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.error(f"Could not send data: {e}")
+                self._close_connection(connection)
+                return
+
+            consume(connection.out_buffers, sent)
+            if connection.out_buffers:
+                return
+
+        logger.info("Response sent back to client.")
+        if connection.close_when_flushed:
+            self._close_connection(connection)
+            return
+
+        connection.writing = False
+        connection.last_active = time.monotonic()
+        connection.awaiting_request_since = connection.last_active
+        self.selector.modify(connection.client_socket, selectors.EVENT_READ, connection)
+
+    def _ready_buffers(
+        self, out_buffers: Deque[Union[memoryview, FileRegion, Iterator[bytes]]]
+    ) -> List[memoryview]:
+        """
+        Return the buffers at the front of the queue that can be written right away,
+        pulling the next buffer of a streamed response if one is up first. None are
+        returned when a FileRegion is up first.
+        """
+        while out_buffers and not isinstance(out_buffers[0], (memoryview, FileRegion)):
+            stream = out_buffers[0]
+            buffer = next(stream, None)
+            if buffer is None:
+                out_buffers.popleft()
+            elif len(buffer):
+                out_buffers.appendleft(memoryview(buffer).cast("B"))
+
+        ready: List[memoryview] = []
+        for queued in islice(out_buffers, IOV_MAX):
+            if not isinstance(queued, memoryview):
+                break
+            ready.append(queued)
+        return ready
+
+    def _close_idle_connections(self, now: float) -> None:
+        """
+        Close connections that have been waiting on a complete request for longer
+        than client_timeout, and kept-alive connections that have been idle for longer
+        than keep_alive_timeout
+        """
+        for connection in list(self._connections.values()):
+            if connection.writing:
+                continue
+            if (
+                self.client_timeout is not None
+                and now - connection.awaiting_request_since > self.client_timeout
+            ):
+                logger.info("Client did not send a request in time. Closing connection")
+                self._close_connection(connection)
+            elif (
+                self.keep_alive_timeout is not None
+                and connection.requests_served
+                and now - connection.last_active > self.keep_alive_timeout
+            ):
+                logger.info("Keep-alive connection idle. Closing connection")
+                self._close_connection(connection)
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while self._wakeup_reader.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _close_connection(self, connection: _Connection) -> None:
+        self._connections.pop(connection.client_socket, None)
+        try:
+            self.selector.unregister(connection.client_socket)
+        except (KeyError, ValueError):
+            pass
+
+        try:
+            connection.client_socket.close()
+        except OSError as e:
+            logger.error(f"Socket error closing client socket: {e}")
+        else:
+            logger.info("Client socket closed successfully")
+
+    def _shutdown(self) -> None:
+        for connection in list(self._connections.values()):
+            self._close_connection(connection)
+
+        self.selector.close()
+        self.server_socket.close()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+        self._is_listening = False
+        logger.info("Service has been stopped.")
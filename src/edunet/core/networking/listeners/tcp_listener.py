@@ -1,24 +1,107 @@
 import logging
 import socket
 import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Set, Tuple
 
+from edunet.core.concurrency.worker_pool import OverflowPolicy, WorkerPool
+from edunet.core.networking.buffer_pool import BufferPool
 from edunet.core.networking.handlers.connection_handler import ConnectionHandler
-from edunet.core.networking.listeners.listener import Listener
-from edunet.exceptions import TCPListenerError
+from edunet.core.networking.listeners.listener import (
+    READ_CHUNK_SIZE,
+    Listener,
+    bind_server_socket,
+    keep_connection_alive,
+)
+from edunet.core.networking.scatter_gather import (
+    ResponseData,
+    describe,
+    sendmsg_all,
+)
+from edunet.exceptions import TCPListenerError, WorkerPoolFullError
 
 logger = logging.getLogger(__name__)
 
 
 class TCPListener(Listener):
-    def __init__(self, hostname: str, port: int, connection_handler: ConnectionHandler):
+    """
+    Blocking TCP listener that hands every accepted connection off to a thread.
+
+    By default each connection gets a brand-new thread. Passing max_workers switches
+    to a pooled mode where a fixed number of worker threads serve connections from a
+    bounded queue of queue_size entries (0 means unbounded). When that queue is full,
+    the overflow policy decides whether the accept loop blocks until a worker frees up
+    (OverflowPolicy.BLOCK) or the connection is closed straight away
+    (OverflowPolicy.REJECT).
+
+    The accept loop only accepts and dispatches sockets; reading the request happens on
+    the connection's thread or worker. client_timeout (seconds) bounds how long that
+    worker waits on a client that connects but never sends anything.
+
+    reuse_port sets SO_REUSEPORT so several processes can each run a listener on the
+    same port, as the PreforkNode does.
+
+    When the connection handler says a request may keep its connection alive, the
+    connection is read again for the next request instead of being closed. It is
+    closed once it has been idle for keep_alive_timeout seconds or has served
+    max_keep_alive_requests requests. Note that in pooled mode a kept-alive connection
+    holds on to its worker until then.
+
+    stop() shuts down the reading side of every connection still open, so a worker
+    waiting on an idle client is woken and the listener stops without waiting for
+    client_timeout, while a response being written is still sent in full.
+
+    Pipelined requests (several requests sent before waiting for the responses) are
+    answered in the order they arrived. Passing a pipeline_executor lets the requests
+    of a pipelined batch be handled concurrently on that executor; their responses are
+    still sent back in request order.
+
+    listener = TCPListener(
+        "127.0.0.1", 9999, handler, max_workers=32, queue_size=256,
+        overflow=OverflowPolicy.REJECT,
+    )
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        connection_handler: ConnectionHandler,
+        max_workers: Optional[int] = None,
+        queue_size: int = 0,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        client_timeout: Optional[float] = None,
+        reuse_port: bool = False,
+        keep_alive_timeout: Optional[float] = 5.0,
+        max_keep_alive_requests: int = 100,
+        pipeline_executor: Optional[Executor] = None,
+    ):
         self.hostname = hostname
         self.port = port
 
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.bind((self.hostname, self.port))
+        self.server_socket = bind_server_socket(self.hostname, self.port, reuse_port)
         self._is_listening = False
 
         self.connection_handler = connection_handler
+        self.client_timeout = client_timeout
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_keep_alive_requests = max_keep_alive_requests
+        self.pipeline_executor = pipeline_executor
+        self.buffer_pool = BufferPool(READ_CHUNK_SIZE)
+
+        # Connections being served, so stop() can wake the workers reading them
+        self._clients: Set[socket.socket] = set()
+        self._clients_lock = threading.Lock()
+        self._stopping = False
+
+        self.worker_pool: Optional[WorkerPool] = None
+        if max_workers is not None:
+            self.worker_pool = WorkerPool(
+                max_workers=max_workers,
+                queue_size=queue_size,
+                overflow=overflow,
+                name="tcp-listener-worker",
+            )
 
     @property
     def is_listening(self):
@@ -45,13 +128,14 @@ class TCPListener(Listener):
                 client_socket, _ = self.server_socket.accept()
                 logger.info("Connection established.")
 
-                request_data = client_socket.recv(1024)
+                if self.client_timeout is not None:
+                    client_socket.settimeout(self.client_timeout)
 
                 logger.info(f"The socket client: {client_socket}")
 
-                threading.Thread(
-                    target=self.handle_request, args=(request_data, client_socket)
-                ).start()
+                # Reading happens on the worker so a slow client never holds up
+                # the accept loop for everybody else
+                self._dispatch(client_socket)
 
                 # We still want a safeguarded way to break the loop if we find ourselves
                 # in a situation where the service goes down while hanging in this loop
@@ -66,21 +150,50 @@ class TCPListener(Listener):
                 else:
                     logger.error(f"Error handling client socket: {e}")
 
-    def handle_request(self, request_data, client_socket: socket.socket) -> None:
+    def handle_request(
+        self, request_data, client_socket: socket.socket, keep_alive: bool = False
+    ) -> None:
         """
         Provide a RequestData object to receive a ResponseData response.
+
+        The client socket is closed afterwards unless keep_alive is set, in which case
+        it is only closed if something went wrong.
+        """
+        self._respond(
+            lambda: self.connection_handler.handle_connection(
+                request_data, client_socket, keep_alive=keep_alive
+            ),
+            client_socket,
+            keep_alive,
+        )
+
+    def _respond(
+        self,
+        get_response: Callable[[], ResponseData],
+        client_socket: socket.socket,
+        keep_alive: bool,
+    ) -> None:
+        """
+        Internal method to send the response get_response produces back to the client,
+        closing the client socket afterwards unless keep_alive is set. A response made
+        of several buffers is written with a single vectored send where possible.
         """
         try:
-            res = self.connection_handler.handle_connection(request_data, client_socket)
-            logger.info(f"Data to be sent back: {res}")
-            client_socket.sendall(res)
+            res = get_response()
+            logger.info("Data to be sent back: %s", describe(res))
+            sendmsg_all(client_socket, res)
             logger.info("Response sent back to client.")
         except socket.error as e:
             logger.error(f"Could not send data: {e}")
+            keep_alive = False
             raise TCPListenerError(e)
+        except Exception:
+            keep_alive = False
+            raise
         finally:
-            logger.info("Closing connection")
-            self._close_client_socket(client_socket)
+            if not keep_alive:
+                logger.info("Closing connection")
+                self._close_client_socket(client_socket)
 
     def start(self) -> None:
         """
@@ -90,6 +203,8 @@ class TCPListener(Listener):
             if not self.is_listening:
                 logger.info("Starting service.")
                 self.server_socket.listen()
+                if self.worker_pool is not None:
+                    self.worker_pool.start()
                 self._is_listening = True
 
                 logger.info(f"Service listening on {self.hostname}:{self.port}")
@@ -108,8 +223,12 @@ class TCPListener(Listener):
         logger.info("Stopping service")
         if self.is_listening:
             try:
-                self.server_socket.close()
                 self._is_listening = False
+                self._wake_accept_loop()
+                self.server_socket.close()
+                self._wake_clients()
+                if self.worker_pool is not None:
+                    self.worker_pool.shutdown()
             except Exception as e:
                 logger.error(f"Error shutting down service: {e}")
                 raise TCPListenerError(f"Error shutting down service: {e}")
@@ -118,6 +237,164 @@ class TCPListener(Listener):
         else:
             logger.warning("Service is already stopped. Nothing to do.")
 
+    def _wake_accept_loop(self) -> None:
+        """
+        Internal method to unblock a pending accept(). Closing the listening socket
+        alone does not interrupt a thread blocked in accept() on Linux.
+        """
+        try:
+            self.server_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            # Not every platform lets a listening socket be shut down
+            pass
+
+    def _wake_clients(self) -> None:
+        """
+        Internal method to unblock the workers waiting to read from a client. Shutting
+        down the reading side makes a pending recv() return as if the client had
+        closed the connection, and lets a response being written finish.
+        """
+        with self._clients_lock:
+            self._stopping = True
+            clients = list(self._clients)
+
+        for client_socket in clients:
+            try:
+                client_socket.shutdown(socket.SHUT_RD)
+            except OSError:
+                # Already closed by its worker
+                pass
+
+    def _serve_client(self, client_socket: socket.socket) -> None:
+        """
+        Internal method run off the accept thread to read requests from a client
+        socket and pass them on to handle_request, for as long as the connection is
+        kept alive
+        """
+        with self._clients_lock:
+            if self._stopping:
+                logger.info("Service stopped before connection was served")
+                self._close_client_socket(client_socket)
+                return
+            self._clients.add(client_socket)
+
+        try:
+            self._read_requests(client_socket)
+        finally:
+            with self._clients_lock:
+                self._clients.discard(client_socket)
+
+    def _read_requests(self, client_socket: socket.socket) -> None:
+        """
+        Internal method to read requests from a client socket until the connection
+        is closed
+        """
+        framer = self.connection_handler.create_request_framer()
+        requests_served = 0
+        # Reads land in a pooled buffer; the framer copies out what it keeps
+        buffer = self.buffer_pool.acquire()
+        view = memoryview(buffer)
+
+        try:
+            while True:
+                try:
+                    nbytes = client_socket.recv_into(buffer)
+                except socket.timeout:
+                    if requests_served:
+                        logger.info("Keep-alive connection idle. Closing connection")
+                    else:
+                        logger.error("Could not receive data: timed out")
+                    self._close_client_socket(client_socket)
+                    return
+                except OSError as e:
+                    logger.error(f"Could not receive data: {e}")
+                    self._close_client_socket(client_socket)
+                    return
+
+                if not nbytes:
+                    logger.info("Client closed the connection")
+                    self._close_client_socket(client_socket)
+                    return
+
+                try:
+                    requests = framer.feed(view[:nbytes])
+                except Exception as e:
+                    logger.error(f"Error handling client socket: {e}")
+                    self._close_client_socket(client_socket)
+                    return
+
+                batch: List[Tuple[Any, bool]] = []
+                for request_data in requests:
+                    requests_served += 1
+                    keep_alive = keep_connection_alive(
+                        self.connection_handler,
+                        request_data,
+                        requests_served,
+                        self.max_keep_alive_requests,
+                    )
+                    batch.append((request_data, keep_alive))
+                    if not keep_alive:
+                        # Anything pipelined after the last request is never answered
+                        break
+
+                if self.pipeline_executor is not None and len(batch) > 1:
+                    self._handle_pipelined(batch, client_socket, self.pipeline_executor)
+                else:
+                    for request_data, keep_alive in batch:
+                        self.handle_request(
+                            request_data, client_socket, keep_alive=keep_alive
+                        )
+
+                if batch and not batch[-1][1]:
+                    return
+
+                if requests_served:
+                    client_socket.settimeout(self.keep_alive_timeout)
+        finally:
+            view.release()
+            self.buffer_pool.release(buffer)
+
+    def _handle_pipelined(
+        self,
+        batch: List[Tuple[Any, bool]],
+        client_socket: socket.socket,
+        executor: Executor,
+    ) -> None:
+        """
+        Internal method to handle a batch of pipelined requests concurrently on an
+        executor while sending the responses back in request order
+        """
+        futures = [
+            executor.submit(
+                self.connection_handler.handle_connection,
+                request_data,
+                client_socket,
+                keep_alive=keep_alive,
+            )
+            for request_data, keep_alive in batch
+        ]
+        try:
+            for future, (_, keep_alive) in zip(futures, batch):
+                self._respond(future.result, client_socket, keep_alive)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _dispatch(self, client_socket: socket.socket) -> None:
+        """
+        Internal method to hand a connection off to a worker pool if one is configured,
+        otherwise to a dedicated thread
+        """
+        if self.worker_pool is None:
+            threading.Thread(target=self._serve_client, args=(client_socket,)).start()
+            return
+
+        try:
+            self.worker_pool.submit(self._serve_client, client_socket)
+        except WorkerPoolFullError as e:
+            logger.warning(f"Rejecting connection: {e}")
+            self._close_client_socket(client_socket)
+
     def _close_client_socket(self, client_socket) -> None:
         """
         Internal method to close a client socket and check if it has been closed
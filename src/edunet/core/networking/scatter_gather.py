@@ -0,0 +1,202 @@
+import os
+import socket
+from typing import Any, Iterable, List, MutableSequence, Sequence, Union
+
+# A response is either a single bytes-like object or a sequence of them, written back
+# in order as if they had been joined together. Any other iterable of them, such as
+# a generator, is a streamed response whose buffers are written as they are produced.
+# A sequence can also hold FileRegions, sent straight from their file.
+ResponseData = Union[bytes, bytearray, memoryview, Iterable[bytes]]
+
+# Most bytes a FileRegion is read in when it cannot go through os.sendfile
+FILE_CHUNK_SIZE = 65536
+
+try:
+    IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, OSError, ValueError):
+    IOV_MAX = 1024
+
+
+class FileRegion:
+    """
+    A range of bytes of an open file, standing in for them among the buffers of a
+    response so listeners can hand them to the kernel with os.sendfile: the file is
+    sent to the client socket without ever being copied into Python.
+
+    region = FileRegion(open("artifact.tar", "rb", buffering=0), offset=0, count=size)
+
+    The file is only read at explicit offsets, never through its position, so one
+    open file can be shared by regions sent to several clients at once. Like a
+    memoryview, a region has a length and slicing it gives a narrower region.
+    """
+
+    __slots__ = ("file", "offset", "count")
+
+    def __init__(self, file: Any, offset: int, count: int):
+        if offset < 0 or count < 0:
+            raise ValueError("offset and count must be at least 0")
+        self.file = file
+        self.offset = offset
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, key: slice) -> "FileRegion":
+        if not isinstance(key, slice):
+            raise TypeError("FileRegion can only be sliced")
+        start, stop, step = key.indices(self.count)
+        if step != 1:
+            raise ValueError("FileRegion cannot be sliced with a step")
+        return FileRegion(self.file, self.offset + start, max(stop - start, 0))
+
+    def __bytes__(self) -> bytes:
+        return self.read()
+
+    def __repr__(self) -> str:
+        return f"FileRegion({self.file!r}, offset={self.offset}, count={self.count})"
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to size bytes from the start of the region, or all of it
+        """
+        if size < 0 or size > self.count:
+            size = self.count
+        return os.pread(self.fileno(), size, self.offset)
+
+    tobytes = __bytes__
+
+
+def sendfile_all(client_socket: socket.socket, region: FileRegion) -> None:
+    """
+    Write a FileRegion to a blocking socket, with os.sendfile where the platform has
+    it and in FILE_CHUNK_SIZE reads otherwise
+    """
+    if hasattr(os, "sendfile") and hasattr(client_socket, "sendfile"):
+        sent = client_socket.sendfile(region.file, region.offset, region.count)
+        if sent < region.count:
+            raise OSError(f"File ended {region.count - sent} bytes short of region")
+        return
+
+    while region.count:
+        chunk = region.read(FILE_CHUNK_SIZE)
+        if not chunk:
+            raise OSError(f"File ended {region.count} bytes short of region")
+        client_socket.sendall(chunk)
+        sent = len(chunk)
+        region = region[sent:]
+
+
+def sendfile_some(client_socket: socket.socket, region: FileRegion) -> int:
+    """
+    Write as much of a FileRegion as a non-blocking socket takes right away, and
+    return how many bytes that was. BlockingIOError is raised when it takes none.
+    """
+    if hasattr(os, "sendfile"):
+        sent = os.sendfile(
+            client_socket.fileno(), region.fileno(), region.offset, region.count
+        )
+    else:
+        chunk = region.read(FILE_CHUNK_SIZE)
+        sent = client_socket.send(chunk) if chunk else 0
+    if not sent:
+        raise OSError(f"File ended {region.count} bytes short of region")
+    return sent
+
+
+def is_streamed(res: ResponseData) -> bool:
+    """
+    Whether a response is an iterator of buffers to be pulled one at a time, rather
+    than buffers that are all there already
+    """
+    return not isinstance(res, (bytes, bytearray, memoryview, Sequence))
+
+
+def describe(res: Any) -> str:
+    """
+    Size of a response, for logs: its length in bytes and how many buffers hold it,
+    never its contents, which can be megabytes long
+    """
+    if isinstance(res, (bytes, bytearray, memoryview)):
+        return f"{memoryview(res).nbytes} bytes"
+    if is_streamed(res):
+        return "streamed response"
+    return f"{sum(len(buffer) for buffer in res)} bytes in {len(res)} buffers"
+
+
+def as_buffers(
+    res: Union[bytes, bytearray, memoryview, Sequence[bytes]]
+) -> List[Union[memoryview, FileRegion]]:
+    """
+    Turn whatever a connection handler responded with into a list of memoryviews that
+    can be handed to socket.sendmsg, leaving empty buffers out. FileRegions are kept
+    as they are.
+    """
+    if isinstance(res, (bytes, bytearray, memoryview)):
+        return [memoryview(res).cast("B")] if len(res) else []
+    return [
+        buffer if isinstance(buffer, FileRegion) else memoryview(buffer).cast("B")
+        for buffer in res
+        if len(buffer)
+    ]
+
+
+def consume(buffers: MutableSequence[Any], sent: int) -> None:
+    """
+    Drop the first sent bytes off the front of buffers, slicing into the first buffer
+    (or FileRegion) that was only partly sent. Nothing is copied.
+    """
+    while sent:
+        first = buffers[0]
+        if sent < len(first):
+            buffers[0] = first[sent:]
+            return
+        sent -= len(first)
+        del buffers[0]
+
+
+def sendmsg_all(client_socket: socket.socket, res: ResponseData) -> None:
+    """
+    Write a response to a blocking socket with vectored I/O. Every buffer is handed to
+    the kernel as it is, so a large body is never copied just to put the status line
+    and headers in front of it. Partial sends are picked up where they stopped.
+
+    A single bytes-like response goes through sendall, as do the buffers on platforms
+    without socket.sendmsg once joined together. A streamed response is written a
+    buffer at a time as it is produced, so only one of its buffers is held at once.
+
+    FileRegions among the buffers are sent with socket.sendfile once the buffers
+    before them are out.
+    """
+    if isinstance(res, (bytes, bytearray, memoryview)):
+        client_socket.sendall(res)
+        return
+
+    if not isinstance(res, Sequence):
+        for buffer in res:
+            client_socket.sendall(buffer)
+        return
+
+    buffers = as_buffers(res)
+    start = 0
+    for index, queued in enumerate(buffers):
+        if isinstance(queued, FileRegion):
+            _sendmsg_buffers(client_socket, buffers[start:index])
+            sendfile_all(client_socket, queued)
+            start = index + 1
+    _sendmsg_buffers(client_socket, buffers[start:])
+
+
+def _sendmsg_buffers(client_socket: socket.socket, buffers: List[Any]) -> None:
+    if not buffers:
+        return
+    if not hasattr(client_socket, "sendmsg"):
+        client_socket.sendall(b"".join(buffers))
+        return
+
+    while buffers:
+        sent = client_socket.sendmsg(buffers[:IOV_MAX])
+        consume(buffers, sent)
@@ -1,5 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from edunet.core.networking.listeners.listener import Listener
 
@@ -12,7 +13,7 @@ class Node(ABC):
     requests, or if no service passed will act as a client nodes
     """
 
-    def __init__(self, listener: Listener):
+    def __init__(self, listener: Optional[Listener] = None):
         self.listener = listener
 
     @abstractmethod
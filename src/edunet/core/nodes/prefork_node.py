@@ -0,0 +1,161 @@
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from typing import Callable, List, Optional
+
+from edunet.core.networking.listeners.listener import Listener
+from edunet.core.nodes.node import Node
+
+logger = logging.getLogger(__name__)
+
+ListenerFactory = Callable[[], Listener]
+
+
+def _run_worker(listener_factory: ListenerFactory) -> None:
+    """
+    Entry point of every worker process: build a listener of its own and serve until
+    the supervisor sends SIGTERM.
+    """
+    listener: Optional[Listener] = None
+
+    def _terminate(*_) -> None:
+        if listener is not None and getattr(listener, "is_listening", False):
+            listener.stop()
+        else:
+            # Asked to stop before the listener got going, so there is nothing to
+            # wind down gracefully
+            raise SystemExit(0)
+
+    # The supervisor owns shutdown; a Ctrl-C in the terminal should not kill workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _terminate)
+
+    listener = listener_factory()
+
+    logger.info(f"Worker {os.getpid()} starting its listener")
+    listener.start()
+    logger.info(f"Worker {os.getpid()} stopped")
+
+
+class PreforkNode(Node):
+    """
+    Node that runs the same listener in several worker processes.
+
+    Threads all share one GIL, so a single listener tops out at one core. A PreforkNode
+    forks worker processes that each build their own listener from listener_factory.
+    The factory should create its listener with reuse_port=True so every worker can
+    bind the same port and the kernel balances connections between them.
+
+    The node supervises its workers: one that dies while the node is running is
+    replaced, and stop() terminates all of them.
+
+    def make_listener():
+        handler = SimpleHTTPConnectionHandler(SimpleHTTPApplication())
+        return TCPListener("127.0.0.1", 9999, handler, reuse_port=True)
+
+    node = PreforkNode(make_listener, workers=4)
+    node.start()
+    """
+
+    def __init__(
+        self,
+        listener_factory: ListenerFactory,
+        workers: Optional[int] = None,
+        restart_delay: float = 0.5,
+        stop_timeout: float = 5.0,
+    ):
+        super().__init__()
+        self.listener_factory = listener_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.restart_delay = restart_delay
+        self.stop_timeout = stop_timeout
+        self.machine_started = False
+        self.restart_count = 0
+
+        start_methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context(
+            "fork" if "fork" in start_methods else None
+        )
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self._stopping = threading.Event()
+
+    @property
+    def worker_pids(self) -> List[Optional[int]]:
+        """
+        Process ids of the current workers
+        """
+        return [process.pid for process in self._processes]
+
+    def start(self) -> None:
+        """
+        Start the workers and supervise them until stop() is called. This blocks, just
+        like starting a listener does.
+        """
+        logger.info("Starting Machine and services")
+        if self.machine_started:
+            logger.info("Machine already started. Nothing to do")
+            return
+
+        self._stopping.clear()
+        self.machine_started = True
+        self._processes = [self._spawn_worker() for _ in range(self.workers)]
+        logger.info(f"Machine has been started with {self.workers} workers")
+
+        try:
+            self._supervise()
+        except KeyboardInterrupt:
+            logger.info("Interrupted. Stopping workers")
+            self.stop()
+        finally:
+            self._reap_workers()
+
+    def stop(self) -> None:
+        """
+        Stop supervising and terminate every worker. Safe to call from any thread.
+        """
+        logger.info("Stopping services and machine")
+        if not self.machine_started:
+            logger.info("Machine already stopped. Nothing to do")
+            return
+
+        self.machine_started = False
+        self._stopping.set()
+
+    def _spawn_worker(self) -> multiprocessing.process.BaseProcess:
+        process = self._context.Process(
+            target=_run_worker, args=(self.listener_factory,), daemon=True
+        )
+        process.start()
+        logger.info(f"Started worker {process.pid}")
+        return process
+
+    def _supervise(self) -> None:
+        while not self._stopping.wait(timeout=self.restart_delay):
+            for index, process in enumerate(self._processes):
+                if process.is_alive():
+                    continue
+
+                logger.warning(
+                    f"Worker {process.pid} exited with code {process.exitcode}. "
+                    "Restarting it."
+                )
+                process.join()
+                self._processes[index] = self._spawn_worker()
+                self.restart_count += 1
+
+    def _reap_workers(self) -> None:
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+
+        for process in self._processes:
+            process.join(timeout=self.stop_timeout)
+            if process.is_alive():
+                logger.warning(f"Worker {process.pid} did not stop. Killing it.")
+                process.kill()
+                process.join()
+
+        self._processes = []
+        logger.info("Machine stopped")
@@ -17,3 +17,11 @@ class HTTPValidationError(EduRouterException):
 
 class HTTPDataModelError(EduRouterException):
     pass
+
+
+class WorkerPoolError(EduRouterException):
+    pass
+
+
+class WorkerPoolFullError(WorkerPoolError):
+    pass
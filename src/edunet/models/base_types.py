@@ -3,7 +3,8 @@ from dataclasses import dataclass
 
 @dataclass
 class Request:
-    pass
+    # Lets subclasses do without a __dict__ by declaring their own __slots__
+    __slots__ = ()
 
 
 @dataclass
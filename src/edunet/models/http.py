@@ -1,12 +1,27 @@
+import functools
+import io
 import logging
-from dataclasses import dataclass
-from typing import Optional, Dict, TypeVar, Type
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import (
+    Any,
+    List,
+    Mapping,
+    BinaryIO,
+    Optional,
+    Dict,
+    Iterable,
+    Iterator,
+    Tuple,
+    TypeVar,
+    Type,
+    Union,
+)
 
+from edunet.core.networking.scatter_gather import FileRegion
 from edunet.exceptions import HTTPValidationError, HTTPDataModelError
 from edunet.models.base_types import Request, Response
-from edunet.validators.http_validators import (
-    validate_and_get_http_request_components,
-)
+from edunet.validators.http_validators import split_http_request
 
 logger = logging.getLogger(__name__)
 
@@ -14,65 +29,582 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T", bound="HTTPRequest")
 
 
-@dataclass
+class HTTPHeaders(Mapping):
+    """
+    Read only, case-insensitive view of the headers of a request.
+
+    Headers usually come straight from the wire as their raw header block, which is
+    only split into fields the first time something needs all of them. Looking up a
+    single header searches the raw block instead, so a request whose headers are
+    never read, or only read one by one, never pays for indexing them.
+
+    headers = HTTPHeaders.from_raw(b"\\r\\nHost: example.com\\r\\nAccept: a")
+    headers[b"host"]              # b"example.com"
+    headers.get_all(b"Accept")    # [b"a"]
+    dict(headers)                 # {b"Host": b"example.com", b"Accept": b"a"}
+
+    As with a dict of the fields, iterating gives every distinct name as it was
+    received and a repeated header maps to its last value; get_all() returns every
+    value of a repeated header.
+    """
+
+    __slots__ = ("_raw", "_lowered", "_pairs", "_fields", "_index")
+
+    def __init__(
+        self,
+        fields: Union[Mapping, Iterable[Tuple[bytes, bytes]]] = (),
+    ):
+        self._raw: Optional[bytes] = None
+        self._lowered: Optional[bytes] = None
+        self._pairs: List[Tuple[bytes, bytes]] = []
+        self._fields: Optional[Dict[bytes, bytes]] = None
+        self._index: Optional[Dict[bytes, List[bytes]]] = None
+        self._build_index(fields.items() if isinstance(fields, Mapping) else fields)
+
+    @classmethod
+    def from_raw(cls, raw: bytes) -> "HTTPHeaders":
+        """
+        Wrap a validated header block without parsing it. Every header line in it is
+        preceded by CRLF, as it is when the block is sliced from right after the
+        request line up to the empty line.
+        """
+        headers = cls.__new__(cls)
+        headers._raw = raw
+        headers._lowered = None
+        headers._pairs = []
+        headers._fields = None
+        headers._index = None
+        return headers
+
+    def get(self, name: bytes, default: Any = None) -> Any:
+        if self._index is None and b": " not in name:
+            return self._find(name, default)
+        values = self._indexed().get(name.lower())
+        return values[-1] if values else default
+
+    def get_all(self, name: bytes) -> List[bytes]:
+        """
+        Every value of a header, in the order they were received
+        """
+        if self._index is None and b": " not in name:
+            return self._find_all(name)
+        return list(self._indexed().get(name.lower(), ()))
+
+    def fields(self) -> List[Tuple[bytes, bytes]]:
+        """
+        Every header as a (name, value) pair, in the order they were received and
+        repeated headers included
+        """
+        self._indexed()
+        return list(self._pairs)
+
+    def __getitem__(self, name: bytes) -> bytes:
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, bytes) and self.get(name, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._as_dict())
+
+    def __len__(self) -> int:
+        return len(self._as_dict())
+
+    def keys(self):
+        return self._as_dict().keys()
+
+    def items(self):
+        return self._as_dict().items()
+
+    def values(self):
+        return self._as_dict().values()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self._as_dict() == dict(other.items())
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return repr(self._as_dict())
+
+    def _find(self, name: bytes, default: Any) -> Any:
+        """
+        Look a single header up in the raw block, last one first
+        """
+        raw = self._raw or b""
+        if self._lowered is None:
+            self._lowered = raw.lower()
+        start = self._lowered.rfind(b"\r\n" + name.lower() + b": ")
+        if start == -1:
+            return default
+
+        value_start = start + len(name) + 4
+        value_end = raw.find(b"\r\n", value_start)
+        if value_end == -1:
+            value_end = len(raw)
+        return raw[value_start:value_end]
+
+    def _find_all(self, name: bytes) -> List[bytes]:
+        """
+        Look every value of a header up in the raw block
+        """
+        raw = self._raw or b""
+        if self._lowered is None:
+            self._lowered = raw.lower()
+        marker = b"\r\n" + name.lower() + b": "
+        values = []
+        start = self._lowered.find(marker)
+        while start != -1:
+            value_start = start + len(marker)
+            value_end = raw.find(b"\r\n", value_start)
+            if value_end == -1:
+                value_end = len(raw)
+            values.append(raw[value_start:value_end])
+            start = self._lowered.find(marker, value_end)
+        return values
+
+    def _indexed(self) -> Dict[bytes, List[bytes]]:
+        if self._index is None:
+            lines = (self._raw or b"").split(b"\r\n")
+            # The block starts with the CRLF that ends the request line
+            fields = []
+            for line in lines[1:]:
+                name, _, value = line.partition(b": ")
+                fields.append((name, value))
+            self._build_index(fields)
+        return self._index  # type: ignore
+
+    def _as_dict(self) -> Dict[bytes, bytes]:
+        if self._fields is None:
+            self._indexed()
+        return self._fields  # type: ignore
+
+    def _build_index(self, fields: Iterable[Tuple[bytes, bytes]]) -> None:
+        self._pairs = list(fields)
+        self._fields = {}
+        self._index = {}
+        for name, value in self._pairs:
+            self._fields[name] = value
+            self._index.setdefault(name.lower(), []).append(value)
+        self._raw = self._lowered = None
+
+
+_MISSING = object()
+
+
 class HTTPRequest(Request):
-    method: bytes
-    uri: bytes
-    version: bytes
-    headers: Dict[bytes, bytes]
-    body: bytes
+    """
+    An HTTP request. It is slotted and lazy to keep requests queued up on busy
+    connections small and cheap to create: headers stay an unparsed HTTPHeaders block
+    until they are looked at, and the URI is only split into path and query when one
+    of them is asked for.
+
+    request.path                  # b"/search" for a b"/search?q=edunet" URI
+    request.query                 # b"q=edunet"
+    request.headers[b"host"]      # case-insensitive
+    """
+
+    __slots__ = (
+        "method",
+        "version",
+        "body",
+        "body_file",
+        "_uri",
+        "_path",
+        "_query",
+        "_headers",
+    )
+
+    def __init__(
+        self,
+        method: bytes,
+        uri: bytes,
+        version: bytes,
+        headers: Union[HTTPHeaders, Mapping],
+        body: bytes,
+        body_file: Optional[BinaryIO] = None,
+    ):
+        self.method = method
+        self._uri = uri
+        self._path: Optional[bytes] = None
+        self._query: Optional[bytes] = None
+        self.version = version
+        if not isinstance(headers, HTTPHeaders):
+            headers = HTTPHeaders(headers)
+        self._headers = headers
+        self.body = body
+        # Set instead of body when a large body was spooled to a temporary file
+        self.body_file = body_file
+
+    @property
+    def uri(self) -> bytes:
+        return self._uri
+
+    @uri.setter
+    def uri(self, uri: bytes) -> None:
+        self._uri = uri
+        self._path = self._query = None
+
+    @property
+    def path(self) -> bytes:
+        """
+        The URI up to its query string
+        """
+        if self._path is None:
+            self._path, _, self._query = self._uri.partition(b"?")
+        return self._path
+
+    @property
+    def query(self) -> bytes:
+        """
+        The query string of the URI, without its "?", or b"" if it has none
+        """
+        if self._query is None:
+            self._path, _, self._query = self._uri.partition(b"?")
+        return self._query
+
+    @property
+    def headers(self) -> HTTPHeaders:
+        return self._headers
+
+    @headers.setter
+    def headers(self, headers: Union[HTTPHeaders, Mapping]) -> None:
+        if not isinstance(headers, HTTPHeaders):
+            headers = HTTPHeaders(headers)
+        self._headers = headers
 
     @classmethod
     def from_bytes(cls: Type[T], data: bytes) -> T:
         try:
-            request_line, headers, body = validate_and_get_http_request_components(data)
-
-            # Parse request line
-            method, uri, version = request_line.split(b" ")
+            method, uri, version, raw_headers, body = split_http_request(data)
 
             return cls(
                 method=method,
                 uri=uri,
                 version=version,
-                headers=headers,
+                headers=HTTPHeaders.from_raw(raw_headers),
                 body=body,
             )
         except (AttributeError, HTTPValidationError) as e:
             logger.error(f"Error creating Request object: {e}")
             raise HTTPDataModelError(f"Error creating Request object: {e}")
 
+    def open_body(self) -> BinaryIO:
+        """
+        File-like object to read the body from, whether it was spooled to a temporary
+        file or kept in memory. Applications that accept large uploads should read
+        the body through it, since body is left empty when the body was spooled.
+
+        class UploadApplication(Application):
+            def handle_request(self, request):
+                with open("upload", "wb") as upload:
+                    shutil.copyfileobj(request.open_body(), upload)
+        """
+        if self.body_file is not None:
+            return self.body_file
+        return io.BytesIO(self.body)
+
+    @property
+    def keep_alive(self) -> bool:
+        """
+        Whether the client wants the connection kept open after this request.
+
+        HTTP/1.1 connections are persistent unless the client sends Connection: close,
+        while HTTP/1.0 ones only are when the client asks with Connection: keep-alive.
+        """
+        connection = self.headers.get(b"connection", b"").lower()
+
+        options = {option.strip() for option in connection.split(b",")}
+        if self.version == b"HTTP/1.0":
+            return b"keep-alive" in options
+        return b"close" not in options
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, HTTPRequest):
+            return NotImplemented
+        return (
+            self.method == other.method
+            and self.uri == other.uri
+            and self.version == other.version
+            and self.headers == other.headers
+            and self.body == other.body
+        )
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(method={self.method!r}, uri={self.uri!r}, "
+            f"version={self.version!r}, headers={self.headers!r}, body={self.body!r})"
+        )
+
+
+def _build_status_lines() -> Dict[Tuple[str, int, str], bytes]:
+    return {
+        (version, status.value, status.phrase): (
+            f"{version} {status.value} {status.phrase}\r\n".encode("utf-8")
+        )
+        for version in ("HTTP/1.0", "HTTP/1.1")
+        for status in HTTPStatus
+    }
+
+
+# Encoded status lines for every standard status, keyed by (version, code, text)
+STATUS_LINES = _build_status_lines()
+
+
+def encode_status_line(http_version: str, status_code: int, status_text: str) -> bytes:
+    """
+    Return the encoded status line, e.g. b"HTTP/1.1 200 OK\\r\\n", from the precomputed
+    table when it is a standard one
+    """
+    status_line = STATUS_LINES.get((http_version, status_code, status_text))
+    if status_line is None:
+        status_line = f"{http_version} {status_code} {status_text}\r\n".encode("utf-8")
+    return status_line
+
+
+# Number of encoded header lines kept, the least recently used being dropped first
+MAX_CACHED_HEADER_LINES = 1024
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_HEADER_LINES)
+def _cached_header_line(name: str, value: str) -> bytes:
+    return f"{name}: {value}\r\n".encode("utf-8")
+
+
+def encode_header_line(name: Any, value: Any) -> bytes:
+    """
+    Return the encoded header line, e.g. b"Content-Type: text/html\\r\\n". Headers
+    repeat across responses, so lines made of strings are kept in an LRU cache of
+    MAX_CACHED_HEADER_LINES lines: lines that keep coming back stay encoded, while
+    values seen only once, such as ETags or cookies, are soon evicted.
+    """
+    if type(name) is not str or type(value) is not str:
+        return f"{name}: {value}\r\n".encode("utf-8")
+    return _cached_header_line(name, value)
+
+
+# Status of a response to a conditional request whose representation is unchanged
+NOT_MODIFIED = HTTPStatus.NOT_MODIFIED.value
+
+# What an HTTPResponse body can be. Binary bodies are sent as they are, a FileRegion
+# straight from its file, and an iterable of chunks is streamed with chunked transfer
+# coding.
+Buffer = Union[bytes, bytearray, memoryview]
+Body = Union[str, Buffer, FileRegion, Iterable[Union[str, Buffer]]]
+
+
+class HTTPResponseTemplate:
+    """
+    The static part of a response an application sends over and over: status line,
+    Content-Type and any fixed headers are serialized once, when the template is
+    created, and every response made from it reuses those bytes.
+
+    OK_HTML = HTTPResponseTemplate(200, "OK", content_type="text/html")
+
+    class MyApplication(Application):
+        def handle_request(self, request):
+            return OK_HTML.response(body="<p>Hello</p>")
+
+    Only Content-Length and the response's own additional_headers are serialized per
+    response.
+    """
+
+    __slots__ = (
+        "status_code",
+        "status_text",
+        "http_version",
+        "content_type",
+        "headers",
+        "status_line",
+        "header_lines",
+    )
+
+    def __init__(
+        self,
+        status_code: int,
+        status_text: str,
+        http_version: str = "HTTP/1.1",
+        content_type: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.status_code = status_code
+        self.status_text = status_text
+        self.http_version = http_version
+        self.content_type = content_type
+        self.headers = dict(headers or {})
+
+        self.status_line = encode_status_line(http_version, status_code, status_text)
+        lines = []
+        if content_type:
+            lines.append(encode_header_line("Content-Type", content_type))
+        for name, value in self.headers.items():
+            lines.append(encode_header_line(name, value))
+        self.header_lines = b"".join(lines)
+
+    def response(
+        self, body: Body, additional_headers: Optional[dict] = None
+    ) -> "HTTPResponse":
+        """
+        Create a response with this template's status and headers
+        """
+        return HTTPResponse(
+            status_code=self.status_code,
+            status_text=self.status_text,
+            body=body,
+            http_version=self.http_version,
+            content_type=self.content_type,
+            additional_headers=additional_headers,
+            template=self,
+        )
+
+    def matches(self, response: "HTTPResponse") -> bool:
+        """
+        Whether the response still has the status and Content-Type it was created with
+        """
+        return (
+            response.status_code == self.status_code
+            and response.status_text == self.status_text
+            and response.http_version == self.http_version
+            and response.content_type == self.content_type
+        )
+
 
 @dataclass
 class HTTPResponse(Response):
     status_code: int
     status_text: str
-    body: str
+    body: Body
     http_version: str = "HTTP/1.1"
     content_type: Optional[str] = None
     additional_headers: Optional[dict] = None
+    # Set by HTTPResponseTemplate.response() so the static parts are not re-encoded
+    template: Optional[HTTPResponseTemplate] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def all_headers(self) -> dict:
+        """
+        Every header the response is sent with besides Content-Type and its framing:
+        its template's headers, overridden by its additional_headers
+        """
+        headers = dict(self.template.headers) if self.template else {}
+        headers.update(self.additional_headers or {})
+        return headers
 
     def to_bytes(self) -> bytes:
+        return b"".join(
+            buffer.tobytes() if isinstance(buffer, FileRegion) else buffer
+            for buffer in self.to_buffers()
+        )
+
+    def to_buffers(
+        self, head_only: bool = False
+    ) -> Iterable[Union[Buffer, FileRegion]]:
+        """
+        Serialize the response as its status line, header block and body, kept as
+        separate buffers so a listener can write them with one vectored send instead
+        of copying the body to put the headers in front of it.
+
+        Status lines and header lines come from caches of their encoded form, or from
+        the response's template when it was made from one. A str body is encoded to
+        UTF-8 once; a binary body is sent without being copied. A FileRegion body is
+        left for the listener to send from its file with os.sendfile. Either way
+        Content-Length is its length in bytes.
+
+        A body that is any other iterable, such as a generator, is streamed instead:
+        the buffers are returned as an iterator that frames every chunk with chunked
+        transfer coding as it is produced, so the response is never held in memory
+        as a whole and its head goes out before the body is ready.
+
+        A 304 (Not Modified) response is sent as its head alone, whatever its body.
+        So is any response when head_only is set, as the answer to a HEAD request:
+        its head is the one the body would be sent with, Content-Length included, but
+        the body is neither sent nor, when streamed, read.
+        """
         try:
-            # Construct status line
-            status_line = (
-                f"{self.http_version} {self.status_code} {self.status_text}\r\n".encode(
-                    "utf-8"
+            body: Union[Buffer, FileRegion] = b""
+            chunks: Optional[Iterable[Union[str, Buffer]]] = None
+            if isinstance(self.body, str):
+                body = self.body.encode("utf-8")
+            elif isinstance(self.body, memoryview):
+                body = self.body.cast("B")
+            elif isinstance(self.body, (bytes, bytearray, FileRegion)):
+                body = self.body
+            elif isinstance(self.body, Iterable):
+                chunks = self.body  # type: ignore
+            else:
+                raise TypeError(
+                    "body must be str, bytes-like or an iterable of chunks, "
+                    f"not {type(self.body).__name__}"
                 )
-            )
 
-            # Construct headers
-            headers = f"Content-Length: {len(self.body)}\r\n".encode("utf-8")
-            if self.content_type:
-                headers += f"Content-Type: {self.content_type}\r\n".encode("utf-8")
+            template = self.template
+            if self.status_code == NOT_MODIFIED:
+                # A 304 never has a body, nor a length describing this one
+                body, chunks, headers = b"", None, []
+            elif chunks is not None:
+                headers = [b"Transfer-Encoding: chunked\r\n"]
+            else:
+                headers = [b"Content-Length: %d\r\n" % len(body)]
+            if template is not None and template.matches(self):
+                status_line = template.status_line
+                headers.append(template.header_lines)
+            else:
+                status_line = STATUS_LINES.get(
+                    (self.http_version, self.status_code, self.status_text)
+                ) or encode_status_line(
+                    self.http_version, self.status_code, self.status_text
+                )
+                if self.content_type:
+                    headers.append(
+                        encode_header_line("Content-Type", self.content_type)
+                    )
+                if template is not None:
+                    for key, value in template.headers.items():
+                        headers.append(encode_header_line(key, value))
+
             if self.additional_headers:
                 for key, value in self.additional_headers.items():
-                    headers += f"{key}: {value}\r\n".encode("utf-8")
-            headers += b"\r\n"
+                    headers.append(encode_header_line(key, value))
+            headers.append(b"\r\n")
 
-            # Combine status line, headers, and body
-            response = status_line + headers + self.body.encode("utf-8")
+            header_block = b"".join(headers)
         except (AttributeError, TypeError) as e:
             logger.error(f"Error creating response message: {e}")
             raise HTTPDataModelError(f"Error creating response message: {e}")
 
-        return response
+        if head_only:
+            return [status_line, header_block]
+        if chunks is not None:
+            return _stream_chunked(status_line + header_block, chunks)
+        return [status_line, header_block, body]
+
+
+def _stream_chunked(
+    head: bytes, chunks: Iterable[Union[str, Buffer]]
+) -> Iterator[bytes]:
+    """
+    Yield the head of a response, then every chunk of its body framed for chunked
+    transfer coding as it is produced, then the last chunk
+    """
+    yield head
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            elif isinstance(chunk, memoryview):
+                chunk = chunk.cast("B")
+            # An empty chunk would read as the end of the body
+            if chunk:
+                yield b"%x\r\n%s\r\n" % (len(chunk), chunk)
+    except TypeError as e:
+        logger.error(f"Error streaming response body: {e}")
+        raise HTTPDataModelError(f"Error streaming response body: {e}")
+    yield b"0\r\n\r\n"
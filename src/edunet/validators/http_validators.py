@@ -1,13 +1,13 @@
 import logging
-import re
-from typing import Tuple, Dict
+from itertools import islice
+from typing import Dict, NoReturn, Tuple
 
 from edunet.exceptions import HTTPValidationError
 
-# Compiled regex patterns for request line, headers, and body
-REQUEST_LINE_PATTERN = re.compile(rb"^[A-Z]+ [^\r\n]* HTTP/(1\.[01]|2\.0)$")
-HEADER_PATTERN = re.compile(rb"^[^\r\n]+: [^\r\n]*$")
-BODY_PATTERN = re.compile(rb".*")
+CRLF = b"\r\n"
+HTTP_VERSIONS = frozenset((b"HTTP/1.0", b"HTTP/1.1", b"HTTP/2.0"))
+# Length of " HTTP/x.y" at the end of a request line
+VERSION_SUFFIX_LENGTH = 9
 
 logger = logging.getLogger(__name__)
 
@@ -25,43 +25,200 @@ def validate_and_get_http_request_components(
     - tuple: A tuple containing the request line, headers, and body if the request
              is valid, otherwise None.
     """
+    method, uri, version, headers, body = parse_http_request(request)
+    return b" ".join((method, uri, version)), headers, body
 
-    # Split the request into components, excluding empty lines
-    request_line, headers, body = _get_parts(request)
 
-    # Validate request line
-    if not re.match(REQUEST_LINE_PATTERN, request_line):
-        logger.error("Invalid request line: %s", request_line)
-        raise HTTPValidationError(f"Invalid request line pattern: {request_line}")
+def parse_http_request(
+    request: bytes,
+) -> Tuple[bytes, bytes, bytes, Dict[bytes, bytes], bytes]:
+    """
+    Validates an HTTP request and splits it into its parts in a single pass, walking
+    the header block line by line up to the empty line that ends it.
 
-    # Validate headers format and parse into key-value pairs
-    parsed_headers = {}
-    for header in headers:
-        if not re.match(HEADER_PATTERN, header):
-            logger.error("Invalid header pattern: %s", header)
-            raise HTTPValidationError(f"Invalid header pattern: {header}")
+    Args:
+    - request (bytes): The HTTP request to parse.
+
+    Returns:
+    - tuple: A tuple containing the method, URI, version, headers, and body.
 
-        # Split header into key and value
-        header_name, header_value = header.split(b": ", 1)
-        parsed_headers[header_name] = header_value
+    Raises:
+    - HTTPValidationError: If the request line or a header is malformed.
+    """
+    end = request.find(CRLF)
+    if end == -1:
+        return (*parse_request_line(request), {}, b"")
+
+    method, uri, version = _split_request_line(request[:end])
+
+    headers = {}
+    position = end + len(CRLF)
+    line_count = 1
+    while True:
+        end = request.find(CRLF, position)
+        if end == -1 or end == position:
+            break
+
+        header_name, separator, header_value = request[position:end].partition(b": ")
+        if not (header_name and separator):
+            header_name, header_value = validate_and_get_header(request[position:end])
+        headers[header_name] = header_value
+        line_count += 1
+        position = end + len(CRLF)
+
+    if end == -1:
+        # No empty line ends the header block, so what is left is its last line
+        header_end = len(request)
+        header_name, header_value = validate_and_get_header(request[position:])
+        headers[header_name] = header_value
+        body = b""
+    else:
+        header_end = end
+        body_start = end + len(CRLF)
+        body = request[body_start:]
+
+    # Every CR and LF in the header block should belong to a line break. Checking
+    # that once for the whole block is much cheaper than doing it line by line.
+    if (
+        request.count(b"\r", 0, header_end) != line_count
+        or request.count(b"\n", 0, header_end) != line_count
+    ):
+        _raise_for_stray_line_breaks(request[:header_end])
+
+    return method, uri, version, headers, body
+
+
+def split_http_request(request: bytes) -> Tuple[bytes, bytes, bytes, bytes, bytes]:
+    """
+    Validates an HTTP request like parse_http_request, but leaves the header block in
+    one piece instead of splitting every header into a name and a value.
+
+    Args:
+    - request (bytes): The HTTP request to split.
 
-    return request_line, parsed_headers, body
+    Returns:
+    - tuple: A tuple containing the method, URI, version, raw header block and body.
+      The header block runs from the CRLF that ends the request line to the end of
+      the last header line, so every header line in it is preceded by CRLF.
 
+    Raises:
+    - HTTPValidationError: If the request line or a header is malformed.
+    """
+    end = request.find(CRLF)
+    if end == -1:
+        return (*parse_request_line(request), b"", b"")
 
-def _get_parts(request):
-    # Split the request into components using line boundaries
-    components = request.split(b"\r\n\r\n", 1)
+    method, uri, version = parse_request_line(request[:end])
 
-    # Extract the request line and headers
-    request_line_and_headers = components[0].split(b"\r\n")
-    request_line = request_line_and_headers[0]
-    headers = request_line_and_headers[1:]
+    header_end = request.find(CRLF + CRLF, end)
+    if header_end == -1:
+        # No empty line ends the header block, so it runs to the end of the request
+        block = request[end:]
+        body = b""
+    else:
+        block = request[end:header_end]
+        body_start = header_end + 2 * len(CRLF)
+        body = request[body_start:]
 
-    # Initialize the body
-    body = b""
+    validate_header_block(block)
+    return method, uri, version, block, body
 
-    # If there are components beyond the request line and headers
-    if len(components) > 1:
-        body = components[1]
 
-    return request_line, headers, body
+def parse_request_line(request_line: bytes) -> Tuple[bytes, bytes, bytes]:
+    """
+    Validates a single HTTP request line, e.g. b"GET /index.html HTTP/1.1", and
+    returns its method, URI and version.
+
+    Raises:
+    - HTTPValidationError: If the request line is malformed.
+    """
+    if b"\r" in request_line or b"\n" in request_line:
+        _raise_invalid_request_line(request_line)
+    return _split_request_line(request_line)
+
+
+def validate_header_block(block: bytes) -> None:
+    """
+    Validates a raw header block in one go, without splitting every header into a
+    name and a value.
+
+    Args:
+    - block (bytes): The header lines, each preceded by CRLF, without the empty line
+      that ends the block.
+
+    Raises:
+    - HTTPValidationError: If a header is malformed.
+    """
+    lines = block.split(CRLF)
+    for header in islice(lines, 1, None):
+        if header.find(b": ", 1) == -1:
+            validate_and_get_header(header)
+
+    # Every CR and LF in the block should belong to the line break before a header
+    line_count = len(lines) - 1
+    if block.count(b"\r") != line_count or block.count(b"\n") != line_count:
+        for header in islice(lines, 1, None):
+            validate_and_get_header(header)
+
+
+def validate_and_get_header(header: bytes) -> Tuple[bytes, bytes]:
+    """
+    Validates a single HTTP header line and returns its name and value.
+
+    Args:
+    - header (bytes): The header line without its trailing CRLF.
+
+    Returns:
+    - tuple: A tuple containing the header name and value.
+    """
+    separator = header.find(b": ")
+    # A name can itself contain ": ", as long as it is not empty
+    if (
+        (separator < 1 and header.find(b": ", 1) == -1)
+        or b"\r" in header
+        or b"\n" in header
+    ):
+        logger.error("Invalid header pattern: %s", header)
+        raise HTTPValidationError(f"Invalid header pattern: {header!r}")
+
+    value_start = separator + 2
+    return header[:separator], header[value_start:]
+
+
+def _split_request_line(request_line: bytes) -> Tuple[bytes, bytes, bytes]:
+    """
+    Validates everything about a request line but stray CR and LF characters
+    """
+    method_end = request_line.find(b" ")
+    uri_start = method_end + 1
+    uri_end = len(request_line) - VERSION_SUFFIX_LENGTH
+    version_start = uri_end + 1
+    method = request_line[:method_end]
+    version = request_line[version_start:]
+
+    if (
+        method_end < 1
+        or uri_end <= method_end
+        or not (method.isalpha() and method.isupper())
+        or request_line[uri_end] != 0x20
+        or version not in HTTP_VERSIONS
+    ):
+        _raise_invalid_request_line(request_line)
+
+    return method, request_line[uri_start:uri_end], version
+
+
+def _raise_invalid_request_line(request_line: bytes) -> NoReturn:
+    logger.error("Invalid request line: %s", request_line)
+    raise HTTPValidationError(f"Invalid request line pattern: {request_line!r}")
+
+
+def _raise_for_stray_line_breaks(header_block: bytes) -> None:
+    """
+    Find the line holding a CR or LF that is not part of a line break and raise the
+    error the line by line validation would have raised for it
+    """
+    request_line, *headers = header_block.split(CRLF)
+    parse_request_line(request_line)
+    for header in headers:
+        validate_and_get_header(header)
@@ -1,5 +1,7 @@
 import logging
+import socket
 import threading
+import time
 
 import pytest
 
@@ -8,6 +10,7 @@ from edunet.core.networking.handlers.simple_http_connection_handler import (
     SimpleHTTPConnectionHandler,
 )
 from edunet.core.networking.listeners.tcp_listener import TCPListener
+from edunet.core.nodes.prefork_node import PreforkNode
 from edunet.core.nodes.simple_http_node import SimpleHTTPNode
 
 logger = logging.getLogger(__name__)
@@ -34,3 +37,35 @@ def simple_http_server():
     http_node.stop()
 
     server_thread.join()
+
+
+@pytest.fixture(scope="module")
+def prefork_http_server():
+    def make_listener():
+        http_connection_handler = SimpleHTTPConnectionHandler(SimpleHTTPApplication())
+        return TCPListener(
+            "127.0.0.1",
+            9998,
+            http_connection_handler,
+            max_workers=16,
+            reuse_port=True,
+        )
+
+    http_node = PreforkNode(make_listener, workers=2)
+
+    server_thread = threading.Thread(target=http_node.start)
+    server_thread.start()
+
+    # Wait for at least one worker to be accepting connections
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", 9998), timeout=1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+
+    yield
+
+    http_node.stop()
+
+    server_thread.join()
@@ -0,0 +1,48 @@
+import logging
+import os
+import threading
+import urllib.request
+import uuid
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.mark.skipif(
+    "SKIP_LOAD_TEST" in os.environ and os.environ["SKIP_LOAD_TEST"] == "true",
+    reason="Skipping test in CI due to heavy load",
+)
+@pytest.mark.parametrize("num_connections", [200])
+def test_prefork_http_server_load_with_sync_calls(
+    prefork_http_server, num_connections
+):
+    expected_responses = {}
+
+    threads = []
+    for _ in range(num_connections):
+        identifier = uuid.uuid4()
+        thread = threading.Thread(
+            target=send_request_and_collect_response_sync,
+            args=(identifier, expected_responses),
+        )
+        thread.start()
+        threads.append(thread)
+
+    for thread in threads:
+        thread.join()
+
+    assert len(expected_responses) == num_connections
+    for identifier, expected_response in expected_responses.items():
+        assert (
+            str(identifier) in expected_response
+        ), f"UUID mismatch for identifier {identifier}"
+
+
+def send_request_and_collect_response_sync(identifier, expected_responses):
+    url = "http://localhost:9998"
+    headers = {"X-UUID": str(identifier)}
+
+    request = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(request) as response:
+        expected_responses[identifier] = response.read().decode("utf-8")
@@ -2,8 +2,23 @@ from unittest.mock import Mock
 
 import pytest
 
+from edunet.core.applications.application import Application
 from edunet.core.applications.simple_http_application import SimpleHTTPApplication
-from edunet.models.http import HTTPRequest
+from edunet.models.http import HTTPRequest, HTTPResponse
+
+
+class FixedApplication(Application):
+    """
+    Answers every request with a 200 response made of the given HTTPResponse fields
+    """
+
+    def __init__(self, **response_kwargs):
+        self.response_kwargs = response_kwargs
+
+    def handle_request(self, request_data):
+        kwargs = {"status_code": 200, "status_text": "OK"}
+        kwargs.update(self.response_kwargs)
+        return HTTPResponse(**kwargs)
 
 
 @pytest.fixture
@@ -14,3 +29,27 @@ def mock_http_request_model():
 @pytest.fixture
 def simple_http_application():
     return SimpleHTTPApplication()
+
+
+@pytest.fixture
+def make_request():
+    def make(uri=b"/hello", method=b"GET", headers=None):
+        return HTTPRequest(
+            method=method, uri=uri, version=b"HTTP/1.1", headers=headers or {}, body=b""
+        )
+
+    return make
+
+
+@pytest.fixture
+def response_body():
+    # Overridden by test modules that need another body
+    return "Hello World"
+
+
+@pytest.fixture
+def fixed_application(response_body):
+    def make(**response_kwargs):
+        return FixedApplication(**{"body": response_body, **response_kwargs})
+
+    return make
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+from edunet.core.applications.async_application import AsyncApplication
+
+
+def test_instantiating_an_implemented_async_application_is_successful():
+    class MyTestApplication(AsyncApplication):
+        async def handle_request(self, *args, **kwargs):
+            return True
+
+    my_test_application = MyTestApplication()
+
+    assert asyncio.run(my_test_application.handle_request("foo")) is True
+
+
+def test_async_application_raises_when_methods_not_implemented():
+    class MyTestApplication(AsyncApplication):
+        pass
+
+    with pytest.raises(TypeError) as exc:
+        MyTestApplication()  # type: ignore
+
+    assert "handle_request" in str(exc.value)
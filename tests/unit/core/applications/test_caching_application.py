@@ -0,0 +1,265 @@
+from unittest.mock import patch
+
+import pytest
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.caching_application import CachingApplication
+from edunet.core.applications.compressing_application import CompressingApplication
+from edunet.models.http import HTTPResponse, HTTPResponseTemplate
+
+OK_TEXT = HTTPResponseTemplate(
+    200, "OK", content_type="text/plain", headers={"X-Served-By": "edunet"}
+)
+
+
+class CountingApplication(Application):
+    """
+    Answers every request with its URI and how many requests it has answered
+    """
+
+    def __init__(self, **response_kwargs):
+        self.calls = 0
+        self.response_kwargs = response_kwargs
+
+    def handle_request(self, request_data):
+        self.calls += 1
+        kwargs = {"body": f"{request_data.uri.decode()} #{self.calls}"}
+        kwargs.update(self.response_kwargs)
+        return OK_TEXT.response(**kwargs)
+
+
+@pytest.fixture
+def clock():
+    with patch(
+        "edunet.core.applications.caching_application.time.monotonic",
+        return_value=1000.0,
+    ) as monotonic:
+        yield monotonic
+
+
+def test_caching_application_answers_repeated_request_from_cache(make_request, clock):
+    # Given a response that has been cached
+    application = CountingApplication(additional_headers={"X-Request": "1"})
+    cache = CachingApplication(application)
+    first = cache.handle_request(make_request())
+
+    # When the same request comes again
+    second = cache.handle_request(make_request())
+
+    # Then I expect the application not to run, and the same response to be sent
+    assert application.calls == 1
+    assert second.to_bytes() == first.to_bytes()
+    assert second.to_bytes() == (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Length: 9\r\n"
+        b"Content-Type: text/plain\r\n"
+        b"X-Served-By: edunet\r\n"
+        b"X-Request: 1\r\n"
+        b"\r\n"
+        b"/hello #1"
+    )
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_caching_application_keys_on_method_uri_and_vary_headers(make_request, clock):
+    application = CountingApplication()
+    cache = CachingApplication(application, vary=("Accept-Language",))
+
+    for request in (
+        make_request(),
+        make_request(uri=b"/hello?x=1"),
+        make_request(method=b"HEAD"),
+        make_request(headers={b"Accept-Language": b"fr"}),
+        make_request(headers={b"accept-language": b"fr"}),
+    ):
+        cache.handle_request(request)
+
+    assert application.calls == 4
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_caching_application_expires_entries_after_ttl(make_request, clock):
+    application = CountingApplication()
+    cache = CachingApplication(application, ttl=10)
+    cache.handle_request(make_request())
+
+    clock.return_value += 9
+    assert cache.handle_request(make_request()).body == b"/hello #1"
+
+    clock.return_value += 1
+    assert cache.handle_request(make_request()).body == "/hello #2"
+    assert (cache.hits, cache.misses, cache.expirations) == (1, 2, 1)
+
+
+def test_caching_application_takes_ttl_from_max_age(make_request, clock):
+    application = CountingApplication(
+        additional_headers={"Cache-Control": "public, max-age=100"}
+    )
+    cache = CachingApplication(application, ttl=10)
+    cache.handle_request(make_request())
+
+    clock.return_value += 99
+    cache.handle_request(make_request())
+
+    assert application.calls == 1
+
+
+def test_caching_application_evicts_least_recently_used_entries(make_request, clock):
+    # Given a cache with room for two responses
+    application = CountingApplication()
+    cache = CachingApplication(application)
+    cache.handle_request(make_request(b"/a"))
+    cache.max_size = cache.size * 2
+
+    # When a third is cached after the first was used again
+    cache.handle_request(make_request(b"/b"))
+    cache.handle_request(make_request(b"/a"))
+    cache.handle_request(make_request(b"/c"))
+
+    # Then I expect the least recently used one to have been evicted
+    assert cache.evictions == 1
+    assert [key[1] for key in cache._entries] == [b"/a", b"/c"]
+    assert cache.size <= cache.max_size
+
+
+@pytest.mark.parametrize(
+    "response_kwargs",
+    [
+        {"additional_headers": {"Cache-Control": "no-store"}},
+        {"additional_headers": {"Cache-Control": "private, max-age=60"}},
+        {"additional_headers": {"Set-Cookie": "session=1"}},
+        {"body": (chunk for chunk in [b"streamed"])},
+        {"body": "x" * 2048},
+    ],
+)
+def test_caching_application_does_not_cache_some_responses(
+    make_request, clock, response_kwargs
+):
+    application = CountingApplication(**response_kwargs)
+    cache = CachingApplication(application, max_entry_size=1024)
+
+    cache.handle_request(make_request())
+    cache.handle_request(make_request())
+
+    assert application.calls == 2
+    assert cache.size == 0
+
+
+@pytest.mark.parametrize("vary", ["Accept-Encoding", "accept, *", "*"])
+def test_caching_application_does_not_cache_responses_varying_off_its_key(
+    make_request, clock, vary
+):
+    application = CountingApplication(additional_headers={"Vary": vary})
+    cache = CachingApplication(application, vary=("Accept",))
+
+    cache.handle_request(make_request())
+    cache.handle_request(make_request())
+
+    assert application.calls == 2
+    assert cache.size == 0
+
+
+def test_caching_application_does_not_serve_compressed_body_to_other_encodings(
+    make_request, clock
+):
+    # Given a cache in front of a CompressingApplication, filled by a gzip request
+    application = CountingApplication()
+    cache = CachingApplication(CompressingApplication(application, min_size=0))
+    gzip_request = make_request(headers={b"Accept-Encoding": b"gzip"})
+    assert "Content-Encoding" in cache.handle_request(gzip_request).additional_headers
+
+    # When a client that does not accept gzip asks for the same URI
+    res = cache.handle_request(make_request())
+
+    # Then I expect the body as it is
+    assert "Content-Encoding" not in res.additional_headers
+    assert res.body == "/hello #2"
+
+
+def test_caching_application_caches_per_encoding_when_vary_names_it(
+    make_request, clock
+):
+    application = CountingApplication()
+    cache = CachingApplication(
+        CompressingApplication(application, min_size=0), vary=("Accept-Encoding",)
+    )
+
+    for accept_encoding in (b"gzip", b"identity", b"gzip", b"identity"):
+        res = cache.handle_request(
+            make_request(headers={b"Accept-Encoding": accept_encoding})
+        )
+
+    assert application.calls == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert res.body == b"/hello #2"
+
+
+def test_caching_application_does_not_cache_uncacheable_statuses(make_request, clock):
+    class FailingApplication(Application):
+        def handle_request(self, request_data):
+            return HTTPResponse(
+                status_code=500, status_text="Internal Server Error", body=""
+            )
+
+    cache = CachingApplication(FailingApplication())
+    cache.handle_request(make_request())
+
+    assert cache.size == 0
+
+
+@pytest.mark.parametrize(
+    "request_kwargs",
+    [
+        {"method": b"POST"},
+        {"headers": {b"Authorization": b"Bearer token"}},
+        {"headers": {b"Cookie": b"session=1"}},
+    ],
+)
+def test_caching_application_bypasses_some_requests(
+    make_request, clock, request_kwargs
+):
+    application = CountingApplication()
+    cache = CachingApplication(application)
+
+    cache.handle_request(make_request(**request_kwargs))
+    cache.handle_request(make_request(**request_kwargs))
+
+    assert application.calls == 2
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_caching_application_caches_per_cookie_named_in_vary(make_request, clock):
+    # Given a cache keyed on the Cookie header
+    application = CountingApplication()
+    cache = CachingApplication(application, vary=("Cookie",))
+
+    # When two clients each ask twice
+    for cookie in (b"session=1", b"session=2", b"session=1", b"session=2"):
+        cache.handle_request(make_request(headers={b"Cookie": cookie}))
+
+    # Then I expect each client to be answered from its own entry
+    assert application.calls == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_caching_application_clear(make_request, clock):
+    application = CountingApplication()
+    cache = CachingApplication(application)
+    cache.handle_request(make_request())
+
+    cache.clear()
+    cache.handle_request(make_request())
+
+    assert application.calls == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"max_size": 0}, "max_size must be at least 1"),
+        ({"ttl": 0}, "ttl must be greater than 0"),
+    ],
+)
+def test_caching_application_rejects_invalid_settings(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        CachingApplication(CountingApplication(), **kwargs)
@@ -0,0 +1,213 @@
+import threading
+import time
+
+import pytest
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.coalescing_application import CoalescingApplication
+from edunet.models.http import HTTPResponse
+
+
+class BlockingApplication(Application):
+    """
+    Holds every request until released, then answers with its URI and how many
+    requests it has answered
+    """
+
+    def __init__(self, body=None, error=None, headers=None):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.body = body
+        self.error = error
+        self.headers = headers or {}
+        self._lock = threading.Lock()
+
+    def handle_request(self, request_data):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        body = self.body() if self.body else f"{request_data.uri.decode()} #{calls}"
+        return HTTPResponse(
+            status_code=200,
+            status_text="OK",
+            body=body,
+            additional_headers={"X-Call": str(calls), **self.headers},
+        )
+
+
+def run_concurrently(application, requests, wait=0.1):
+    """
+    Handle the first request, then the others once the first one is in the wrapped
+    application, and return every response or exception
+    """
+    results = [None] * len(requests)
+
+    def handle(index):
+        try:
+            results[index] = application.handle_request(requests[index])
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=handle, args=(i,)) for i in range(len(requests))]
+    threads[0].start()
+    application.application.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(wait)
+    application.application.release.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_coalescing_application_runs_identical_requests_once(make_request):
+    # Given identical requests arriving while the first one is being handled
+    application = CoalescingApplication(BlockingApplication())
+
+    # When they are all handled
+    responses = run_concurrently(application, [make_request() for _ in range(10)])
+
+    # Then I expect the application to have run once, and every request to get a
+    # copy of its response
+    assert application.application.calls == 1
+    assert {response.body for response in responses} == {"/hello #1"}
+    assert len({id(response) for response in responses}) == 10
+    assert application.coalesced == 9
+
+
+def test_coalescing_application_gives_each_request_its_own_headers(make_request):
+    application = CoalescingApplication(BlockingApplication())
+    first, second = run_concurrently(application, [make_request(), make_request()])
+
+    first.additional_headers["Connection"] = "close"
+
+    assert second.additional_headers == {"X-Call": "1"}
+
+
+def test_coalescing_application_keys_on_method_uri_and_vary_headers(make_request):
+    application = CoalescingApplication(BlockingApplication(), vary=("Accept",))
+
+    responses = run_concurrently(
+        application,
+        [
+            make_request(),
+            make_request(uri=b"/other"),
+            make_request(headers={b"Accept": b"text/html"}),
+            make_request(headers={b"Accept": b"text/html"}),
+        ],
+    )
+
+    assert application.application.calls == 3
+    assert responses[3].body == responses[2].body
+
+
+def test_coalescing_application_raises_leader_error_in_every_request(make_request):
+    error = ValueError("Bad Stuff")
+    application = CoalescingApplication(BlockingApplication(error=error))
+
+    results = run_concurrently(application, [make_request() for _ in range(3)])
+
+    assert results == [error, error, error]
+    assert application.application.calls == 1
+
+
+def test_coalescing_application_stops_waiting_after_timeout(make_request, caplog):
+    # Given a request stuck in the application
+    blocking = BlockingApplication()
+    application = CoalescingApplication(blocking, timeout=0.05)
+    leader = threading.Thread(target=application.handle_request, args=[make_request()])
+    leader.start()
+    blocking.started.wait(5)
+
+    # When an identical request has waited longer than the timeout
+    threading.Timer(0.2, blocking.release.set).start()
+    response = application.handle_request(make_request())
+    leader.join(5)
+
+    # Then I expect it to have run the application itself
+    assert response.body == "/hello #2"
+    assert application.timeouts == 1
+    assert "Timed out after 0.05s waiting for identical request" in caplog.text
+
+
+def test_coalescing_application_does_not_share_streamed_responses(make_request):
+    application = CoalescingApplication(
+        BlockingApplication(body=lambda: iter([b"streamed"]))
+    )
+
+    responses = run_concurrently(application, [make_request() for _ in range(3)])
+
+    assert application.application.calls == 3
+    assert application.coalesced == 0
+    assert all(list(response.body) == [b"streamed"] for response in responses)
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"Set-Cookie": "session=0"},
+        {"Cache-Control": "private, max-age=60"},
+        {"cache-control": "no-store"},
+    ],
+)
+def test_coalescing_application_does_not_share_private_responses(make_request, headers):
+    # Given an application starting a session for every anonymous client
+    application = CoalescingApplication(BlockingApplication(headers=headers))
+
+    # When three of them ask at the same time
+    responses = run_concurrently(application, [make_request() for _ in range(3)])
+
+    # Then I expect each of them to get a response of its own
+    assert application.application.calls == 3
+    assert application.coalesced == 0
+    assert {response.additional_headers["X-Call"] for response in responses} == {
+        "1",
+        "2",
+        "3",
+    }
+
+
+def test_coalescing_application_bypasses_other_methods(make_request):
+    application = CoalescingApplication(BlockingApplication())
+
+    run_concurrently(application, [make_request(method=b"POST") for _ in range(3)])
+
+    assert application.application.calls == 3
+
+
+@pytest.mark.parametrize(
+    "headers", [{b"Authorization": b"Bearer token"}, {b"Cookie": b"session=1"}]
+)
+def test_coalescing_application_bypasses_requests_with_credentials(
+    make_request, headers
+):
+    application = CoalescingApplication(BlockingApplication())
+
+    run_concurrently(application, [make_request(headers=headers) for _ in range(3)])
+
+    assert application.application.calls == 3
+    assert application.coalesced == 0
+
+
+def test_coalescing_application_coalesces_per_cookie_named_in_vary(make_request):
+    application = CoalescingApplication(BlockingApplication(), vary=("Cookie",))
+    requests = [
+        make_request(headers={b"Cookie": cookie})
+        for cookie in (b"session=1", b"session=1", b"session=2")
+    ]
+
+    responses = run_concurrently(application, requests)
+
+    assert application.application.calls == 2
+    assert application.coalesced == 1
+    assert responses[0].body == responses[1].body != responses[2].body
+
+
+def test_coalescing_application_rejects_invalid_timeout():
+    with pytest.raises(ValueError, match="timeout must be greater than 0"):
+        CoalescingApplication(BlockingApplication(), timeout=0)
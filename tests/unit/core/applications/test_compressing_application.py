@@ -0,0 +1,257 @@
+import gzip
+import zlib
+
+import pytest
+
+from edunet.core.applications.compressing_application import (
+    CompressingApplication,
+    is_compressible,
+    negotiate_encoding,
+)
+from edunet.core.networking.scatter_gather import FileRegion
+from edunet.models.http import HTTPResponseTemplate
+
+TEXT = "All work and no play makes Jack a dull boy. " * 100
+
+
+@pytest.fixture
+def response_body():
+    return TEXT
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, decompress",
+    [
+        (b"gzip, deflate, br", gzip.decompress),
+        (b"deflate;q=1.0, gzip;q=0.5", zlib.decompress),
+    ],
+)
+def test_compressing_application_compresses_with_negotiated_encoding(
+    make_request, fixed_application, accept_encoding, decompress
+):
+    application = CompressingApplication(
+        fixed_application(content_type="text/plain", additional_headers={"X-A": "1"})
+    )
+
+    res = application.handle_request(
+        make_request(headers={b"Accept-Encoding": accept_encoding})
+    )
+
+    encoding = "gzip" if decompress is gzip.decompress else "deflate"
+    assert res.additional_headers == {
+        "X-A": "1",
+        "Content-Encoding": encoding,
+        "Vary": "Accept-Encoding",
+    }
+    assert decompress(res.body) == TEXT.encode()
+    assert b"Content-Length: %d\r\n" % len(res.body) in res.to_bytes()
+
+
+@pytest.mark.parametrize(
+    "response_kwargs",
+    [
+        {"body": "too small"},
+        {"content_type": "image/png"},
+        {"status_code": 206, "status_text": "Partial Content"},
+        {"additional_headers": {"Content-Encoding": "br"}},
+        {"additional_headers": {"Cache-Control": "no-transform"}},
+    ],
+)
+def test_compressing_application_leaves_some_responses_as_they_are(
+    make_request, fixed_application, response_kwargs
+):
+    application = CompressingApplication(fixed_application(**response_kwargs))
+
+    res = application.handle_request(
+        make_request(headers={b"Accept-Encoding": b"gzip, deflate"})
+    )
+
+    assert "Content-Encoding" not in (res.additional_headers or {}) or (
+        res.additional_headers["Content-Encoding"] == "br"
+    )
+    assert res.body == response_kwargs.get("body", TEXT)
+
+
+def test_compressing_application_leaves_file_regions_as_they_are(
+    make_request, fixed_application, tmp_path
+):
+    path = tmp_path / "body.txt"
+    path.write_text(TEXT)
+    with open(path, "rb", buffering=0) as file:
+        region = FileRegion(file, 0, len(TEXT))
+        application = CompressingApplication(fixed_application(body=region))
+
+        assert (
+            application.handle_request(
+                make_request(headers={b"Accept-Encoding": b"gzip, deflate"})
+            ).body
+            is region
+        )
+
+
+def test_compressing_application_sends_body_as_is_without_accept_encoding(
+    make_request, fixed_application
+):
+    application = CompressingApplication(fixed_application())
+
+    res = application.handle_request(make_request())
+
+    # Then I expect caches to be told the body depends on Accept-Encoding
+    assert res.body == TEXT
+    assert res.additional_headers == {"Vary": "Accept-Encoding"}
+
+
+def test_compressing_application_adds_to_existing_vary_header(
+    make_request, fixed_application
+):
+    application = CompressingApplication(
+        fixed_application(additional_headers={"vary": "Accept-Language"})
+    )
+
+    res = application.handle_request(
+        make_request(headers={b"Accept-Encoding": b"gzip, deflate"})
+    )
+
+    assert res.additional_headers["vary"] == "Accept-Language, Accept-Encoding"
+    assert "Vary" not in res.additional_headers
+
+
+@pytest.mark.parametrize(
+    "etag, expected", [('"v1"', '"v1-gzip"'), ('W/"v1"', 'W/"v1"')]
+)
+def test_compressing_application_makes_strong_etag_encoding_specific(
+    make_request, fixed_application, etag, expected
+):
+    application = CompressingApplication(
+        fixed_application(additional_headers={"ETag": etag})
+    )
+
+    res = application.handle_request(
+        make_request(headers={b"Accept-Encoding": b"gzip"})
+    )
+
+    assert res.additional_headers["ETag"] == expected
+
+
+def test_compressing_application_replaces_etag_of_template(
+    make_request, fixed_application
+):
+    # Given a response whose ETag is serialized in its template
+    template = HTTPResponseTemplate(200, "OK", headers={"ETag": '"v1"', "X-A": "1"})
+    application = CompressingApplication(fixed_application(template=template))
+
+    # When it is compressed
+    res = application.handle_request(
+        make_request(headers={b"Accept-Encoding": b"gzip"})
+    )
+
+    # Then I expect only the encoding-specific tag to be sent
+    head = res.to_bytes().partition(b"\r\n\r\n")[0]
+    assert b'ETag: "v1-gzip"\r\n' in head
+    assert b'ETag: "v1"\r\n' not in head
+    assert b"X-A: 1\r\n" in head
+
+
+def test_compressing_application_streams_compressed_chunks(
+    make_request, fixed_application
+):
+    produced = []
+
+    def chunks():
+        for index in range(3):
+            produced.append(index)
+            yield TEXT
+
+    application = CompressingApplication(fixed_application(body=chunks()))
+    res = application.handle_request(
+        make_request(headers={b"Accept-Encoding": b"gzip"})
+    )
+
+    # Then I expect every chunk to be compressed and flushed as it is produced
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    stream = iter(res.body)
+    assert decompressor.decompress(next(stream)) == TEXT.encode()
+    assert produced == [0]
+    rest = b"".join(decompressor.decompress(part) for part in stream)
+    assert rest == TEXT.encode() * 2
+    assert decompressor.eof
+    assert b"Transfer-Encoding: chunked" in res.to_bytes()
+
+
+def test_compressing_application_caches_compressed_bodies(
+    make_request, fixed_application
+):
+    application = CompressingApplication(fixed_application())
+
+    first = application.handle_request(
+        make_request(headers={b"Accept-Encoding": b"gzip"})
+    )
+    second = application.handle_request(
+        make_request(headers={b"Accept-Encoding": b"gzip"})
+    )
+    application.handle_request(make_request(headers={b"Accept-Encoding": b"deflate"}))
+
+    assert second.body is first.body
+    assert (application.cache_hits, application.cache_misses) == (1, 2)
+
+
+def test_compressing_application_evicts_compressed_bodies_past_cache_size(
+    make_request, fixed_application
+):
+    application = CompressingApplication(fixed_application(), cache_size=len(TEXT))
+
+    application.handle_request(make_request(headers={b"Accept-Encoding": b"gzip"}))
+    application.handle_request(make_request(headers={b"Accept-Encoding": b"gzip"}))
+
+    assert (application.cache_hits, application.cache_misses) == (0, 2)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (b"gzip", "gzip"),
+        (b"deflate, gzip", "gzip"),
+        (b"GZIP;q=0.1, deflate;q=0.2", "deflate"),
+        (b"*", "gzip"),
+        (b"*;q=0.5, gzip;q=0", "deflate"),
+        (b"gzip;q=0, deflate;q=0", None),
+        (b"br", None),
+        (b"gzip;q=0.5, identity", None),
+        (b"gzip;q=bad", None),
+        (b"", None),
+        (None, None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ("gzip", "deflate")) == expected
+
+
+@pytest.mark.parametrize(
+    "content_type, expected",
+    [
+        (None, True),
+        ("text/html; charset=utf-8", True),
+        ("application/json", True),
+        ("image/svg+xml", True),
+        ("image/jpeg", False),
+        ("video/mp4", False),
+        ("application/zip", False),
+        ("font/woff2", False),
+    ],
+)
+def test_is_compressible(content_type, expected):
+    assert is_compressible(content_type) is expected
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"level": 10}, "level must be between 0 and 9"),
+        ({"encodings": ("gzip", "br")}, "Unsupported encodings: br"),
+    ],
+)
+def test_compressing_application_rejects_invalid_settings(
+    fixed_application, kwargs, message
+):
+    with pytest.raises(ValueError, match=message):
+        CompressingApplication(fixed_application(), **kwargs)
@@ -0,0 +1,199 @@
+import pytest
+
+from edunet.core.applications.conditional_application import (
+    ConditionalApplication,
+    etag_matches,
+    make_etag,
+    parse_http_date,
+)
+from edunet.models.http import HTTPResponseTemplate
+
+BODY = "Hello World"
+ETAG = make_etag(BODY.encode())
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+@pytest.fixture
+def response_body():
+    return BODY
+
+
+def test_conditional_application_tags_response_with_strong_etag(
+    make_request, fixed_application
+):
+    application = ConditionalApplication(
+        fixed_application(content_type="text/plain", additional_headers={"X-A": "1"})
+    )
+
+    res = application.handle_request(make_request())
+
+    assert res.status_code == 200
+    assert res.additional_headers == {"X-A": "1", "ETag": ETAG}
+    assert ETAG == '"0cc84ab57c476d2385b899ca742a2790"'
+
+
+@pytest.mark.parametrize("if_none_match", [ETAG, f'"other", W/{ETAG}', "*"])
+def test_conditional_application_answers_matching_if_none_match_with_304(
+    make_request, fixed_application, if_none_match
+):
+    application = ConditionalApplication(
+        fixed_application(
+            content_type="text/plain",
+            additional_headers={"Cache-Control": "max-age=60", "X-A": "1"},
+        )
+    )
+
+    res = application.handle_request(
+        make_request(headers={b"If-None-Match": if_none_match.encode()})
+    )
+
+    # Then I expect the head alone, keeping only the headers a 304 may have
+    assert res.to_bytes() == (
+        b"HTTP/1.1 304 Not Modified\r\n"
+        b"Cache-Control: max-age=60\r\n"
+        b"ETag: " + ETAG.encode() + b"\r\n"
+        b"\r\n"
+    )
+
+
+def test_conditional_application_sends_body_when_if_none_match_differs(
+    make_request, fixed_application
+):
+    application = ConditionalApplication(fixed_application())
+
+    res = application.handle_request(
+        make_request(headers={b"If-None-Match": b'"stale"'})
+    )
+
+    assert res.status_code == 200
+    assert res.body == BODY
+
+
+def test_conditional_application_keeps_etag_of_response(
+    make_request, fixed_application
+):
+    template = HTTPResponseTemplate(200, "OK", headers={"ETag": '"v1"'})
+    application = ConditionalApplication(fixed_application(template=template))
+
+    res = application.handle_request(make_request(headers={b"If-None-Match": b'"v1"'}))
+
+    assert res.status_code == 304
+    assert res.additional_headers == {"ETag": '"v1"'}
+    assert application.cache_misses == 0
+
+
+@pytest.mark.parametrize(
+    "if_modified_since, expected_status",
+    [
+        (LAST_MODIFIED, 304),
+        ("Thu, 22 Oct 2015 07:28:00 GMT", 304),
+        ("Tue, 20 Oct 2015 07:28:00 GMT", 200),
+        ("not a date", 200),
+    ],
+)
+def test_conditional_application_evaluates_if_modified_since(
+    make_request, fixed_application, if_modified_since, expected_status
+):
+    # Given a streamed body, which is not tagged
+    application = ConditionalApplication(
+        fixed_application(
+            body=iter([BODY]), additional_headers={"Last-Modified": LAST_MODIFIED}
+        )
+    )
+
+    res = application.handle_request(
+        make_request(headers={b"If-Modified-Since": if_modified_since.encode()})
+    )
+
+    assert res.status_code == expected_status
+    assert "ETag" not in res.additional_headers
+
+
+def test_conditional_application_prefers_if_none_match_to_if_modified_since(
+    make_request, fixed_application
+):
+    application = ConditionalApplication(
+        fixed_application(additional_headers={"Last-Modified": LAST_MODIFIED})
+    )
+
+    res = application.handle_request(
+        make_request(
+            headers={
+                b"If-None-Match": b'"stale"',
+                b"If-Modified-Since": LAST_MODIFIED.encode(),
+            }
+        )
+    )
+
+    assert res.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "response_kwargs, method",
+    [
+        ({"status_code": 404, "status_text": "Not Found"}, b"GET"),
+        ({}, b"POST"),
+    ],
+)
+def test_conditional_application_only_handles_successful_gets(
+    make_request, fixed_application, response_kwargs, method
+):
+    application = ConditionalApplication(fixed_application(**response_kwargs))
+
+    res = application.handle_request(
+        make_request(headers={b"If-None-Match": b"*"}, method=method)
+    )
+
+    assert res.body == BODY
+    assert res.additional_headers is None
+
+
+def test_conditional_application_caches_etags_of_bodies(
+    make_request, fixed_application
+):
+    application = ConditionalApplication(fixed_application())
+
+    for _ in range(3):
+        application.handle_request(make_request())
+
+    assert (application.cache_hits, application.cache_misses) == (2, 1)
+    assert application.etag(bytearray(BODY.encode())) == ETAG
+
+
+def test_conditional_application_evicts_etags_past_cache_size(
+    make_request, fixed_application
+):
+    application = ConditionalApplication(fixed_application(), cache_size=len(BODY) - 1)
+
+    application.handle_request(make_request())
+    application.handle_request(make_request())
+
+    assert (application.cache_hits, application.cache_misses) == (0, 2)
+
+
+@pytest.mark.parametrize(
+    "if_none_match, etag, expected",
+    [
+        (b'"a"', '"a"', True),
+        (b'W/"a"', '"a"', True),
+        (b'"b", "a"', 'W/"a"', True),
+        (b'"b"', '"a"', False),
+        (b"*", None, True),
+        (b'"a"', None, False),
+    ],
+)
+def test_etag_matches(if_none_match, etag, expected):
+    assert etag_matches(if_none_match, etag) is expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (LAST_MODIFIED, 1445412480),
+        (LAST_MODIFIED.encode(), 1445412480),
+        ("yesterday", None),
+        (None, None),
+    ],
+)
+def test_parse_http_date(value, expected):
+    assert parse_http_date(value) == expected
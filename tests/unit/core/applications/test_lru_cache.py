@@ -0,0 +1,75 @@
+import threading
+
+from edunet.core.applications.lru_cache import LRUCache
+
+
+def test_lru_cache_computes_value_once():
+    calls = []
+    cache = LRUCache(100, lambda key, value: len(key))
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert cache.get(b"key", compute) == "value"
+    assert cache.get(b"key", compute) == "value"
+
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (len(cache), cache.size) == (1, 3)
+
+
+def test_lru_cache_evicts_least_recently_used_past_max_size():
+    # Given a cache with room for two entries
+    cache = LRUCache(4, lambda key, value: len(key) + len(value))
+    cache.get("a", lambda: "1")
+    cache.get("b", lambda: "2")
+
+    # When the oldest entry is used again and a third one is added
+    cache.get("a", lambda: "x")
+    cache.get("c", lambda: "3")
+
+    # Then I expect the least recently used entry to be the one evicted
+    assert (cache.hits, cache.misses, cache.size) == (1, 3, 4)
+    assert cache.get("a", lambda: "x") == "1"
+    assert cache.get("c", lambda: "x") == "3"
+
+
+def test_lru_cache_does_not_keep_entries_larger_than_max_size():
+    cache = LRUCache(2, lambda key, value: len(key))
+
+    cache.get("abc", lambda: 1)
+
+    assert (len(cache), cache.size) == (0, 0)
+
+
+def test_lru_cache_computes_outside_its_lock():
+    # Given a value that is slow to compute
+    cache = LRUCache(100, lambda key, value: 1)
+    computing = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        computing.set()
+        release.wait(5)
+        return "slow"
+
+    thread = threading.Thread(target=cache.get, args=("slow", slow))
+    thread.start()
+    computing.wait(5)
+
+    # When another key is looked up in the meantime
+    # Then I expect it not to wait for the slow one
+    assert cache.get("fast", lambda: "fast") == "fast"
+    release.set()
+    thread.join(5)
+    assert len(cache) == 2
+
+
+def test_lru_cache_clear():
+    cache = LRUCache(100, lambda key, value: len(key))
+    cache.get("a", lambda: 1)
+
+    cache.clear()
+
+    assert (len(cache), cache.size) == (0, 0)
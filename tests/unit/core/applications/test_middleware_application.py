@@ -0,0 +1,112 @@
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.applications.application import Application
+from edunet.core.applications.middleware_application import MiddlewareApplication
+from edunet.models.http import HTTPResponse
+
+
+class EchoApplication(Application):
+    def handle_request(self, request_data):
+        return HTTPResponse(status_code=200, status_text="OK", body=request_data.path)
+
+
+def recording(name, calls):
+    def middleware(next_handler):
+        def handler(request):
+            calls.append(f"{name} in")
+            response = next_handler(request)
+            calls.append(f"{name} out")
+            return response
+
+        return handler
+
+    return middleware
+
+
+def test_middleware_application_without_middlewares_calls_application(make_request):
+    res = MiddlewareApplication(EchoApplication()).handle_request(make_request())
+
+    assert res.status_code == 200
+    assert res.body == b"/hello"
+
+
+def test_middleware_application_runs_middlewares_in_order(make_request):
+    # Given two middlewares recording when they are called
+    calls = []
+    application = MiddlewareApplication(
+        EchoApplication(), [recording("outer", calls), recording("inner", calls)]
+    )
+
+    # When I handle a request
+    res = application.handle_request(make_request())
+
+    # Then I expect the first middleware to be the outermost layer
+    assert res.body == b"/hello"
+    assert calls == ["outer in", "inner in", "inner out", "outer out"]
+
+
+def test_middleware_application_composes_stack_once(make_request):
+    # Given a middleware factory counting how often it is called
+    factory = Mock(side_effect=lambda next_handler: next_handler)
+    application = MiddlewareApplication(EchoApplication(), [factory])
+
+    # When I handle several requests
+    for _ in range(3):
+        application.handle_request(make_request())
+
+    # Then I expect the stack to have been composed only when it was created
+    factory.assert_called_once()
+
+
+def test_middleware_application_lets_middleware_replace_request_and_response(
+    make_request,
+):
+    def rewrite(next_handler):
+        def handler(request):
+            request.uri = b"/rewritten"
+            response = next_handler(request)
+            response.additional_headers = {"X-Rewritten": "yes"}
+            return response
+
+        return handler
+
+    res = MiddlewareApplication(EchoApplication(), [rewrite]).handle_request(
+        make_request()
+    )
+
+    assert res.body == b"/rewritten"
+    assert res.additional_headers == {"X-Rewritten": "yes"}
+
+
+def test_middleware_application_lets_middleware_answer_request(make_request):
+    application = Mock(spec=Application)
+
+    def deny(next_handler):
+        return lambda request: HTTPResponse(
+            status_code=403, status_text="Forbidden", body=""
+        )
+
+    res = MiddlewareApplication(application, [deny]).handle_request(make_request())
+
+    assert res.status_code == 403
+    application.handle_request.assert_not_called()
+
+
+def test_middleware_application_use_adds_innermost_middleware(make_request):
+    calls = []
+    application = MiddlewareApplication(EchoApplication(), [recording("outer", calls)])
+
+    @application.use
+    def inner(next_handler):
+        return recording("inner", calls)(next_handler)
+
+    application.handle_request(make_request())
+
+    assert calls == ["outer in", "inner in", "inner out", "outer out"]
+
+
+def test_middleware_application_rejects_middleware_returning_non_callable():
+    with pytest.raises(TypeError, match="must return a callable handler"):
+        MiddlewareApplication(EchoApplication(), [lambda next_handler: None])
@@ -0,0 +1,132 @@
+import pytest
+
+from edunet.core.applications.router_application import RouterApplication
+from edunet.models.http import HTTPResponse
+
+
+def echo(name):
+    def handler(request, **params):
+        return HTTPResponse(status_code=200, status_text="OK", body=f"{name} {params}")
+
+    return handler
+
+
+@pytest.fixture
+def router():
+    router = RouterApplication()
+    router.add_route("GET", "/", echo("index"))
+    router.add_route("GET", "/users", echo("users"))
+    router.add_route("POST", "/users", echo("create user"))
+    router.add_route("GET", "/users/me", echo("me"))
+    router.add_route("GET", "/users/:user_id", echo("user"))
+    router.add_route("GET", "/users/:user_id/posts/:post_id", echo("post"))
+    router.add_route("GET", "/user-groups", echo("groups"))
+    router.add_route("GET", "/static/*path", echo("static"))
+    return router
+
+
+@pytest.mark.parametrize(
+    "method, uri, expected",
+    [
+        (b"GET", b"/", "index {}"),
+        (b"GET", b"/users", "users {}"),
+        (b"POST", b"/users", "create user {}"),
+        (b"GET", b"/users/me", "me {}"),
+        (b"GET", b"/users/42", "user {'user_id': '42'}"),
+        (b"GET", b"/users/42?verbose=1", "user {'user_id': '42'}"),
+        (b"GET", b"/users/a%20b", "user {'user_id': 'a b'}"),
+        (
+            b"GET",
+            b"/users/42/posts/7",
+            "post {'user_id': '42', 'post_id': '7'}",
+        ),
+        (b"GET", b"/user-groups", "groups {}"),
+        (b"GET", b"/static/css/site.css", "static {'path': 'css/site.css'}"),
+        (b"GET", b"/static/", "static {'path': ''}"),
+    ],
+)
+def test_router_dispatches_on_method_and_path(
+    make_request, router, method, uri, expected
+):
+    res = router.handle_request(make_request(uri, method=method))
+
+    assert res.status_code == 200
+    assert res.body == expected
+
+
+@pytest.mark.parametrize(
+    "uri", [b"/nope", b"/users/", b"/users/42/posts", b"/user", b"/static"]
+)
+def test_router_responds_404_when_no_route_matches(make_request, router, uri):
+    res = router.handle_request(make_request(uri))
+
+    assert res.status_code == 404
+    assert res.body == "Not Found"
+
+
+def test_router_responds_405_with_allowed_methods(make_request, router):
+    res = router.handle_request(make_request(b"/users", method=b"DELETE"))
+
+    assert res.status_code == 405
+    assert res.additional_headers == {"Allow": "GET, POST"}
+
+
+def test_router_falls_back_from_static_to_parameter_routes(make_request):
+    # Given a static route sharing its start with a path a parameter route matches
+    router = RouterApplication()
+    router.add_route("GET", "/files/new/edit", echo("static"))
+    router.add_route("GET", "/files/:name/:action", echo("param"))
+    router.add_route("GET", "/*rest", echo("wildcard"))
+
+    # Then I expect the more general routes to be tried once the static one fails
+    assert router.handle_request(make_request(b"/files/new/show")).body == (
+        "param {'name': 'new', 'action': 'show'}"
+    )
+    assert router.handle_request(make_request(b"/files/new/edit")).body == "static {}"
+    assert router.handle_request(make_request(b"/files/new")).body == (
+        "wildcard {'rest': 'files/new'}"
+    )
+
+
+def test_router_route_decorator(make_request):
+    router = RouterApplication()
+
+    @router.route("/items/:item_id", methods=("GET", "PUT"))
+    def item(request, item_id):
+        return HTTPResponse(
+            status_code=200, status_text="OK", body=request.method + item_id.encode()
+        )
+
+    assert (
+        router.handle_request(make_request(b"/items/3", method=b"PUT")).body == b"PUT3"
+    )
+    assert router.handle_request(make_request(b"/items/3")).body == b"GET3"
+
+
+def test_router_responds_500_when_handler_raises(make_request, caplog):
+    router = RouterApplication()
+
+    def broken(request):
+        raise RuntimeError("Bad Stuff")
+
+    router.add_route("GET", "/", broken)
+
+    res = router.handle_request(make_request(b"/"))
+
+    assert res.status_code == 500
+    assert "Unexpected server error: Bad Stuff" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "path, message",
+    [
+        ("users", "must start with '/'"),
+        ("/users/:", "must be named"),
+        ("/static/*path/more", "must be the last segment"),
+        ("/users/:id/posts", "conflicts with :user_id"),
+        ("/users", "already registered"),
+    ],
+)
+def test_router_rejects_invalid_routes(router, path, message):
+    with pytest.raises(ValueError, match=message):
+        router.add_route("GET", path, echo("invalid"))
@@ -0,0 +1,221 @@
+import os
+
+import pytest
+
+from edunet.core.applications.static_file_application import (
+    StaticFileApplication,
+    parse_range,
+)
+from edunet.core.networking.scatter_gather import FileRegion
+from edunet.models.http import HTTPRequest
+
+LARGE = bytes(range(256)) * 1024
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "small.txt").write_bytes(b"Hello, world!")
+    (tmp_path / "large.bin").write_bytes(LARGE)
+    (tmp_path / "empty.txt").write_bytes(b"")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "index.html").write_bytes(b"<p>docs</p>")
+    (tmp_path / "a b.txt").write_bytes(b"spaced")
+    return tmp_path
+
+
+@pytest.fixture
+def application(root):
+    application = StaticFileApplication(str(root), mmap_threshold=1024)
+    yield application
+    application.close()
+
+
+def get(application, uri, method=b"GET", headers=None):
+    request = HTTPRequest(
+        method=method,
+        uri=uri,
+        version=b"HTTP/1.1",
+        headers=headers or {},
+        body=b"",
+    )
+    return application.handle_request(request)
+
+
+def test_static_file_application_maps_small_files(application):
+    res = get(application, b"/small.txt")
+
+    assert res.status_code == 200
+    assert res.content_type == "text/plain"
+    assert isinstance(res.body, memoryview)
+    assert res.to_bytes().endswith(b"\r\n\r\nHello, world!")
+    assert b"Content-Length: 13\r\n" in res.to_bytes()
+    assert b"Accept-Ranges: bytes\r\n" in res.to_bytes()
+    assert b"Last-Modified: " in res.to_bytes()
+
+
+def test_static_file_application_sends_large_files_as_file_region(application):
+    res = get(application, b"/large.bin")
+
+    # Then I expect the body to be left in the file for the listener to send
+    assert res.status_code == 200
+    assert res.content_type == "application/octet-stream"
+    assert isinstance(res.body, FileRegion)
+    assert (res.body.offset, res.body.count) == (0, len(LARGE))
+    assert res.to_buffers()[-1] is res.body
+    assert res.to_bytes().endswith(LARGE)
+
+
+@pytest.mark.parametrize(
+    "uri, body",
+    [
+        (b"/docs", b"<p>docs</p>"),
+        (b"/docs/", b"<p>docs</p>"),
+        (b"/a%20b.txt", b"spaced"),
+        (b"/./small.txt?x=1", b"Hello, world!"),
+        (b"/empty.txt", b""),
+    ],
+)
+def test_static_file_application_serves_paths(application, uri, body):
+    res = get(application, uri)
+
+    assert res.status_code == 200
+    assert bytes(res.body) == body
+
+
+@pytest.mark.parametrize(
+    "uri",
+    [b"/missing.txt", b"/", b"/../etc/passwd", b"/docs/%2E%2E/small.txt", b"/%00"],
+)
+def test_static_file_application_responds_404(application, uri):
+    assert get(application, uri).status_code == 404
+
+
+def test_static_file_application_responds_405_to_other_methods(application):
+    res = get(application, b"/small.txt", method=b"POST")
+
+    assert res.status_code == 405
+    assert b"Allow: GET, HEAD\r\n" in res.to_bytes()
+
+
+@pytest.mark.parametrize(
+    "uri, size", [(b"/small.txt", 13), (b"/large.bin", len(LARGE))]
+)
+def test_static_file_application_answers_head_like_get(application, uri, size):
+    # Given the response to a GET for a file
+    get_head = b"".join(get(application, uri).to_buffers(head_only=True))
+
+    # When I send a HEAD request for it
+    res = get(application, uri, method=b"HEAD")
+
+    # Then I expect the same head, Content-Length included, and no body
+    buffers = res.to_buffers(head_only=True)
+    assert res.status_code == 200
+    assert b"".join(buffers) == get_head
+    assert b"Content-Length: %d\r\n" % size in get_head
+    assert not any(isinstance(buffer, FileRegion) for buffer in buffers)
+
+
+@pytest.mark.parametrize(
+    "value, start, end",
+    [
+        (b"bytes=0-99", 0, 100),
+        (b"bytes=1000-", 1000, len(LARGE)),
+        (b"bytes=-10", -10, None),
+    ],
+)
+def test_static_file_application_serves_byte_ranges(application, value, start, end):
+    res = get(application, b"/large.bin", headers={b"Range": value})
+
+    expected = LARGE[start:end]
+    first = start % len(LARGE)
+    assert res.status_code == 206
+    assert res.body.tobytes() == expected
+    assert (
+        b"Content-Range: bytes %d-%d/%d\r\n"
+        % (first, first + len(expected) - 1, len(LARGE))
+        in res.to_bytes()
+    )
+
+
+def test_static_file_application_serves_byte_ranges_of_mapped_files(application):
+    res = get(application, b"/small.txt", headers={b"Range": b"bytes=7-"})
+
+    assert res.status_code == 206
+    assert bytes(res.body) == b"world!"
+
+
+def test_static_file_application_responds_416_to_unsatisfiable_range(application):
+    res = get(application, b"/small.txt", headers={b"Range": b"bytes=100-"})
+
+    assert res.status_code == 416
+    assert b"Content-Range: bytes */13\r\n" in res.to_bytes()
+
+
+def test_static_file_application_ignores_malformed_range(application):
+    res = get(application, b"/small.txt", headers={b"Range": b"lines=1-2"})
+
+    assert res.status_code == 200
+    assert bytes(res.body) == b"Hello, world!"
+
+
+def test_static_file_application_caches_open_files(application, root):
+    # Given a file that has been served once
+    first = get(application, b"/large.bin")
+
+    # When it is served again, then I expect the same open file to be used
+    assert get(application, b"/large.bin").body.file is first.body.file
+
+    # And when it has been replaced, I expect the new file to be opened
+    replacement = root / "large.bin.new"
+    replacement.write_bytes(b"new content")
+    os.replace(replacement, root / "large.bin")
+    assert bytes(get(application, b"/large.bin").body) == b"new content"
+    # While the response already made still reads from the file it was made from
+    assert first.body.read(4) == LARGE[:4]
+
+
+def test_static_file_application_evicts_least_recently_used_files(root):
+    application = StaticFileApplication(str(root), max_open_files=2)
+
+    for name in (b"/small.txt", b"/large.bin", b"/small.txt", b"/docs"):
+        get(application, name)
+
+    assert [os.path.basename(path) for path in application._files] == [
+        "small.txt",
+        "index.html",
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"mmap_threshold": -1}, "mmap_threshold must be at least 0"),
+        ({"max_open_files": 0}, "max_open_files must be at least 1"),
+    ],
+)
+def test_static_file_application_rejects_invalid_settings(root, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        StaticFileApplication(str(root), **kwargs)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (b"bytes=0-0", (0, 1)),
+        (b"bytes=5-500", (5, 10)),
+        (b"bytes=-100", (0, 10)),
+        (b"bytes=5-4", None),
+        (b"bytes=0-1,3-4", None),
+        (b"bytes=a-b", None),
+        (b"bytes=-", None),
+        (b"items=0-1", None),
+    ],
+)
+def test_parse_range(value, expected):
+    assert parse_range(value, 10) == expected
+
+
+@pytest.mark.parametrize("value", [b"bytes=10-", b"bytes=-0"])
+def test_parse_range_rejects_unsatisfiable_range(value):
+    with pytest.raises(ValueError, match="not satisfiable"):
+        parse_range(value, 10)
@@ -0,0 +1,158 @@
+import threading
+
+import pytest
+
+from edunet.core.concurrency.worker_pool import OverflowPolicy, WorkerPool
+from edunet.exceptions import WorkerPoolError, WorkerPoolFullError
+
+
+@pytest.fixture
+def worker_pool():
+    pool = WorkerPool(max_workers=2, queue_size=4)
+    pool.start()
+    yield pool
+    if pool.is_running:
+        pool.shutdown()
+
+
+def test_worker_pool_initialization_success():
+    pool = WorkerPool(max_workers=3, queue_size=10, overflow=OverflowPolicy.REJECT)
+
+    assert pool.max_workers == 3
+    assert pool.queue_size == 10
+    assert pool.overflow is OverflowPolicy.REJECT
+    assert pool.is_running is False
+
+
+@pytest.mark.parametrize(
+    "max_workers, queue_size, message",
+    [
+        (0, 0, "max_workers must be at least 1"),
+        (1, -1, "queue_size cannot be negative"),
+    ],
+)
+def test_worker_pool_initialization_failure(max_workers, queue_size, message):
+    with pytest.raises(ValueError, match=message):
+        WorkerPool(max_workers=max_workers, queue_size=queue_size)
+
+
+def test_worker_pool_accepts_overflow_policy_by_value():
+    pool = WorkerPool(max_workers=1, overflow="reject")  # type: ignore
+
+    assert pool.overflow is OverflowPolicy.REJECT
+
+
+def test_worker_pool_runs_submitted_work(worker_pool):
+    results = []
+    done = threading.Event()
+
+    def work(value):
+        results.append(value)
+        if len(results) == 3:
+            done.set()
+
+    for value in range(3):
+        worker_pool.submit(work, value)
+
+    assert done.wait(timeout=5)
+    assert sorted(results) == [0, 1, 2]
+
+
+def test_worker_pool_uses_a_fixed_number_of_threads(worker_pool):
+    thread_names = set()
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            thread_names.add(threading.current_thread().name)
+
+    for _ in range(20):
+        worker_pool.submit(work)
+    worker_pool.shutdown()
+
+    assert 1 <= len(thread_names) <= 2
+    assert all(name.startswith("edunet-worker-") for name in thread_names)
+
+
+def test_worker_pool_keeps_running_when_work_fails(caplog):
+    # A single worker makes sure the failing work is logged before the next one runs
+    pool = WorkerPool(max_workers=1)
+    pool.start()
+    done = threading.Event()
+
+    def bad_work():
+        raise Exception("Bad stuff")
+
+    try:
+        pool.submit(bad_work)
+        pool.submit(done.set)
+
+        assert done.wait(timeout=5)
+        assert "Unhandled error in worker: Bad stuff" in caplog.text
+    finally:
+        pool.shutdown()
+
+
+def test_worker_pool_rejects_when_full():
+    pool = WorkerPool(max_workers=1, queue_size=1, overflow=OverflowPolicy.REJECT)
+    pool.start()
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_work():
+        started.set()
+        release.wait(timeout=5)
+
+    try:
+        pool.submit(blocking_work)
+        assert started.wait(timeout=5)
+        pool.submit(blocking_work)
+
+        with pytest.raises(WorkerPoolFullError, match="queue is full"):
+            pool.submit(blocking_work)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_worker_pool_blocks_until_timeout_when_full():
+    pool = WorkerPool(max_workers=1, queue_size=1, overflow=OverflowPolicy.BLOCK)
+    pool.start()
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking_work():
+        started.set()
+        release.wait(timeout=5)
+
+    try:
+        pool.submit(blocking_work)
+        assert started.wait(timeout=5)
+        pool.submit(blocking_work)
+
+        with pytest.raises(WorkerPoolFullError):
+            pool.submit(blocking_work, timeout=0.05)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_worker_pool_submit_raises_if_not_started():
+    pool = WorkerPool(max_workers=1)
+
+    with pytest.raises(WorkerPoolError, match="Worker pool is not running"):
+        pool.submit(print)
+
+
+def test_worker_pool_start_twice_does_nothing(worker_pool, caplog):
+    worker_pool.start()
+
+    assert "Worker pool already running. Nothing to do" in caplog.text
+
+
+def test_worker_pool_shutdown_twice_does_nothing(worker_pool, caplog):
+    worker_pool.shutdown()
+    worker_pool.shutdown()
+
+    assert worker_pool.is_running is False
+    assert "Worker pool is already stopped. Nothing to do." in caplog.text
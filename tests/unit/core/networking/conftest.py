@@ -4,12 +4,16 @@ from unittest.mock import Mock, patch, PropertyMock
 import pytest
 
 from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.request_framer import SingleReadFramer
 from edunet.core.networking.listeners.tcp_listener import TCPListener
 
 
 @pytest.fixture
 def mock_connection_handler():
-    return Mock(spec=ConnectionHandler)
+    handler = Mock(spec=ConnectionHandler)
+    handler.create_request_framer.side_effect = SingleReadFramer
+    handler.keep_alive.return_value = False
+    return handler
 
 
 @pytest.fixture
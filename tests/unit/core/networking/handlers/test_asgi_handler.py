@@ -0,0 +1,241 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.networking.handlers.asgi_handler import ASGIHandler
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.models.http import HTTPRequest
+
+GET_REQUEST = b"GET /hello%20world?name=edunet HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+
+async def hello_application(scope, receive, send):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [[b"content-type", b"text/plain"]],
+        }
+    )
+    await send({"type": "http.response.body", "body": b"Hello, world!"})
+
+
+def run(application, request=GET_REQUEST, **kwargs):
+    async def respond():
+        handler = ASGIHandler(application, **kwargs)
+        res = await handler.handle_connection(request, None)
+        return b"".join([buffer async for buffer in res])
+
+    return asyncio.run(respond())
+
+
+def test_asgi_handler_builds_scope():
+    # Given a request on a connection
+    handler = ASGIHandler(hello_application, root_path="/app")
+    writer = Mock()
+    writer.get_extra_info.side_effect = {
+        "peername": ("10.0.0.1", 51234),
+        "sockname": ("127.0.0.1", 8080),
+    }.get
+    request = HTTPRequest.from_bytes(
+        b"POST /a%20b?x=1 HTTP/1.1\r\nHost: localhost\r\nX-A: 1\r\nX-A: 2\r\n\r\n"
+    )
+
+    # When I build its scope
+    scope = handler.make_scope(request, writer)
+
+    # Then I expect it to follow the ASGI HTTP connection scope
+    assert scope == {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/a b",
+        "raw_path": b"/a%20b",
+        "query_string": b"x=1",
+        "root_path": "/app",
+        "headers": [[b"host", b"localhost"], [b"x-a", b"1"], [b"x-a", b"2"]],
+        "client": ("10.0.0.1", 51234),
+        "server": ("127.0.0.1", 8080),
+    }
+
+
+def test_asgi_handler_sends_single_body_with_content_length():
+    assert run(hello_application) == (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Length: 13\r\n"
+        b"content-type: text/plain\r\n"
+        b"\r\n"
+        b"Hello, world!"
+    )
+
+
+async def streaming_application(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for part in (b"Hello, ", b"", b"world!"):
+        await send({"type": "http.response.body", "body": part, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def test_asgi_handler_streams_body_chunked():
+    assert run(streaming_application) == (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"\r\n"
+        b"7\r\nHello, \r\n"
+        b"6\r\nworld!\r\n"
+        b"0\r\n\r\n"
+    )
+
+
+def test_asgi_handler_buffers_streamed_body_for_http_1_0():
+    res = run(streaming_application, request=b"GET / HTTP/1.0\r\n\r\n")
+
+    assert res == (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Length: 13\r\n"
+        b"Connection: close\r\n"
+        b"\r\n"
+        b"Hello, world!"
+    )
+
+
+def test_asgi_handler_streams_body_with_content_length_as_is():
+    async def application(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [[b"content-length", b"13"]],
+            }
+        )
+        await send(
+            {"type": "http.response.body", "body": b"Hello, ", "more_body": True}
+        )
+        await send({"type": "http.response.body", "body": b"world!"})
+
+    assert run(application) == (
+        b"HTTP/1.1 200 OK\r\ncontent-length: 13\r\n\r\nHello, world!"
+    )
+
+
+def test_asgi_handler_waits_for_listener_before_taking_more_body():
+    sent = []
+
+    async def application(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for index in range(10):
+            await send({"type": "http.response.body", "body": b"x", "more_body": True})
+            sent.append(index)
+        await send({"type": "http.response.body", "body": b""})
+
+    async def respond():
+        res = await ASGIHandler(application).handle_connection(GET_REQUEST, None)
+        # Given a listener that has only taken the head so far
+        await res.__anext__()
+        await asyncio.sleep(0.01)
+        # Then I expect the application to be held back
+        assert len(sent) < 3
+        return [buffer async for buffer in res]
+
+    assert asyncio.run(respond())[-1] == b"0\r\n\r\n"
+    assert sent == list(range(10))
+
+
+def test_asgi_handler_streams_request_body_in_chunks():
+    messages = []
+
+    async def application(scope, receive, send):
+        while True:
+            message = await receive()
+            messages.append(message)
+            if not message["more_body"]:
+                break
+        await hello_application(scope, receive, send)
+        messages.append(await receive())
+
+    run(
+        application,
+        request=b"POST / HTTP/1.1\r\nContent-Length: 10\r\n\r\n0123456789",
+        body_chunk_size=4,
+    )
+
+    assert messages == [
+        {"type": "http.request", "body": b"0123", "more_body": True},
+        {"type": "http.request", "body": b"4567", "more_body": True},
+        {"type": "http.request", "body": b"89", "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+
+
+def test_asgi_handler_reads_spooled_request_body_off_the_loop():
+    # Given a request whose body was spooled to a temporary file
+    request = HTTPRequestParser(spool_threshold=4).feed(
+        b"POST / HTTP/1.1\r\nContent-Length: 10\r\n\r\n0123456789"
+    )[0]
+    loop_thread = []
+    read_threads = []
+    body_file = request.body_file
+    read = body_file.read
+
+    def tracking_read(size):
+        read_threads.append(threading.get_ident())
+        return read(size)
+
+    body_file.read = tracking_read
+    body = []
+
+    async def application(scope, receive, send):
+        loop_thread.append(threading.get_ident())
+        message = {"more_body": True}
+        while message["more_body"]:
+            message = await receive()
+            body.append(message["body"])
+        await hello_application(scope, receive, send)
+
+    # When the application receives it
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        run(application, request=request, body_chunk_size=4, executor=executor)
+
+    # Then I expect the whole body, read from the file on the executor
+    assert b"".join(body) == b"0123456789"
+    assert read_threads and loop_thread[0] not in read_threads
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        [],
+        [{"type": "http.response.body", "body": b"no start"}],
+        [{"type": "http.response.start", "status": 200}],
+        [{"type": "websocket.accept"}],
+    ],
+)
+def test_asgi_handler_responds_500_when_application_fails(messages, caplog):
+    async def application(scope, receive, send):
+        for message in messages:
+            await send(message)
+
+    res = run(application)
+
+    assert res == b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 0\r\n\r\n"
+    assert "Error running ASGI application" in caplog.text
+
+
+def test_asgi_handler_cuts_started_response_short_when_application_fails():
+    async def application(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"Hello", "more_body": True})
+        raise ValueError("Bad Stuff")
+
+    with pytest.raises(ValueError, match="Bad Stuff"):
+        run(application)
+
+
+def test_asgi_handler_rejects_invalid_body_chunk_size():
+    with pytest.raises(ValueError, match="body_chunk_size must be at least 1"):
+        ASGIHandler(hello_application, body_chunk_size=0)
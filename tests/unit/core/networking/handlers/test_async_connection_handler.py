@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.networking.handlers.async_connection_handler import (
+    AsyncConnectionHandler,
+    ExecutorConnectionHandler,
+)
+from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.request_framer import SingleReadFramer
+
+
+def test_async_connection_handler_raises_when_methods_not_implemented():
+    class MyTestConnectionHandler(AsyncConnectionHandler):
+        pass
+
+    with pytest.raises(TypeError) as exc:
+        MyTestConnectionHandler()  # type: ignore
+
+    assert "handle_connection" in str(exc.value)
+
+
+def test_async_connection_handler_default_framer():
+    class MyTestConnectionHandler(AsyncConnectionHandler):
+        async def handle_connection(self, request_data, writer, keep_alive=None):
+            return request_data
+
+    assert isinstance(
+        MyTestConnectionHandler().create_request_framer(), SingleReadFramer
+    )
+    assert MyTestConnectionHandler().keep_alive(b"some data") is False
+
+
+@pytest.mark.asyncio
+async def test_executor_connection_handler_runs_sync_handler_off_the_loop():
+    loop_thread = threading.current_thread()
+    handler_threads = []
+
+    class MySyncHandler(ConnectionHandler):
+        def handle_connection(self, data, client_socket, keep_alive=None):
+            handler_threads.append(threading.current_thread())
+            return data.upper() if keep_alive else data
+
+    writer = Mock()
+    writer.get_extra_info.return_value = "some socket"
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        handler = ExecutorConnectionHandler(MySyncHandler(), executor)
+        res = await handler.handle_connection(b"some data", writer, keep_alive=True)
+
+    assert res == b"SOME DATA"
+    assert handler_threads and handler_threads[0] is not loop_thread
+    writer.get_extra_info.assert_called_once_with("socket")
+
+
+def test_executor_connection_handler_uses_wrapped_handler_framer():
+    sync_handler = Mock(spec=ConnectionHandler)
+
+    handler = ExecutorConnectionHandler(sync_handler)
+
+    assert handler.create_request_framer() is (
+        sync_handler.create_request_framer.return_value
+    )
+
+
+def test_executor_connection_handler_uses_wrapped_handler_keep_alive():
+    sync_handler = Mock(spec=ConnectionHandler)
+    sync_handler.keep_alive.return_value = True
+
+    handler = ExecutorConnectionHandler(sync_handler)
+
+    assert handler.keep_alive(b"some data") is True
+    sync_handler.keep_alive.assert_called_once_with(b"some data")
+
+
+@pytest.mark.asyncio
+async def test_executor_connection_handler_pulls_streamed_response_off_the_loop():
+    loop_thread = threading.current_thread()
+    chunk_threads = []
+
+    def chunks():
+        for chunk in (b"a", b"b"):
+            chunk_threads.append(threading.current_thread())
+            yield chunk
+
+    class MySyncHandler(ConnectionHandler):
+        def handle_connection(self, data, client_socket, keep_alive=None):
+            return chunks()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        handler = ExecutorConnectionHandler(MySyncHandler(), executor)
+        res = await handler.handle_connection(b"some data", Mock())
+        buffers = [buffer async for buffer in res]
+
+    assert buffers == [b"a", b"b"]
+    assert len(chunk_threads) == 2
+    assert loop_thread not in chunk_threads
@@ -0,0 +1,117 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.applications.async_application import AsyncApplication
+from edunet.core.applications.simple_http_application import SimpleHTTPApplication
+from edunet.core.networking.handlers.async_http_connection_handler import (
+    AsyncHTTPConnectionHandler,
+)
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.exceptions import HTTPDataModelError
+from edunet.models.http import HTTPResponse
+
+HTTP_REQUEST = b"GET /hello HTTP/1.1\r\nHost: localhost:8080\r\n\r\n"
+
+
+class MyAsyncApplication(AsyncApplication):
+    async def handle_request(self, request_data):
+        return HTTPResponse(
+            status_code=200, status_text="OK", body=request_data.uri.decode()
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_http_connection_handler_awaits_async_application():
+    handler = AsyncHTTPConnectionHandler(MyAsyncApplication())
+
+    res = b"".join(await handler.handle_connection(HTTP_REQUEST, Mock()))
+
+    assert res == b"HTTP/1.1 200 OK\r\nContent-Length: 6\r\n\r\n/hello"
+
+
+@pytest.mark.asyncio
+async def test_async_http_connection_handler_bridges_sync_application():
+    loop_thread = threading.current_thread()
+    application = SimpleHTTPApplication()
+    calls = []
+    original = application.handle_request
+
+    def handle_request(request):
+        calls.append(threading.current_thread())
+        return original(request)
+
+    application.handle_request = handle_request  # type: ignore
+    handler = AsyncHTTPConnectionHandler(application)
+
+    res = b"".join(await handler.handle_connection(HTTP_REQUEST, Mock()))
+
+    assert res.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert calls and calls[0] is not loop_thread
+
+
+@pytest.mark.asyncio
+async def test_async_http_connection_handler_raises_on_invalid_request():
+    handler = AsyncHTTPConnectionHandler(MyAsyncApplication())
+
+    with pytest.raises(HTTPDataModelError):
+        await handler.handle_connection(b"INVALID_REQUEST", Mock())
+
+
+def test_async_http_connection_handler_creates_http_framer():
+    handler = AsyncHTTPConnectionHandler(MyAsyncApplication())
+
+    assert isinstance(handler.create_request_framer(), HTTPRequestParser)
+
+
+@pytest.mark.asyncio
+async def test_async_http_connection_handler_announces_connection_close():
+    handler = AsyncHTTPConnectionHandler(MyAsyncApplication())
+    request = b"GET /hello HTTP/1.1\r\nConnection: close\r\n\r\n"
+
+    res = b"".join(await handler.handle_connection(request, Mock()))
+
+    assert b"Connection: close\r\n" in res
+    assert handler.keep_alive(request) is False
+    assert handler.keep_alive(HTTP_REQUEST) is True
+
+
+@pytest.mark.asyncio
+async def test_async_http_connection_handler_streams_sync_body_off_the_loop():
+    loop_thread = threading.current_thread()
+    chunk_threads = []
+
+    def chunks():
+        for chunk in ("a", "b"):
+            chunk_threads.append(threading.current_thread())
+            yield chunk
+
+    application = Mock(spec=SimpleHTTPApplication)
+    application.handle_request.return_value = HTTPResponse(
+        status_code=200, status_text="OK", body=chunks()
+    )
+    handler = AsyncHTTPConnectionHandler(application)
+
+    res = await handler.handle_connection(HTTP_REQUEST, Mock())
+    body = b"".join([buffer async for buffer in res])
+
+    assert body.endswith(b"1\r\na\r\n1\r\nb\r\n0\r\n\r\n")
+    assert len(chunk_threads) == 2
+    assert loop_thread not in chunk_threads
+
+
+@pytest.mark.asyncio
+async def test_async_http_connection_handler_buffers_streamed_body_for_http_1_0():
+    class MyStreamingApplication(AsyncApplication):
+        async def handle_request(self, request_data):
+            return HTTPResponse(
+                status_code=200, status_text="OK", body=iter(["he", b"llo"])
+            )
+
+    handler = AsyncHTTPConnectionHandler(MyStreamingApplication())
+
+    res = b"".join(await handler.handle_connection(b"GET / HTTP/1.0\r\n\r\n", Mock()))
+
+    assert res.startswith(b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n")
+    assert res.endswith(b"\r\n\r\nhello")
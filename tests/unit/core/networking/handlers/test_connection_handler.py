@@ -1,6 +1,7 @@
 import pytest
 
 from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.request_framer import SingleReadFramer
 
 
 def test_instantiating_an_implemented_connection_handler_is_successful():
@@ -33,3 +34,36 @@ def test_connection_handler_raises_when_methods_not_implemented():
         MyTestConnectionHandler().handle_connection()
 
     assert "handle_connection" in str(exc.value)
+
+
+def test_connection_handler_default_framer_treats_each_read_as_a_request():
+    class MyTestHandler(ConnectionHandler):
+        def handle_connection(self, *args, **kwargs):
+            return True
+
+    framer = MyTestHandler().create_request_framer()
+
+    assert isinstance(framer, SingleReadFramer)
+    assert framer.feed(b"some data") == [b"some data"]
+    assert framer.feed(b"") == []
+
+
+def test_single_read_framer_copies_data_out_of_the_read_buffer():
+    # Given a read buffer that is reused once the framer has returned
+    buffer = bytearray(b"some data")
+    framer = SingleReadFramer()
+
+    requests = framer.feed(memoryview(buffer))
+    buffer[:] = b"overwrite"
+
+    # Then I expect the request to keep the data that was read
+    assert requests == [b"some data"]
+    assert isinstance(requests[0], bytes)
+
+
+def test_connection_handler_closes_connections_by_default():
+    class MyTestHandler(ConnectionHandler):
+        def handle_connection(self, *args, **kwargs):
+            return True
+
+    assert MyTestHandler().keep_alive(b"some data") is False
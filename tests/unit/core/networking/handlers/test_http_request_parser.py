@@ -0,0 +1,294 @@
+import pytest
+
+from edunet.core.networking.handlers.http_request_parser import (
+    MAX_CHUNK_LINE_SIZE,
+    HTTPRequestParser,
+    ParserState,
+)
+from edunet.exceptions import HTTPValidationError
+from edunet.models.http import HTTPRequest
+
+GET_REQUEST = (
+    b"GET /index.html HTTP/1.1\r\nHost: www.example.com\r\nAccept: text/html\r\n\r\n"
+)
+
+
+def test_parser_emits_request_once_headers_are_complete():
+    parser = HTTPRequestParser()
+
+    assert parser.feed(b"GET /index.html HTTP/1.1\r\nHost: www.exa") == []
+    assert parser.state is ParserState.HEADERS
+    assert parser.feed(b"mple.com\r\nAccept: text/html\r\n") == []
+
+    assert parser.feed(b"\r\n") == [
+        HTTPRequest(
+            method=b"GET",
+            uri=b"/index.html",
+            version=b"HTTP/1.1",
+            headers={b"Host": b"www.example.com", b"Accept": b"text/html"},
+            body=b"",
+        )
+    ]
+    assert parser.state is ParserState.REQUEST_LINE
+
+
+def test_parser_handles_a_request_fed_one_byte_at_a_time():
+    parser = HTTPRequestParser()
+    request = b"POST /a HTTP/1.1\r\nContent-Length: 11\r\n\r\nHello World"
+
+    requests = []
+    for index in range(len(request)):
+        requests += parser.feed(request[index : index + 1])
+
+    assert len(requests) == 1
+    assert requests[0].body == b"Hello World"
+    assert requests[0].headers == {b"Content-Length": b"11"}
+
+
+def test_parser_matches_from_bytes():
+    assert HTTPRequestParser().feed(GET_REQUEST) == [
+        HTTPRequest.from_bytes(GET_REQUEST)
+    ]
+
+
+def test_parser_splits_pipelined_requests():
+    parser = HTTPRequestParser()
+    first = b"POST /a HTTP/1.1\r\nContent-Length: 2\r\n\r\nhi"
+    second = b"GET /b HTTP/1.1\r\n\r\n"
+
+    requests = parser.feed(first + second + b"GET /c")
+    assert [request.uri for request in requests] == [b"/a", b"/b"]
+    assert requests[0].body == b"hi"
+
+    assert [request.uri for request in parser.feed(b" HTTP/1.1\r\n\r\n")] == [b"/c"]
+
+
+def test_parser_decodes_chunked_body():
+    parser = HTTPRequestParser()
+    head = b"POST /upload HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+
+    assert parser.feed(head + b"5\r\nHello\r\n6;ext=1\r\n Wor") == []
+    assert parser.state is ParserState.CHUNK_DATA
+    assert parser.feed(b"ld\r\n0\r\nX-Trailer: yes\r\n") == []
+
+    requests = parser.feed(b"\r\nGET /next HTTP/1.1\r\n\r\n")
+
+    assert [request.uri for request in requests] == [b"/upload", b"/next"]
+    assert requests[0].body == b"Hello World"
+
+
+def test_parser_skips_empty_lines_before_request_line():
+    assert len(HTTPRequestParser().feed(b"\r\n" + GET_REQUEST)) == 1
+
+
+@pytest.mark.parametrize(
+    "request_data, message",
+    [
+        (b"INVALID_REQUEST\r\n", "Invalid request line pattern"),
+        (b"GET / HTTP/1.1\r\nInvalid Header\r\n", "Invalid header pattern"),
+        (b"GET / HTTP/1.1\r\nContent-Length: nope\r\n", "Invalid Content-Length"),
+        (b"GET / HTTP/1.1\r\nContent-Length: -1\r\n", "Invalid Content-Length"),
+        (b"GET / HTTP/1.1\r\nContent-Length: +3\r\n", "Invalid Content-Length"),
+        (b"GET / HTTP/1.1\r\nContent-Length: 1_0\r\n", "Invalid Content-Length"),
+        (b"GET / HTTP/1.1\r\nContent-Length: \x0b3\r\n", "Invalid Content-Length"),
+        (b"GET / HTTP/1.1\r\nContent-Length: 3 3\r\n", "Invalid Content-Length"),
+        (
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+            "Invalid chunk size",
+        ),
+        (
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n1\r\nab\r\n",
+            "Invalid chunk terminator",
+        ),
+        (
+            b"POST / HTTP/1.1\r\nContent-Length: 5\r\nContent-Length: 6\r\n",
+            "Conflicting Content-Length",
+        ),
+        (b"POST / HTTP/1.1\r\nContent-Length: 5, 6\r\n", "Conflicting Content-Length"),
+        (
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: gzip\r\n\r\n",
+            "Invalid Transfer-Encoding",
+        ),
+        (
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked, gzip\r\n\r\n",
+            "Invalid Transfer-Encoding",
+        ),
+        (
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n",
+            "Invalid Transfer-Encoding",
+        ),
+        (
+            b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n"
+            b"Content-Length: 5\r\n\r\n",
+            "both Transfer-Encoding and Content-Length",
+        ),
+    ],
+)
+def test_parser_raises_on_malformed_requests(request_data, message):
+    with pytest.raises(HTTPValidationError, match=message):
+        HTTPRequestParser().feed(request_data)
+
+
+@pytest.mark.parametrize("size", [b"0x3", b"+1_0", b" 3", b"-1", b""])
+def test_parser_raises_on_chunk_size_that_is_not_hexadecimal_digits(size):
+    parser = HTTPRequestParser()
+    parser.feed(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+
+    with pytest.raises(HTTPValidationError, match="Invalid chunk size"):
+        parser.feed(size + b"\r\nabc\r\n0\r\n\r\n")
+
+
+def test_parser_accepts_chunk_size_with_extension():
+    request = HTTPRequestParser().feed(
+        b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"3 ;name=value\r\nabc\r\n0\r\n\r\n"
+    )[0]
+
+    assert request.body == b"abc"
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        (b"1" * (MAX_CHUNK_LINE_SIZE + 1), "Chunk line too long"),
+        (b"3\r\nabc" + b" " * (MAX_CHUNK_LINE_SIZE + 1), "Chunk line too long"),
+        (b"0\r\nX-Trailer: " + b"x" * 1024, "Request header block too large"),
+    ],
+)
+def test_parser_limits_chunk_and_trailer_lines_without_crlf(body, message):
+    # Given a chunked request whose headers leave little room for trailers
+    parser = HTTPRequestParser(max_header_size=1024, max_body_size=1024)
+    parser.feed(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+
+    # When a line of the body never ends
+    # Then I expect it to be refused instead of buffered
+    with pytest.raises(HTTPValidationError, match=message):
+        parser.feed(body)
+
+
+def test_parser_limits_header_block_size():
+    parser = HTTPRequestParser(max_header_size=64)
+    parser.feed(b"GET / HTTP/1.1\r\n")
+
+    with pytest.raises(HTTPValidationError, match="Request header block too large"):
+        parser.feed(b"X-Padding: " + b"x" * 64)
+
+
+@pytest.mark.parametrize(
+    "request_data",
+    [
+        b"POST / HTTP/1.1\r\nContent-Length: 11\r\n\r\n",
+        b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\nb\r\n",
+    ],
+)
+def test_parser_limits_body_size(request_data):
+    with pytest.raises(HTTPValidationError, match="Request body too large"):
+        HTTPRequestParser(max_body_size=10).feed(request_data)
+
+
+def test_parser_does_not_keep_consumed_bytes():
+    parser = HTTPRequestParser()
+
+    parser.feed(GET_REQUEST * 100 + b"GET /partial")
+
+    assert parser._buffer == b"GET /partial"
+
+
+def test_parser_keeps_header_block_raw():
+    parser = HTTPRequestParser()
+
+    # Given a header block that arrives split over several reads
+    parser.feed(b"GET / HTTP/1.1\r\nHost: a\r\nAc")
+    parser.feed(b"cept: text/html\r\nContent-Length: 0\r\n")
+    (request,) = parser.feed(b"\r\n")
+
+    # Then I expect the request to carry it unparsed until it is looked at
+    assert request.headers._raw == (
+        b"\r\nHost: a\r\nAccept: text/html\r\nContent-Length: 0"
+    )
+    assert request.headers[b"accept"] == b"text/html"
+    assert request.headers._index is None
+
+
+def test_parser_copies_requests_out_of_a_reused_read_buffer():
+    # Given a read buffer that is overwritten after each feed
+    parser = HTTPRequestParser()
+    buffer = bytearray(b"POST /a HTTP/1.1\r\nContent-Length: 2\r\n\r\nhiGET /b")
+
+    requests = parser.feed(memoryview(buffer))
+    buffer[:] = b"x" * len(buffer)
+    requests += parser.feed(memoryview(bytearray(b" HTTP/1.1\r\n\r\n")))
+
+    # Then I expect the requests to keep the data that was read
+    assert [request.uri for request in requests] == [b"/a", b"/b"]
+    assert requests[0].headers == {b"Content-Length": b"2"}
+    assert requests[0].body == b"hi"
+
+
+def test_parser_keeps_bodies_under_spool_threshold_in_memory():
+    request = HTTPRequestParser(spool_threshold=11).feed(
+        b"POST / HTTP/1.1\r\nContent-Length: 11\r\n\r\nHello World"
+    )[0]
+
+    assert request.body == b"Hello World"
+    assert request.body_file is None
+    assert request.open_body().read() == b"Hello World"
+
+
+def test_parser_spools_large_bodies_to_a_temporary_file():
+    # Given a parser that spools bodies past 1KiB and an upload fed in pieces
+    parser = HTTPRequestParser(spool_threshold=1024)
+    body = bytes(range(256)) * 64
+    parser.feed(b"POST /upload HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body))
+
+    requests = []
+    for index in range(0, len(body), 1000):
+        requests += parser.feed(body[index : index + 1000])
+        # Then I expect no more than the threshold to be held in memory
+        assert sum(len(part) for part in parser._body_parts) <= 1024
+
+    # Then I expect the application to read the body from the spooled file
+    (request,) = requests
+    assert request.body == b""
+    assert request.body_file is not None
+    assert request.open_body().read() == body
+
+
+def test_parser_spools_large_chunked_bodies():
+    parser = HTTPRequestParser(spool_threshold=4)
+    head = b"POST /upload HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+
+    (request,) = parser.feed(head + b"3\r\nabc\r\n3\r\ndef\r\n0\r\n\r\n")
+
+    assert request.body == b""
+    assert request.open_body().read() == b"abcdef"
+
+
+def test_parser_rejects_negative_spool_threshold():
+    with pytest.raises(ValueError, match="spool_threshold cannot be negative"):
+        HTTPRequestParser(spool_threshold=-1)
+
+
+@pytest.mark.parametrize(
+    "head",
+    [
+        b"POST / HTTP/1.1\r\nContent-Length: 2\r\nContent-Length: 2\r\n\r\n",
+        b"POST / HTTP/1.1\r\nContent-Length: 2, 2\r\n\r\n",
+    ],
+)
+def test_parser_accepts_repeated_content_length_that_agrees(head):
+    requests = HTTPRequestParser().feed(head + b"hi")
+
+    assert [request.body for request in requests] == [b"hi"]
+
+
+def test_parser_decodes_chunked_body_under_other_codings():
+    parser = HTTPRequestParser()
+
+    requests = parser.feed(
+        b"POST / HTTP/1.1\r\nTransfer-Encoding: gzip, chunked\r\n\r\n"
+        b"2\r\nhi\r\n0\r\n\r\n"
+    )
+
+    assert [request.body for request in requests] == [b"hi"]
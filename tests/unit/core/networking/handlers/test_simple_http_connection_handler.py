@@ -2,6 +2,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
 from edunet.core.networking.handlers.simple_http_connection_handler import (
     SimpleHTTPConnectionHandler,
 )
@@ -15,6 +16,23 @@ def test_http_connection_handler_initialization_success(mock_application):
     assert tcp_listener.application is mock_application
 
 
+def test_http_connection_handler_creates_a_new_http_framer_per_connection(
+    simple_http_connection_handler,
+):
+    first = simple_http_connection_handler.create_request_framer()
+    second = simple_http_connection_handler.create_request_framer()
+
+    assert isinstance(first, HTTPRequestParser)
+    assert first is not second
+    assert first.spool_threshold is None
+
+
+def test_http_connection_handler_passes_spool_threshold_to_framer(mock_application):
+    handler = SimpleHTTPConnectionHandler(mock_application, spool_threshold=1024)
+
+    assert handler.create_request_framer().spool_threshold == 1024
+
+
 @patch(
     "edunet.core.networking.handlers.simple_http_connection_handler.HTTPRequest",
     spec=HTTPRequest,
@@ -44,7 +62,7 @@ def test_handle_connection_dispatches_request_and_sends_back_successfully(
     )
     mock_http_request.from_bytes.return_value = mock_request_obj
     mock_http_response = Mock(spec=HTTPResponse)
-    mock_http_response.to_bytes.return_value = http_response_bytes
+    mock_http_response.to_buffers.return_value = [http_response_bytes]
     simple_http_connection_handler.application.handle_request.return_value = (
         mock_http_response
     )
@@ -52,15 +70,15 @@ def test_handle_connection_dispatches_request_and_sends_back_successfully(
     # When I call handle_request
     res = simple_http_connection_handler.handle_connection(http_request, mock_socket)
 
-    # Then I expect my response to be a bytes HTTP response
-    assert res == http_response_bytes
+    # Then I expect my response to be the HTTP response buffers
+    assert res == [http_response_bytes]
 
     # Then I expect my methods to be called as such
     simple_http_connection_handler.application.handle_request.assert_called_once_with(
         mock_request_obj
     )
     mock_http_request.from_bytes.assert_called_once_with(http_request)
-    mock_http_response.to_bytes.assert_called_once_with()
+    mock_http_response.to_buffers.assert_called_once_with(head_only=False)
 
 
 @patch(
@@ -100,7 +118,7 @@ def test_when_handle_request_fails_then_raise_the_same_exception(
         mock_request_obj
     )
     mock_http_request.from_bytes.assert_called_once_with(http_request)
-    mock_http_response.to_bytes.assert_not_called()
+    mock_http_response.to_buffers.assert_not_called()
 
 
 @patch(
@@ -127,14 +145,14 @@ def test_when_http_request_from_bytes_fails_then_raise_the_same_exception(
     # Then I expect my methods to behave as such
     simple_http_connection_handler.application.handle_request.assert_not_called()
     mock_http_request.from_bytes.assert_called_once_with(http_request)
-    mock_http_response.to_bytes.assert_not_called()
+    mock_http_response.to_buffers.assert_not_called()
 
 
 @patch(
     "edunet.core.networking.handlers.simple_http_connection_handler.HTTPRequest",
     spec=HTTPRequest,
 )
-def test_when_http_response_to_bytes_fails_then_raise_the_same_exception(
+def test_when_http_response_to_buffers_fails_then_raise_the_same_exception(
     mock_http_request, simple_http_connection_handler, mock_socket
 ):
     # Given valid request data
@@ -153,7 +171,7 @@ def test_when_http_response_to_bytes_fails_then_raise_the_same_exception(
     )
     mock_http_request.from_bytes.return_value = mock_request_obj
     mock_http_response = Mock(spec=HTTPResponse)
-    mock_http_response.to_bytes.side_effect = Exception("Bad stuff")
+    mock_http_response.to_buffers.side_effect = Exception("Bad stuff")
     simple_http_connection_handler.application.handle_request.return_value = (
         mock_http_response
     )
@@ -168,4 +186,135 @@ def test_when_http_response_to_bytes_fails_then_raise_the_same_exception(
         mock_request_obj
     )
     mock_http_request.from_bytes.assert_called_once_with(http_request)
-    mock_http_response.to_bytes.assert_called_once_with()
+    mock_http_response.to_buffers.assert_called_once_with(head_only=False)
+
+
+@pytest.mark.parametrize(
+    "request_data, connection",
+    [
+        (b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n", None),
+        (b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n", "close"),
+        (b"GET / HTTP/1.0\r\n\r\n", "close"),
+        (b"GET / HTTP/1.0\r\nConnection: keep-alive\r\n\r\n", "keep-alive"),
+    ],
+)
+def test_handle_connection_announces_connection_persistence(
+    simple_http_connection_handler, mock_socket, request_data, connection
+):
+    # Given an application answering with a plain response
+    simple_http_connection_handler.application.handle_request.return_value = (
+        HTTPResponse(status_code=200, status_text="OK", body="hi")
+    )
+
+    # When the connection is handled
+    res = b"".join(
+        simple_http_connection_handler.handle_connection(request_data, mock_socket)
+    )
+
+    # Then I expect a Connection header only when it differs from the default
+    if connection is None:
+        assert b"Connection:" not in res
+    else:
+        assert f"Connection: {connection}\r\n".encode() in res
+
+
+@pytest.mark.parametrize(
+    "request_data, expected",
+    [
+        (b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n", True),
+        (b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n", False),
+        (b"GET / HTTP/1.0\r\n\r\n", False),
+    ],
+)
+def test_http_connection_handler_keep_alive(
+    simple_http_connection_handler, request_data, expected
+):
+    assert simple_http_connection_handler.keep_alive(request_data) is expected
+
+
+def test_handle_connection_accepts_requests_parsed_by_the_framer(
+    simple_http_connection_handler, mock_socket
+):
+    # Given a request already parsed by the connection's framer
+    request = simple_http_connection_handler.create_request_framer().feed(
+        b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n"
+    )[0]
+    simple_http_connection_handler.application.handle_request.return_value = (
+        HTTPResponse(status_code=200, status_text="OK", body="hi")
+    )
+
+    # When the connection is handled
+    res = b"".join(
+        simple_http_connection_handler.handle_connection(request, mock_socket)
+    )
+
+    # Then I expect the application to receive the very same request
+    simple_http_connection_handler.application.handle_request.assert_called_once_with(
+        request
+    )
+    assert res.endswith(b"Connection: close\r\n\r\nhi")
+    assert simple_http_connection_handler.keep_alive(request) is False
+
+
+def test_handle_connection_announces_close_decided_by_the_listener(
+    simple_http_connection_handler, mock_socket
+):
+    # Given a request that would keep its connection alive
+    simple_http_connection_handler.application.handle_request.return_value = (
+        HTTPResponse(status_code=200, status_text="OK", body="hi")
+    )
+
+    # When the listener is about to close the connection anyway
+    res = b"".join(
+        simple_http_connection_handler.handle_connection(
+            b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n", mock_socket, keep_alive=False
+        )
+    )
+
+    # Then I expect the response to say so
+    assert res.endswith(b"Connection: close\r\n\r\nhi")
+
+
+def test_handle_connection_sends_only_the_head_to_head_requests(
+    simple_http_connection_handler, mock_socket
+):
+    # Given an application answering HEAD as it answers GET
+    simple_http_connection_handler.application.handle_request.return_value = (
+        HTTPResponse(status_code=200, status_text="OK", body="hello")
+    )
+
+    # When a HEAD request is handled
+    res = b"".join(
+        simple_http_connection_handler.handle_connection(
+            b"HEAD / HTTP/1.1\r\nHost: localhost\r\n\r\n", mock_socket
+        )
+    )
+
+    # Then I expect the head the body would have, without the body
+    assert res == b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\n"
+
+
+@pytest.mark.parametrize(
+    "version, expected_framing",
+    [
+        (b"HTTP/1.0", b"Content-Length: 5\r\n"),
+        (b"HTTP/1.1", b"Transfer-Encoding: chunked\r\n"),
+    ],
+)
+def test_handle_connection_buffers_streamed_body_only_for_http_1_0(
+    simple_http_connection_handler, mock_socket, version, expected_framing
+):
+    # Given an application streaming its response body
+    simple_http_connection_handler.application.handle_request.return_value = (
+        HTTPResponse(status_code=200, status_text="OK", body=iter(["he", b"llo"]))
+    )
+
+    # When a client speaking the given HTTP version asks for it
+    res = b"".join(
+        simple_http_connection_handler.handle_connection(
+            b"GET / " + version + b"\r\nHost: localhost\r\n\r\n", mock_socket
+        )
+    )
+
+    # Then I expect HTTP/1.0 clients to get it whole, with a Content-Length
+    assert expected_framing in res
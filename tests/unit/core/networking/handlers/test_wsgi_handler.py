@@ -0,0 +1,237 @@
+import sys
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.networking.handlers.wsgi_handler import WSGIHandler
+from edunet.exceptions import WorkerPoolFullError
+from edunet.models.http import HTTPRequest
+
+GET_REQUEST = (
+    b"GET /hello%20world?name=edunet HTTP/1.1\r\n"
+    b"Host: localhost:8080\r\n"
+    b"Accept: text/html\r\n"
+    b"Accept: application/json\r\n"
+    b"\r\n"
+)
+
+
+def hello_application(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"Hello, world!"]
+
+
+@pytest.fixture
+def client_socket():
+    return Mock(getpeername=Mock(return_value=("10.0.0.1", 51234)))
+
+
+def run(application, request=GET_REQUEST, client_socket=None, **kwargs):
+    handler = WSGIHandler(application, max_workers=None, **kwargs)
+    return b"".join(handler.handle_connection(request, client_socket))
+
+
+def test_wsgi_handler_builds_environ(client_socket):
+    # Given a POST request with a body
+    handler = WSGIHandler(hello_application, server_name="example.com", server_port=80)
+    request = HTTPRequest.from_bytes(
+        b"POST /a%2Fb/c?x=1&y=2 HTTP/1.1\r\n"
+        b"Host: example.com\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Content-Length: 2\r\n"
+        b"X-Forwarded-For: 1.2.3.4\r\n"
+        b"X-Forwarded-For: 5.6.7.8\r\n"
+        b"\r\n"
+        b"{}"
+    )
+
+    # When I build its environ
+    environ = handler.make_environ(request, client_socket)
+
+    # Then I expect it to follow PEP 3333
+    assert environ["REQUEST_METHOD"] == "POST"
+    assert environ["SCRIPT_NAME"] == ""
+    assert environ["PATH_INFO"] == "/a/b/c"
+    assert environ["QUERY_STRING"] == "x=1&y=2"
+    assert environ["SERVER_NAME"] == "example.com"
+    assert environ["SERVER_PORT"] == "80"
+    assert environ["SERVER_PROTOCOL"] == "HTTP/1.1"
+    assert environ["CONTENT_TYPE"] == "application/json"
+    assert environ["CONTENT_LENGTH"] == "2"
+    assert environ["HTTP_HOST"] == "example.com"
+    assert environ["HTTP_X_FORWARDED_FOR"] == "1.2.3.4,5.6.7.8"
+    assert "HTTP_CONTENT_TYPE" not in environ
+    assert environ["REMOTE_ADDR"] == "10.0.0.1"
+    assert environ["REMOTE_PORT"] == "51234"
+    assert environ["wsgi.version"] == (1, 0)
+    assert environ["wsgi.url_scheme"] == "http"
+    assert environ["wsgi.input"].read() == b"{}"
+    assert environ["wsgi.errors"] is sys.stderr
+    assert environ["wsgi.multithread"] is True
+
+
+def test_wsgi_handler_sends_complete_result_with_content_length(client_socket):
+    res = run(hello_application, client_socket=client_socket)
+
+    assert res == (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Length: 13\r\n"
+        b"Content-Type: text/plain\r\n"
+        b"\r\n"
+        b"Hello, world!"
+    )
+
+
+def test_wsgi_handler_streams_iterable_result_chunked():
+    closed = []
+
+    class Result:
+        def __iter__(self):
+            yield b""
+            yield b"Hello, "
+            yield b""
+            yield b"world!"
+
+        def close(self):
+            closed.append(True)
+
+    def application(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return Result()
+
+    # When the application returns a result it produces chunk by chunk
+    handler = WSGIHandler(application, max_workers=None)
+    res = handler.handle_connection(GET_REQUEST, None)
+
+    # Then I expect it to be streamed, and closed once the listener is done with it
+    assert not isinstance(res, list)
+    assert not closed
+    assert b"".join(res) == (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"Content-Type: text/plain\r\n"
+        b"\r\n"
+        b"7\r\nHello, \r\n"
+        b"6\r\nworld!\r\n"
+        b"0\r\n\r\n"
+    )
+    assert closed == [True]
+
+
+def test_wsgi_handler_streams_result_with_content_length_as_is():
+    def application(environ, start_response):
+        start_response("200 OK", [("Content-Length", "13")])
+        yield b"Hello, "
+        yield b"world!"
+
+    assert run(application) == (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 13\r\n\r\nHello, world!"
+    )
+
+
+def test_wsgi_handler_buffers_streamed_result_for_http_1_0():
+    def application(environ, start_response):
+        start_response("200 OK", [])
+        yield b"Hello, "
+        yield b"world!"
+
+    res = run(application, request=b"GET / HTTP/1.0\r\nConnection: keep-alive\r\n\r\n")
+
+    assert res == (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Length: 13\r\n"
+        b"Connection: keep-alive\r\n"
+        b"\r\n"
+        b"Hello, world!"
+    )
+
+
+def test_wsgi_handler_sends_written_body_first():
+    def application(environ, start_response):
+        write = start_response("200 OK", [])
+        write(b"Hello, ")
+        return [b"world!"]
+
+    assert run(application).endswith(b"Content-Length: 13\r\n\r\nHello, world!")
+
+
+def test_wsgi_handler_asks_to_close_connection():
+    res = run(hello_application, request=b"GET / HTTP/1.1\r\nConnection: close\r\n\r\n")
+
+    assert b"\r\nConnection: close\r\n" in res
+
+
+@pytest.mark.parametrize(
+    "application",
+    [
+        lambda environ, start_response: 1 / 0,
+        lambda environ, start_response: [b"no start_response"],
+        lambda environ, start_response: start_response("OK", []) or [b""],
+    ],
+)
+def test_wsgi_handler_responds_500_when_application_fails(application, caplog):
+    res = run(application)
+
+    assert res == b"HTTP/1.1 500 Internal Server Error\r\nContent-Length: 0\r\n\r\n"
+    assert "Error running WSGI application" in caplog.text
+
+
+def test_wsgi_handler_lets_application_replace_headers_on_error():
+    def application(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/html")])
+        try:
+            raise ValueError("Bad Stuff")
+        except ValueError:
+            start_response("400 Bad Request", [], sys.exc_info())
+        return [b"bad"]
+
+    assert run(application) == (
+        b"HTTP/1.1 400 Bad Request\r\nContent-Length: 3\r\n\r\nbad"
+    )
+
+
+def test_wsgi_handler_rejects_second_start_response_without_exc_info(caplog):
+    def application(environ, start_response):
+        start_response("200 OK", [])
+        start_response("200 OK", [])
+        return [b""]
+
+    assert run(application).startswith(b"HTTP/1.1 500 Internal Server Error")
+    assert "start_response was already called" in caplog.text
+
+
+def test_wsgi_handler_runs_application_on_worker_pool():
+    threads = []
+
+    def application(environ, start_response):
+        threads.append(threading.current_thread().name)
+        return hello_application(environ, start_response)
+
+    handler = WSGIHandler(application, max_workers=2)
+    try:
+        res = b"".join(handler.handle_connection(GET_REQUEST, None))
+    finally:
+        handler.shutdown()
+
+    assert res.endswith(b"Hello, world!")
+    assert threads[0].startswith("edunet-wsgi")
+
+
+def test_wsgi_handler_responds_503_when_worker_pool_is_full(caplog):
+    handler = WSGIHandler(hello_application, max_workers=1)
+    handler.worker_pool = Mock(
+        is_running=True, submit=Mock(side_effect=WorkerPoolFullError("full"))
+    )
+
+    res = b"".join(handler.handle_connection(GET_REQUEST, None))
+
+    assert res == b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n"
+    assert "Rejecting request: full" in caplog.text
+
+
+def test_wsgi_handler_keep_alive():
+    handler = WSGIHandler(hello_application, max_workers=None)
+
+    assert handler.keep_alive(GET_REQUEST) is True
+    assert handler.keep_alive(b"GET / HTTP/1.0\r\n\r\n") is False
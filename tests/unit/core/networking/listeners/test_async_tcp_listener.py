@@ -0,0 +1,359 @@
+import asyncio
+import socket
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.applications.async_application import AsyncApplication
+from edunet.core.applications.simple_http_application import SimpleHTTPApplication
+from edunet.core.applications.static_file_application import StaticFileApplication
+from edunet.core.networking.handlers.asgi_handler import ASGIHandler
+from edunet.core.networking.handlers.async_connection_handler import (
+    ExecutorConnectionHandler,
+)
+from edunet.core.networking.handlers.async_http_connection_handler import (
+    AsyncHTTPConnectionHandler,
+)
+from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.core.networking.listeners.async_tcp_listener import AsyncTCPListener
+from edunet.exceptions import TCPListenerError
+from edunet.models.http import HTTPResponse
+
+
+class MyAsyncApplication(AsyncApplication):
+    async def handle_request(self, request_data):
+        return HTTPResponse(
+            status_code=200, status_text="OK", body=request_data.uri.decode()
+        )
+
+
+class StreamingAsyncApplication(AsyncApplication):
+    async def handle_request(self, request_data):
+        chunks = (b"%d," % index * 1000 for index in range(100))
+        return HTTPResponse(status_code=200, status_text="OK", body=chunks)
+
+
+class SlowAsyncApplication(AsyncApplication):
+    async def handle_request(self, request_data):
+        await asyncio.sleep(0.2)
+        return HTTPResponse(status_code=200, status_text="OK", body="slow")
+
+
+@pytest.fixture
+def run_listener():
+    listeners = []
+
+    def _run(connection_handler, **kwargs):
+        listener = AsyncTCPListener("127.0.0.1", 0, connection_handler, **kwargs)
+        thread = threading.Thread(target=listener.start)
+        thread.start()
+        while not listener.is_listening:
+            time.sleep(0.01)
+        listeners.append((listener, thread))
+        return listener, listener.server_socket.getsockname()[1]
+
+    yield _run
+
+    for listener, thread in listeners:
+        listener.stop()
+        thread.join(timeout=5)
+
+
+def read_all(client):
+    data = b""
+    while True:
+        chunk = client.recv(65536)
+        if not chunk:
+            return data
+        data += chunk
+
+
+def read_response(client):
+    """
+    Read a single Content-Length delimited response off a kept-alive connection
+    """
+    data = b""
+    while b"\r\n\r\n" not in data:
+        data += client.recv(65536)
+    head, _, body = data.partition(b"\r\n\r\n")
+    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    while len(body) < length:
+        body += client.recv(65536)
+    return head + b"\r\n\r\n" + body
+
+
+CLOSE_REQUEST = b"GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+
+
+def send_request(port, request=CLOSE_REQUEST):
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(request)
+        return read_all(client)
+
+
+def test_async_tcp_listener_wraps_sync_connection_handler():
+    sync_handler = Mock(spec=ConnectionHandler)
+
+    listener = AsyncTCPListener("127.0.0.1", 0, sync_handler)
+
+    assert isinstance(listener.connection_handler, ExecutorConnectionHandler)
+    assert listener.connection_handler.connection_handler is sync_handler
+    assert listener.is_listening is False
+    listener.server_socket.close()
+
+
+def test_async_tcp_listener_start_failure():
+    listener = AsyncTCPListener("127.0.0.1", 0, Mock(spec=ConnectionHandler))
+    listener.server_socket.close()
+
+    with pytest.raises(TCPListenerError, match="Could not start service"):
+        listener.start()
+
+
+def test_async_tcp_listener_stop_when_not_started(caplog):
+    listener = AsyncTCPListener("127.0.0.1", 0, Mock(spec=ConnectionHandler))
+
+    listener.stop()
+
+    assert "Service is already stopped. Nothing to do." in caplog.text
+    listener.server_socket.close()
+
+
+def test_async_tcp_listener_serves_sync_handler_through_executor(run_listener):
+    _, port = run_listener(SimpleHTTPConnectionHandler(SimpleHTTPApplication()))
+
+    response = send_request(port)
+
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert b"Message received" in response
+
+
+def test_async_tcp_listener_handles_partial_reads(run_listener):
+    _, port = run_listener(AsyncHTTPConnectionHandler(SimpleHTTPApplication()))
+    request = b"POST /a HTTP/1.1\r\nConnection: close\r\nContent-Length: 5\r\n\r\nhello"
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        for index in range(0, len(request), 5):
+            client.sendall(request[index : index + 5])
+            time.sleep(0.01)
+        response = read_all(client)
+
+    assert b"body=b'hello'" in response
+
+
+def test_async_tcp_listener_serves_slow_requests_concurrently(run_listener):
+    _, port = run_listener(AsyncHTTPConnectionHandler(SlowAsyncApplication()))
+    responses = []
+
+    def client():
+        responses.append(send_request(port))
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(20)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert len(responses) == 20
+    assert all(response.endswith(b"slow") for response in responses)
+    # 20 requests sleeping 0.2s each would take 4s if they were serialised
+    assert elapsed < 2
+
+
+def test_async_tcp_listener_closes_connection_when_handler_fails(run_listener, caplog):
+    _, port = run_listener(AsyncHTTPConnectionHandler(SimpleHTTPApplication()))
+
+    assert send_request(port, b"INVALID_REQUEST\r\n\r\n") == b""
+    assert "Error handling client socket" in caplog.text
+
+
+def test_async_tcp_listener_stop_closes_open_connections(run_listener):
+    listener, port = run_listener(AsyncHTTPConnectionHandler(SimpleHTTPApplication()))
+    client = socket.create_connection(("127.0.0.1", port))
+
+    deadline = time.time() + 5
+    while listener.connection_count < 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert listener.connection_count == 1
+
+    listener.stop()
+
+    assert read_all(client) == b""
+    client.close()
+
+
+def test_async_tcp_listener_keeps_connection_alive_between_requests(run_listener):
+    listener, port = run_listener(AsyncHTTPConnectionHandler(MyAsyncApplication()))
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET /first HTTP/1.1\r\n\r\n")
+        assert read_response(client).endswith(b"/first")
+        client.sendall(b"GET /second HTTP/1.1\r\n\r\n")
+        assert read_response(client).endswith(b"/second")
+        assert listener.connection_count == 1
+
+
+def test_async_tcp_listener_closes_idle_keep_alive_connection(run_listener, caplog):
+    _, port = run_listener(
+        AsyncHTTPConnectionHandler(MyAsyncApplication()), keep_alive_timeout=0.2
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        read_response(client)
+        client.settimeout(5)
+        assert client.recv(65536) == b""
+
+    assert "Keep-alive connection idle. Closing connection" in caplog.text
+
+
+def test_async_tcp_listener_closes_connection_of_client_slow_to_send_its_request(
+    run_listener, caplog
+):
+    _, port = run_listener(
+        AsyncHTTPConnectionHandler(MyAsyncApplication()), client_timeout=0.3
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        # Given a client trickling its request in, a byte at a time
+        client.settimeout(0.05)
+        closed = False
+        for byte in b"GET / HTTP/1.1\r\nX-Padding: " + b"x" * 100:
+            try:
+                client.sendall(bytes([byte]))
+                closed = client.recv(65536) == b""
+            except socket.timeout:
+                pass
+            except OSError:
+                closed = True
+            if closed:
+                break
+
+    # Then I expect its connection to be closed once client_timeout is up
+    assert closed
+    assert "Client did not send a request in time. Closing connection" in caplog.text
+
+
+def test_async_tcp_listener_closes_connection_after_max_keep_alive_requests(
+    run_listener,
+):
+    _, port = run_listener(
+        AsyncHTTPConnectionHandler(MyAsyncApplication()), max_keep_alive_requests=2
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n" * 3)
+        response = read_all(client)
+
+    assert response.count(b"HTTP/1.1 200 OK") == 2
+
+
+class StaggeredAsyncApplication(AsyncApplication):
+    """
+    Answers /<n> after (5 - n) * 50ms, so later requests finish first
+    """
+
+    async def handle_request(self, request_data):
+        await asyncio.sleep((5 - int(request_data.uri[1:])) * 0.05)
+        return HTTPResponse(
+            status_code=200, status_text="OK", body=request_data.uri.decode()
+        )
+
+
+@pytest.mark.parametrize("concurrent_pipelining", [False, True])
+def test_async_tcp_listener_answers_pipelined_requests_in_order(
+    run_listener, concurrent_pipelining
+):
+    _, port = run_listener(
+        AsyncHTTPConnectionHandler(StaggeredAsyncApplication()),
+        concurrent_pipelining=concurrent_pipelining,
+    )
+    requests = b"".join(b"GET /%d HTTP/1.1\r\n\r\n" % index for index in range(4))
+    requests += b"GET /4 HTTP/1.1\r\nConnection: close\r\n\r\n"
+
+    started = time.perf_counter()
+    response = send_request(port, requests)
+    elapsed = time.perf_counter() - started
+
+    bodies = [
+        part.rsplit(b"\r\n\r\n", 1)[1] for part in response.split(b"HTTP/1.1 ")[1:]
+    ]
+    assert bodies == [b"/0", b"/1", b"/2", b"/3", b"/4"]
+    if concurrent_pipelining:
+        # Handled one after the other the requests take 0.75s in total
+        assert elapsed < 0.6
+    else:
+        assert elapsed >= 0.75
+
+
+def test_async_tcp_listener_receives_large_request_bodies(run_listener):
+    _, port = run_listener(AsyncHTTPConnectionHandler(SimpleHTTPApplication()))
+    body = b"x" * 200_000
+    request = b"POST /upload HTTP/1.1\r\nConnection: close\r\n"
+    request += b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+
+    response = send_request(port, request)
+
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert body in response
+
+
+def test_async_tcp_listener_streams_chunked_responses(run_listener):
+    _, port = run_listener(AsyncHTTPConnectionHandler(StreamingAsyncApplication()))
+
+    response = send_request(port)
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert b"Transfer-Encoding: chunked" in head
+    chunks = body.split(b"\r\n")
+    assert chunks[-3:] == [b"0", b"", b""]
+    assert b"".join(chunks[1:-3:2]) == b"".join(b"%d," % i * 1000 for i in range(100))
+
+
+async def slow_streaming_asgi_application(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for part in (b"Hello, ", b"world!"):
+        await asyncio.sleep(0.01)
+        await send({"type": "http.response.body", "body": part, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def test_async_tcp_listener_streams_asgi_responses(run_listener):
+    _, port = run_listener(ASGIHandler(slow_streaming_asgi_application))
+
+    responses = [send_request(port) for _ in range(2)]
+
+    assert (
+        responses[0]
+        == responses[1]
+        == (
+            b"HTTP/1.1 200 OK\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n"
+            b"\r\n"
+            b"7\r\nHello, \r\n"
+            b"6\r\nworld!\r\n"
+            b"0\r\n\r\n"
+        )
+    )
+
+
+def test_async_tcp_listener_sends_file_regions_with_sendfile(run_listener, tmp_path):
+    content = bytes(range(256)) * 32768
+    (tmp_path / "large.bin").write_bytes(content)
+    application = StaticFileApplication(str(tmp_path))
+    _, port = run_listener(SimpleHTTPConnectionHandler(application))
+
+    response = send_request(
+        port, b"GET /large.bin HTTP/1.1\r\nConnection: close\r\n\r\n"
+    )
+
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert response.endswith(b"\r\n\r\n" + content)
@@ -0,0 +1,408 @@
+import socket
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.applications.static_file_application import StaticFileApplication
+from edunet.core.networking.handlers.connection_handler import ConnectionHandler
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.core.networking.listeners.selector_listener import SelectorListener
+from edunet.exceptions import TCPListenerError
+from edunet.models.http import HTTPResponse
+
+
+def echo(request):
+    """
+    The bytes of a request, as they were sent
+    """
+    head = b"%s %s %s\r\n" % (request.method, request.uri, request.version)
+    head += b"".join(b"%s: %s\r\n" % field for field in request.headers.fields())
+    return head + b"\r\n" + request.body
+
+
+class EchoHTTPConnectionHandler(ConnectionHandler):
+    """
+    Answers every request with its own bytes, optionally padded to a large size and
+    optionally as separate head and body buffers
+    """
+
+    def __init__(self, padding: int = 0, keep_alive: bool = False, buffers=False):
+        self.padding = padding
+        self._keep_alive = keep_alive
+        self.buffers = buffers
+
+    def handle_connection(self, data, client_socket, keep_alive=None):
+        body = echo(data) + b"x" * self.padding
+        head = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body)
+        if self.buffers:
+            return [head, body]
+        return head + body
+
+    def create_request_framer(self):
+        return HTTPRequestParser()
+
+    def keep_alive(self, data):
+        return self._keep_alive
+
+
+class StreamingHTTPConnectionHandler(ConnectionHandler):
+    """
+    Answers every request with a body streamed from a generator, which can be made to
+    fail half way through
+    """
+
+    def __init__(self, chunks: int, fail: bool = False):
+        self.chunks = chunks
+        self.fail = fail
+
+    def handle_connection(self, data, client_socket, keep_alive=None):
+        response = HTTPResponse(status_code=200, status_text="OK", body=self.generate())
+        return response.to_buffers()
+
+    def generate(self):
+        for index in range(self.chunks):
+            yield b"x" * 65536
+        if self.fail:
+            raise ValueError("Bad stuff")
+
+    def create_request_framer(self):
+        return HTTPRequestParser()
+
+
+@pytest.fixture
+def run_listener():
+    listeners = []
+
+    def _run(connection_handler, **kwargs):
+        listener = SelectorListener("127.0.0.1", 0, connection_handler, **kwargs)
+        thread = threading.Thread(target=listener.start)
+        thread.start()
+        while not listener.is_listening:
+            time.sleep(0.01)
+        listeners.append((listener, thread))
+        return listener, listener.server_socket.getsockname()[1]
+
+    yield _run
+
+    for listener, thread in listeners:
+        if listener.is_listening:
+            listener.stop()
+        thread.join(timeout=5)
+
+
+def read_all(client):
+    data = b""
+    while True:
+        chunk = client.recv(65536)
+        if not chunk:
+            return data
+        data += chunk
+
+
+def read_response(client):
+    """
+    Read a single Content-Length delimited response off a kept-alive connection
+    """
+    data = b""
+    while b"\r\n\r\n" not in data:
+        data += client.recv(65536)
+    head, _, body = data.partition(b"\r\n\r\n")
+    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    while len(body) < length:
+        body += client.recv(65536)
+    return head + b"\r\n\r\n" + body
+
+
+def test_selector_listener_initialization_success():
+    handler = Mock(spec=ConnectionHandler)
+    listener = SelectorListener("127.0.0.1", 0, handler)
+
+    assert listener.hostname == "127.0.0.1"
+    assert listener.is_listening is False
+    assert listener.connection_handler is handler
+    assert listener.connection_count == 0
+
+    listener.server_socket.close()
+
+
+def test_selector_listener_accept_connection_raises_if_not_started():
+    listener = SelectorListener("127.0.0.1", 0, Mock(spec=ConnectionHandler))
+
+    with pytest.raises(RuntimeError, match="Service is not running"):
+        listener.accept_connection()
+
+    listener.server_socket.close()
+
+
+def test_selector_listener_start_failure(caplog):
+    listener = SelectorListener("127.0.0.1", 0, Mock(spec=ConnectionHandler))
+    listener.server_socket.close()
+
+    with pytest.raises(TCPListenerError, match="Could not start service"):
+        listener.start()
+
+    assert listener.is_listening is False
+
+
+def test_selector_listener_stop_when_already_stopped(caplog):
+    listener = SelectorListener("127.0.0.1", 0, Mock(spec=ConnectionHandler))
+
+    listener.stop()
+
+    assert "Service is already stopped. Nothing to do." in caplog.text
+    listener.server_socket.close()
+
+
+def test_selector_listener_serves_a_request(run_listener):
+    _, port = run_listener(EchoHTTPConnectionHandler())
+    request = b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(request)
+        response = read_all(client)
+
+    assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert response.endswith(request)
+
+
+def test_selector_listener_handles_partial_reads(run_listener):
+    _, port = run_listener(EchoHTTPConnectionHandler())
+    request = b"POST / HTTP/1.1\r\nContent-Length: 5\r\n\r\nhello"
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        for index in range(0, len(request), 7):
+            client.sendall(request[index : index + 7])
+            time.sleep(0.01)
+        response = read_all(client)
+
+    assert response.endswith(request)
+
+
+@pytest.mark.parametrize("buffers", [False, True])
+def test_selector_listener_handles_partial_writes(run_listener, buffers):
+    padding = 8 * 1024 * 1024
+    _, port = run_listener(EchoHTTPConnectionHandler(padding=padding, buffers=buffers))
+    request = b"GET / HTTP/1.1\r\n\r\n"
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(request)
+        response = read_all(client)
+
+    assert response.endswith(b"x" * padding)
+    assert len(response) > padding
+
+
+def test_selector_listener_streams_responses(run_listener):
+    _, port = run_listener(StreamingHTTPConnectionHandler(chunks=128))
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        response = read_all(client)
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert b"Transfer-Encoding: chunked" in head
+    assert body == b"10000\r\n" + b"x" * 65536 + b"\r\n" + body[65545:]
+    assert body.count(b"10000\r\n") == 128
+    assert body.endswith(b"\r\n0\r\n\r\n")
+
+
+def test_selector_listener_cuts_short_a_failing_stream(run_listener, caplog):
+    listener, port = run_listener(StreamingHTTPConnectionHandler(chunks=2, fail=True))
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        response = read_all(client)
+
+    assert b"Transfer-Encoding: chunked" in response
+    assert not response.endswith(b"0\r\n\r\n")
+    assert "Error streaming response: Bad stuff" in caplog.text
+    assert listener.connection_count == 0
+
+
+def test_selector_listener_keeps_many_idle_connections_on_one_thread(run_listener):
+    listener, port = run_listener(EchoHTTPConnectionHandler())
+    threads_before = threading.active_count()
+
+    idle_clients = [socket.create_connection(("127.0.0.1", port)) for _ in range(200)]
+    try:
+        deadline = time.time() + 5
+        while listener.connection_count < 200 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert listener.connection_count == 200
+        assert threading.active_count() == threads_before
+
+        # An active client still gets served while the others sit idle
+        with socket.create_connection(("127.0.0.1", port)) as client:
+            client.sendall(b"GET / HTTP/1.1\r\n\r\n")
+            assert read_all(client).startswith(b"HTTP/1.1 200 OK")
+    finally:
+        for idle_client in idle_clients:
+            idle_client.close()
+
+
+def test_selector_listener_closes_connection_when_handler_fails(run_listener, caplog):
+    handler = EchoHTTPConnectionHandler()
+    handler.handle_connection = Mock(side_effect=Exception("Bad stuff"))
+    _, port = run_listener(handler)
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        assert read_all(client) == b""
+
+    assert "Error handling client socket: Bad stuff" in caplog.text
+
+
+def test_selector_listener_stop_closes_open_connections(run_listener):
+    listener, port = run_listener(EchoHTTPConnectionHandler())
+    client = socket.create_connection(("127.0.0.1", port))
+
+    deadline = time.time() + 5
+    while listener.connection_count < 1 and time.time() < deadline:
+        time.sleep(0.01)
+
+    listener.stop()
+
+    assert read_all(client) == b""
+    client.close()
+
+
+def test_selector_listener_keeps_connection_alive_between_requests(run_listener):
+    listener, port = run_listener(EchoHTTPConnectionHandler(keep_alive=True))
+    first = b"GET /first HTTP/1.1\r\n\r\n"
+    second = b"GET /second HTTP/1.1\r\n\r\n"
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(first)
+        assert read_response(client).endswith(first)
+        client.sendall(second)
+        assert read_response(client).endswith(second)
+        assert listener.connection_count == 1
+
+
+def test_selector_listener_answers_pipelined_requests_in_order(run_listener):
+    _, port = run_listener(EchoHTTPConnectionHandler(keep_alive=True))
+    requests = [b"GET /%d HTTP/1.1\r\n\r\n" % index for index in range(3)]
+    expected = b"".join(
+        b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(request), request)
+        for request in requests
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"".join(requests))
+        response = b""
+        while len(response) < len(expected):
+            response += client.recv(65536)
+
+    assert response == expected
+
+
+def test_selector_listener_ignores_requests_pipelined_after_the_last_one(
+    run_listener,
+):
+    _, port = run_listener(EchoHTTPConnectionHandler(keep_alive=False))
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET /0 HTTP/1.1\r\n\r\nGET /1 HTTP/1.1\r\n\r\n")
+        response = read_all(client)
+
+    assert response.count(b"HTTP/1.1 200 OK") == 1
+    assert response.endswith(b"GET /0 HTTP/1.1\r\n\r\n")
+
+
+def test_selector_listener_closes_idle_keep_alive_connection(run_listener, caplog):
+    _, port = run_listener(
+        EchoHTTPConnectionHandler(keep_alive=True), keep_alive_timeout=0.2
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        read_response(client)
+        client.settimeout(5)
+        assert client.recv(65536) == b""
+
+    assert "Keep-alive connection idle. Closing connection" in caplog.text
+
+
+def test_selector_listener_closes_connection_of_client_slow_to_send_its_request(
+    run_listener, caplog
+):
+    _, port = run_listener(
+        EchoHTTPConnectionHandler(keep_alive=True), client_timeout=0.3
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        # Given a client trickling its request in, a byte at a time
+        client.settimeout(0.05)
+        closed = False
+        for byte in b"GET / HTTP/1.1\r\nX-Padding: " + b"x" * 100:
+            try:
+                client.sendall(bytes([byte]))
+                closed = client.recv(65536) == b""
+            except socket.timeout:
+                pass
+            except OSError:
+                closed = True
+            if closed:
+                break
+
+    # Then I expect its connection to be closed once client_timeout is up
+    assert closed
+    assert "Client did not send a request in time. Closing connection" in caplog.text
+
+
+def test_selector_listener_closes_connection_after_max_keep_alive_requests(
+    run_listener,
+):
+    _, port = run_listener(
+        EchoHTTPConnectionHandler(keep_alive=True), max_keep_alive_requests=2
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n" * 3)
+        response = read_all(client)
+
+    assert response.count(b"HTTP/1.1 200 OK") == 2
+
+
+def test_selector_listener_sends_file_regions_with_sendfile(run_listener, tmp_path):
+    content = bytes(range(256)) * 32768
+    (tmp_path / "large.bin").write_bytes(content)
+    application = StaticFileApplication(str(tmp_path))
+    _, port = run_listener(SimpleHTTPConnectionHandler(application))
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(
+            b"GET /large.bin HTTP/1.1\r\n\r\n"
+            b"GET /large.bin HTTP/1.1\r\nRange: bytes=-5\r\nConnection: close\r\n\r\n"
+        )
+        response = read_all(client)
+
+    first, second = response.split(b"HTTP/1.1 206 Partial Content\r\n")
+    assert first.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert first.endswith(b"\r\n\r\n" + content)
+    assert second.endswith(b"\r\n\r\n" + content[-5:])
+
+
+def test_selector_listener_announces_close_after_max_keep_alive_requests(
+    run_listener, tmp_path
+):
+    (tmp_path / "index.html").write_bytes(b"hi")
+    application = StaticFileApplication(str(tmp_path))
+    _, port = run_listener(
+        SimpleHTTPConnectionHandler(application), max_keep_alive_requests=2
+    )
+
+    with socket.create_connection(("127.0.0.1", port)) as client:
+        client.sendall(b"GET / HTTP/1.1\r\n\r\n" * 3)
+        response = read_all(client)
+
+    # Then I expect the last response before the connection closes to announce it
+    first, second = response.split(b"HTTP/1.1 200 OK\r\n")[1:]
+    assert b"Connection:" not in first
+    assert b"Connection: close\r\n" in second
@@ -1,11 +1,42 @@
 import socket
 import threading
-from unittest.mock import patch, PropertyMock
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import call, Mock, patch, PropertyMock
 
 import pytest
 
+from edunet.core.concurrency.worker_pool import OverflowPolicy, WorkerPool
+from edunet.core.networking.handlers.http_request_parser import HTTPRequestParser
+from edunet.core.networking.listeners.listener import READ_CHUNK_SIZE
 from edunet.core.networking.listeners.tcp_listener import TCPListener
-from edunet.exceptions import TCPListenerError
+from edunet.exceptions import TCPListenerError, WorkerPoolFullError
+
+
+def receive(*chunks):
+    """
+    Build a recv_into side effect that copies each chunk into the buffer it is given,
+    or raises it if it is an exception
+    """
+    remaining = list(chunks)
+
+    def recv_into(buffer):
+        chunk = remaining.pop(0) if remaining else b""
+        if isinstance(chunk, Exception):
+            raise chunk
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+    return recv_into
+
+
+def wait_for(condition, timeout=2.0):
+    """
+    Wait for a condition another thread brings about
+    """
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
 
 
 def test_tcp_listener_initialization_success(mock_connection_handler, mock_socket):
@@ -19,6 +50,37 @@ def test_tcp_listener_initialization_success(mock_connection_handler, mock_socke
 
     mock_socket.assert_called_once_with(socket.AF_INET, socket.SOCK_STREAM)
     mock_socket.return_value.bind.assert_called_once_with(("localhost", 8080))
+    assert tcp_listener.worker_pool is None
+
+
+def test_tcp_listener_initialization_with_worker_pool(
+    mock_connection_handler, mock_socket
+):
+    tcp_listener = TCPListener(
+        "localhost",
+        8080,
+        mock_connection_handler,
+        max_workers=4,
+        queue_size=16,
+        overflow=OverflowPolicy.REJECT,
+    )
+
+    assert isinstance(tcp_listener.worker_pool, WorkerPool)
+    assert tcp_listener.worker_pool.max_workers == 4
+    assert tcp_listener.worker_pool.queue_size == 16
+    assert tcp_listener.worker_pool.overflow is OverflowPolicy.REJECT
+    assert tcp_listener.worker_pool.is_running is False
+
+
+def test_tcp_listener_initialization_with_reuse_port(
+    mock_connection_handler, mock_socket
+):
+    TCPListener("localhost", 8080, mock_connection_handler, reuse_port=True)
+
+    mock_socket.return_value.setsockopt.assert_called_once_with(
+        socket.SOL_SOCKET, socket.SO_REUSEPORT, 1
+    )
+    mock_socket.return_value.bind.assert_called_once_with(("localhost", 8080))
 
 
 def test_tcp_listener_initialization_failure(mock_connection_handler, mock_socket):
@@ -114,9 +176,10 @@ def test_accept_connection_success(mock_thread, mock_socket, tcp_listener, caplo
 
     # Then I expect my methods to be called as such
     tcp_listener.server_socket.accept.assert_called_once_with()
-    mock_socket.recv.assert_called_once_with(1024)
+    mock_socket.recv.assert_not_called()
+    mock_socket.settimeout.assert_not_called()
     mock_thread.assert_called_with(
-        target=tcp_listener.handle_request, args=("some data", mock_socket)
+        target=tcp_listener._serve_client, args=(mock_socket,)
     )
     mock_thread.return_value.start.assert_called_once_with()
 
@@ -212,40 +275,132 @@ def test_accept_connection_logs_warning_and_continues_to_listen_if_client_connec
 
 @patch.object(socket, "socket", spec=socket.socket)
 @patch.object(threading, "Thread", spec=threading.Thread)
-def test_accept_connection_logs_warning_and_continues_to_listen_if_receiving_socket_data_fails(
-    mock_thread, mock_socket, mock_connection_handler, caplog
+def test_accept_connection_sets_client_timeout_when_configured(
+    mock_thread, mock_socket, tcp_listener
 ):
-    # We want to limit to a single loop to break the while True
-    sentinel = PropertyMock(
-        side_effect=[
-            False,  # Set for first instantiation as side_effect will be called
-            True,  # Set for making sure it passes an initial active check
-            True,  # Allows it to enter the while loop
-            True,  # Allows it to simulate still listening inside the exception
-            False,  # Does not allow it to continue back in to the loop
-        ]
+    # Given a listener configured with a client timeout
+    tcp_listener.client_timeout = 2.5
+    tcp_listener.server_socket.accept.return_value = (mock_socket, "some address")
+
+    # When the accept_connection is called
+    tcp_listener.accept_connection()
+
+    # Then I expect the timeout to be applied before the socket is dispatched
+    mock_socket.settimeout.assert_called_once_with(2.5)
+    mock_thread.assert_called_with(
+        target=tcp_listener._serve_client, args=(mock_socket,)
     )
-    TCPListener._is_listening = sentinel
 
-    tcp_listener = TCPListener("localhost", 8080, mock_connection_handler)
 
+@patch.object(socket, "socket", spec=socket.socket)
+@patch.object(TCPListener, "handle_request")
+def test_serve_client_reads_request_and_hands_it_off(
+    mock_handle_request, mock_socket, tcp_listener
+):
+    # Given a client that sends data
+    mock_socket.recv_into.side_effect = receive(b"some data")
+
+    # When the client is served
+    tcp_listener._serve_client(mock_socket)
+
+    # Then I expect the data to be read on the worker, into a pooled buffer
+    mock_socket.recv_into.assert_called_once()
+    (buffer,) = mock_socket.recv_into.call_args.args
+    assert len(buffer) == READ_CHUNK_SIZE
+    assert tcp_listener.buffer_pool.available == 1
+    mock_handle_request.assert_called_once_with(
+        b"some data", mock_socket, keep_alive=False
+    )
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+@patch.object(TCPListener, "handle_request")
+def test_serve_client_keeps_connection_alive_until_idle(
+    mock_handle_request, mock_socket, tcp_listener, caplog
+):
+    # Given a handler that keeps connections alive and a client that sends two
+    # requests then goes quiet
+    tcp_listener.connection_handler.keep_alive.return_value = True
+    mock_socket.recv_into.side_effect = receive(
+        b"first", b"second", socket.timeout("timed out")
+    )
+    mock_socket.fileno.return_value = -1
+
+    # When the client is served
+    tcp_listener._serve_client(mock_socket)
+
+    # Then I expect both requests to be handled on the same connection
+    assert mock_handle_request.call_args_list == [
+        call(b"first", mock_socket, keep_alive=True),
+        call(b"second", mock_socket, keep_alive=True),
+    ]
+    mock_socket.settimeout.assert_called_with(tcp_listener.keep_alive_timeout)
+
+    # Then I expect the idle connection to be closed
+    assert "Keep-alive connection idle. Closing connection" in caplog.text
+    assert "Could not receive data" not in caplog.text
+    mock_socket.close.assert_called_once_with()
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+@patch.object(TCPListener, "handle_request")
+def test_serve_client_closes_connection_after_max_keep_alive_requests(
+    mock_handle_request, mock_socket, tcp_listener
+):
+    # Given a connection capped at two requests
+    tcp_listener.max_keep_alive_requests = 2
+    tcp_listener.connection_handler.keep_alive.return_value = True
+    mock_socket.recv_into.side_effect = receive(b"first", b"second", b"third")
+
+    # When the client is served
+    tcp_listener._serve_client(mock_socket)
+
+    # Then I expect the second response to close the connection
+    assert mock_handle_request.call_args_list == [
+        call(b"first", mock_socket, keep_alive=True),
+        call(b"second", mock_socket, keep_alive=False),
+    ]
+    assert mock_socket.recv_into.call_count == 2
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+@patch.object(TCPListener, "handle_request")
+def test_serve_client_closes_connection_when_keep_alive_check_fails(
+    mock_handle_request, mock_socket, tcp_listener, caplog
+):
+    # Given a handler that cannot tell whether to keep the connection alive
+    tcp_listener.connection_handler.keep_alive.side_effect = ValueError("bad request")
+    mock_socket.recv_into.side_effect = receive(b"some data")
+
+    # When the client is served
+    tcp_listener._serve_client(mock_socket)
+
+    # Then I expect the connection to be closed after the response
+    assert "Could not tell whether to keep connection alive: bad request" in caplog.text
+    mock_handle_request.assert_called_once_with(
+        b"some data", mock_socket, keep_alive=False
+    )
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+@patch.object(TCPListener, "handle_request")
+def test_serve_client_logs_error_and_closes_socket_if_receiving_socket_data_fails(
+    mock_handle_request, mock_socket, tcp_listener, caplog
+):
     # Given a failure to receive socket data
-    tcp_listener.server_socket.accept.return_value = (mock_socket, "some address")
-    mock_socket.recv.side_effect = Exception("Bad things")
+    mock_socket.recv_into.side_effect = socket.timeout("timed out")
+    mock_socket.fileno.return_value = -1
 
-    # When the accept_connection is called
-    tcp_listener.accept_connection()
+    # When the client is served
+    tcp_listener._serve_client(mock_socket)
 
     # Then I expect my logging to behave as such
-    assert "Connection established." in caplog.text
-    assert f"The socket client: {mock_socket}" not in caplog.text
-    assert f"Error handling client socket: Bad things" in caplog.text
+    assert "Could not receive data: timed out" in caplog.text
 
     # Then I expect my methods to be called as such
-    tcp_listener.server_socket.accept.assert_called_once_with()
-    mock_socket.recv.assert_called_once_with(1024)
-    mock_thread.assert_not_called()
-    mock_thread.return_value.start.assert_not_called()
+    mock_socket.recv_into.assert_called_once()
+    mock_socket.close.assert_called_once_with()
+    mock_handle_request.assert_not_called()
 
 
 @patch.object(socket, "socket", spec=socket.socket)
@@ -281,9 +436,9 @@ def test_accept_connection_logs_warning_and_continues_to_listen_if_firing_off_th
 
     # Then I expect my methods to be called as such
     tcp_listener.server_socket.accept.assert_called_once_with()
-    mock_socket.recv.assert_called_once_with(1024)
+    mock_socket.recv.assert_not_called()
     mock_thread.assert_called_with(
-        target=tcp_listener.handle_request, args=("some data", mock_socket)
+        target=tcp_listener._serve_client, args=(mock_socket,)
     )
     mock_thread.return_value.start.assert_not_called()
 
@@ -302,7 +457,7 @@ def test_handle_request_sends_data_back_to_client_successfully(
     tcp_listener.handle_request(b"some_data", mock_socket)
 
     # Then I expect my logging to behave as such
-    assert "Data to be sent back: b'some response data'" in caplog.text
+    assert "Data to be sent back: 18 bytes" in caplog.text
     assert "Response sent back to client." in caplog.text
     assert "Could not send data" not in caplog.text
     assert "Closing connection" in caplog.text
@@ -311,13 +466,95 @@ def test_handle_request_sends_data_back_to_client_successfully(
 
     # Then I expect my methods to be called as such
     tcp_listener.connection_handler.handle_connection.assert_called_once_with(
-        b"some_data", mock_socket
+        b"some_data", mock_socket, keep_alive=False
     )
     mock_socket.sendall.assert_called_once_with(b"some response data")
     mock_socket.close.assert_called_once_with()
     mock_socket.fileno.assert_called_once_with()
 
 
+@patch.object(socket, "socket", spec=socket.socket)
+def test_serve_client_handles_pipelined_requests_concurrently_in_order(
+    mock_socket, tcp_listener
+):
+    # Given a client pipelining two requests where the first is the slowest to handle
+    first_started = threading.Event()
+    second_handled = threading.Event()
+
+    def handle_connection(data, client_socket, keep_alive):
+        if data.uri == b"/first":
+            first_started.set()
+            # Only finishes once the second request was handled alongside it
+            assert second_handled.wait(timeout=5)
+        else:
+            second_handled.set()
+        return b"response for " + data.uri
+
+    handler = tcp_listener.connection_handler
+    handler.create_request_framer.side_effect = HTTPRequestParser
+    handler.handle_connection.side_effect = handle_connection
+    handler.keep_alive.return_value = True
+    mock_socket.recv_into.side_effect = receive(
+        b"GET /first HTTP/1.1\r\n\r\nGET /second HTTP/1.1\r\n\r\n"
+    )
+
+    # When the client is served with a pipeline executor
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        tcp_listener.pipeline_executor = executor
+        tcp_listener._serve_client(mock_socket)
+
+    # Then I expect the responses to be sent back in request order
+    assert first_started.is_set()
+    assert mock_socket.sendall.call_args_list == [
+        call(b"response for /first"),
+        call(b"response for /second"),
+    ]
+    mock_socket.close.assert_called_once_with()
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+def test_handle_request_keeps_socket_open_when_keep_alive(
+    mock_socket, tcp_listener, caplog
+):
+    # Given a response for a kept-alive connection
+    tcp_listener.connection_handler.handle_connection.return_value = b"response"
+
+    # When the handle_request is called
+    tcp_listener.handle_request(b"some_data", mock_socket, keep_alive=True)
+
+    # Then I expect the response to be sent without closing the socket
+    mock_socket.sendall.assert_called_once_with(b"response")
+    mock_socket.close.assert_not_called()
+    assert "Closing connection" not in caplog.text
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+def test_handle_request_writes_response_buffers_with_sendmsg(mock_socket, tcp_listener):
+    # Given a response made of a head and a body, sent ten bytes at a time
+    tcp_listener.connection_handler.handle_connection.return_value = [
+        b"HTTP/1.1 200 OK\r\n\r\n",
+        b"body",
+    ]
+    sent = []
+
+    def sendmsg(buffers):
+        sent.append([bytes(buffer) for buffer in buffers])
+        return min(10, sum(len(buffer) for buffer in buffers))
+
+    mock_socket.sendmsg.side_effect = sendmsg
+
+    # When the handle_request is called
+    tcp_listener.handle_request(b"some_data", mock_socket, keep_alive=True)
+
+    # Then I expect the buffers to be written with vectored sends, without joining
+    assert sent == [
+        [b"HTTP/1.1 200 OK\r\n\r\n", b"body"],
+        [b"00 OK\r\n\r\n", b"body"],
+        [b"ody"],
+    ]
+    mock_socket.sendall.assert_not_called()
+
+
 @patch.object(socket, "socket", spec=socket.socket)
 def test_handle_request_raises_when_raising_with_socket_error(
     mock_socket, tcp_listener, caplog
@@ -333,7 +570,7 @@ def test_handle_request_raises_when_raising_with_socket_error(
         tcp_listener.handle_request(b"some_data", mock_socket)
 
     # Then I expect my logging to behave as such
-    assert "Data to be sent back: b'some response data'" not in caplog.text
+    assert "Data to be sent back: 18 bytes" not in caplog.text
     assert "Response sent back to client." not in caplog.text
     assert "Could not send data" in caplog.text
     assert "Closing connection" in caplog.text
@@ -342,7 +579,7 @@ def test_handle_request_raises_when_raising_with_socket_error(
 
     # Then I expect my methods to be called as such
     tcp_listener.connection_handler.handle_connection.assert_called_once_with(
-        b"some_data", mock_socket
+        b"some_data", mock_socket, keep_alive=False
     )
     mock_socket.sendall.assert_not_called()
     mock_socket.close.assert_called_once_with()
@@ -365,7 +602,7 @@ def test_handle_request_raises_when_sending_data_back_to_client_fails(
         tcp_listener.handle_request(b"some_data", mock_socket)
 
     # Then I expect my logging to behave as such
-    assert "Data to be sent back: b'some response data'" in caplog.text
+    assert "Data to be sent back: 18 bytes" in caplog.text
     assert "Response sent back to client." not in caplog.text
     assert "Could not send data" in caplog.text
     assert "Closing connection" in caplog.text
@@ -374,7 +611,7 @@ def test_handle_request_raises_when_sending_data_back_to_client_fails(
 
     # Then I expect my methods to be called as such
     tcp_listener.connection_handler.handle_connection.assert_called_once_with(
-        b"some_data", mock_socket
+        b"some_data", mock_socket, keep_alive=False
     )
     mock_socket.sendall.assert_called_once_with(b"some response data")
     mock_socket.close.assert_called_once_with()
@@ -396,7 +633,7 @@ def test_handle_request_logs_error_when_closing_client_socket_fails(
     tcp_listener.handle_request(b"some_data", mock_socket)
 
     # Then I expect my logging to behave as such
-    assert "Data to be sent back: b'some response data'" in caplog.text
+    assert "Data to be sent back: 18 bytes" in caplog.text
     assert "Response sent back to client." in caplog.text
     assert "Could not send data" not in caplog.text
     assert "Closing connection" in caplog.text
@@ -407,7 +644,7 @@ def test_handle_request_logs_error_when_closing_client_socket_fails(
 
     # Then I expect my methods to be called as such
     tcp_listener.connection_handler.handle_connection.assert_called_once_with(
-        b"some_data", mock_socket
+        b"some_data", mock_socket, keep_alive=False
     )
     mock_socket.sendall.assert_called_once_with(b"some response data")
     mock_socket.close.assert_called_once_with()
@@ -428,7 +665,7 @@ def test_handle_request_logs_error_when_closing_client_socket_is_successful_but_
     tcp_listener.handle_request(b"some_data", mock_socket)
 
     # Then I expect my logging to behave as such
-    assert "Data to be sent back: b'some response data'" in caplog.text
+    assert "Data to be sent back: 18 bytes" in caplog.text
     assert "Response sent back to client." in caplog.text
     assert "Could not send data" not in caplog.text
     assert "Closing connection" in caplog.text
@@ -439,7 +676,7 @@ def test_handle_request_logs_error_when_closing_client_socket_is_successful_but_
 
     # Then I expect my methods to be called as such
     tcp_listener.connection_handler.handle_connection.assert_called_once_with(
-        b"some_data", mock_socket
+        b"some_data", mock_socket, keep_alive=False
     )
     mock_socket.sendall.assert_called_once_with(b"some response data")
     mock_socket.close.assert_called_once_with()
@@ -461,7 +698,7 @@ def test_handle_request_closes_socket_after_failing_once(
     tcp_listener.handle_request(b"some_data", mock_socket)
 
     # Then I expect my logging to behave as such
-    assert "Data to be sent back: b'some response data'" in caplog.text
+    assert "Data to be sent back: 18 bytes" in caplog.text
     assert "Response sent back to client." in caplog.text
     assert "Could not send data" not in caplog.text
     assert "Closing connection" in caplog.text
@@ -472,8 +709,95 @@ def test_handle_request_closes_socket_after_failing_once(
 
     # Then I expect my methods to be called as such
     tcp_listener.connection_handler.handle_connection.assert_called_once_with(
-        b"some_data", mock_socket
+        b"some_data", mock_socket, keep_alive=False
     )
     mock_socket.sendall.assert_called_once_with(b"some response data")
     mock_socket.close.assert_called_once_with()
     mock_socket.fileno.assert_called_once_with()
+
+
+@patch.object(TCPListener, "accept_connection")
+def test_tcp_listener_start_and_stop_manage_worker_pool(
+    mock_accept_connection, mock_connection_handler, mock_socket
+):
+    tcp_listener = TCPListener(
+        "localhost", 8080, mock_connection_handler, max_workers=2
+    )
+
+    tcp_listener.start()
+    assert tcp_listener.worker_pool.is_running is True
+
+    tcp_listener.stop()
+    assert tcp_listener.worker_pool.is_running is False
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+@patch.object(threading, "Thread", spec=threading.Thread)
+def test_accept_connection_submits_to_worker_pool(
+    mock_thread, mock_socket, tcp_listener
+):
+    # Given a listener running in pooled mode
+    tcp_listener.worker_pool = Mock(spec=WorkerPool)
+    tcp_listener.server_socket.accept.return_value = (mock_socket, "some address")
+    mock_socket.recv.return_value = "some data"
+
+    # When the accept_connection is called
+    tcp_listener.accept_connection()
+
+    # Then I expect the work to go to the pool instead of a new thread
+    tcp_listener.worker_pool.submit.assert_called_once_with(
+        tcp_listener._serve_client, mock_socket
+    )
+    mock_thread.assert_not_called()
+
+
+@patch.object(socket, "socket", spec=socket.socket)
+def test_accept_connection_closes_client_socket_when_worker_pool_rejects(
+    mock_socket, tcp_listener, caplog
+):
+    # Given a pooled listener whose queue is full
+    tcp_listener.worker_pool = Mock(spec=WorkerPool)
+    tcp_listener.worker_pool.submit.side_effect = WorkerPoolFullError("queue is full")
+    tcp_listener.server_socket.accept.return_value = (mock_socket, "some address")
+    mock_socket.recv.return_value = "some data"
+    mock_socket.fileno.return_value = -1
+
+    # When the accept_connection is called
+    tcp_listener.accept_connection()
+
+    # Then I expect the client to be turned away without stopping the loop
+    assert "Rejecting connection: queue is full" in caplog.text
+    assert "Error handling client socket" not in caplog.text
+    mock_socket.close.assert_called_once_with()
+
+
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_tcp_listener_stop_wakes_workers_waiting_on_idle_clients(
+    mock_connection_handler, max_workers
+):
+    # Given a running listener with a client that connects but never sends anything
+    tcp_listener = TCPListener(
+        "127.0.0.1", 0, mock_connection_handler, max_workers=max_workers
+    )
+    port = tcp_listener.server_socket.getsockname()[1]
+    listener_thread = threading.Thread(target=tcp_listener.start, daemon=True)
+    listener_thread.start()
+    wait_for(lambda: tcp_listener.is_listening)
+    client = socket.create_connection(("127.0.0.1", port))
+    try:
+        wait_for(lambda: tcp_listener._clients)
+        assert len(tcp_listener._clients) == 1
+
+        # When the listener is stopped
+        stopper = threading.Thread(target=tcp_listener.stop, daemon=True)
+        stopper.start()
+        stopper.join(timeout=2)
+
+        # Then I expect it to stop without waiting on the client, and close it
+        assert not stopper.is_alive()
+        client.settimeout(2)
+        assert client.recv(1) == b""
+        listener_thread.join(timeout=2)
+        assert not listener_thread.is_alive()
+    finally:
+        client.close()
@@ -0,0 +1,57 @@
+import pytest
+
+from edunet.core.networking.buffer_pool import BufferPool
+
+
+def test_buffer_pool_allocates_buffers_of_the_configured_size():
+    pool = BufferPool(buffer_size=16)
+
+    buffer = pool.acquire()
+
+    assert isinstance(buffer, bytearray)
+    assert len(buffer) == 16
+    assert pool.available == 0
+
+
+def test_buffer_pool_reuses_released_buffers():
+    # Given a buffer handed back to the pool
+    pool = BufferPool(buffer_size=16)
+    buffer = pool.acquire()
+    pool.release(buffer)
+
+    # When another buffer is acquired
+    # Then I expect the same buffer back
+    assert pool.available == 1
+    assert pool.acquire() is buffer
+    assert pool.available == 0
+
+
+def test_buffer_pool_keeps_at_most_max_buffers():
+    pool = BufferPool(buffer_size=16, max_buffers=1)
+    first, second = pool.acquire(), pool.acquire()
+
+    pool.release(first)
+    pool.release(second)
+
+    assert pool.available == 1
+    assert pool.acquire() is first
+
+
+def test_buffer_pool_ignores_buffers_of_another_size():
+    pool = BufferPool(buffer_size=16)
+
+    pool.release(bytearray(8))
+
+    assert pool.available == 0
+
+
+@pytest.mark.parametrize(
+    "buffer_size, max_buffers, message",
+    [
+        (0, 1, "buffer_size must be at least 1"),
+        (16, -1, "max_buffers cannot be negative"),
+    ],
+)
+def test_buffer_pool_rejects_invalid_arguments(buffer_size, max_buffers, message):
+    with pytest.raises(ValueError, match=message):
+        BufferPool(buffer_size=buffer_size, max_buffers=max_buffers)
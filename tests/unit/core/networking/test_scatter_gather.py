@@ -0,0 +1,157 @@
+import socket
+import threading
+from collections import deque
+from unittest.mock import Mock
+
+import pytest
+
+from edunet.core.networking.scatter_gather import (
+    FileRegion,
+    as_buffers,
+    consume,
+    describe,
+    sendfile_some,
+    sendmsg_all,
+)
+
+
+def test_as_buffers_wraps_a_single_response_and_skips_empty_buffers():
+    assert as_buffers(b"response") == [b"response"]
+    assert as_buffers([b"head", b"", bytearray(b"body")]) == [b"head", b"body"]
+    assert as_buffers(b"") == []
+
+
+def test_describe_gives_sizes_without_contents():
+    assert describe(b"response") == "8 bytes"
+    assert describe(memoryview(b"abcd").cast("B", (2, 2))) == "4 bytes"
+    assert describe([b"head", bytearray(b"body")]) == "8 bytes in 2 buffers"
+    assert describe(iter([b"chunk"])) == "streamed response"
+
+
+def test_consume_drops_sent_bytes_without_copying():
+    body = bytearray(b"body")
+    buffers = deque(as_buffers([b"head", body]))
+
+    consume(buffers, 6)
+
+    assert list(buffers) == [b"dy"]
+    # Then I expect the remaining buffer to still point into the original body
+    body[3:] = b"!"
+    assert list(buffers) == [b"d!"]
+
+
+def test_sendmsg_all_picks_up_partial_sends():
+    # Given a socket that only accepts a few bytes per call
+    client_socket = Mock(spec=socket.socket)
+    written = []
+
+    def sendmsg(buffers):
+        data = b"".join(buffers)[:3]
+        written.append(data)
+        return len(data)
+
+    client_socket.sendmsg.side_effect = sendmsg
+
+    # When a response made of several buffers is sent
+    sendmsg_all(client_socket, [b"HTTP/1.1 200 OK\r\n", b"\r\n", b"Hello"])
+
+    # Then I expect every byte to be written once, in order
+    assert b"".join(written) == b"HTTP/1.1 200 OK\r\n\r\nHello"
+    client_socket.sendall.assert_not_called()
+
+
+def test_sendmsg_all_sends_a_single_buffer_with_sendall():
+    client_socket = Mock(spec=socket.socket)
+
+    sendmsg_all(client_socket, b"response")
+
+    client_socket.sendall.assert_called_once_with(b"response")
+    client_socket.sendmsg.assert_not_called()
+
+
+def test_sendmsg_all_joins_buffers_without_sendmsg():
+    # Given a socket on a platform without sendmsg
+    client_socket = Mock(spec=["sendall"])
+
+    sendmsg_all(client_socket, [b"head", b"body"])
+
+    client_socket.sendall.assert_called_once_with(b"headbody")
+
+
+def test_sendmsg_all_writes_streamed_buffers_as_they_are_produced():
+    client_socket = Mock(spec=socket.socket)
+
+    def stream():
+        yield b"head"
+        # Then I expect the head to be on its way before the body is produced
+        client_socket.sendall.assert_called_once_with(b"head")
+        yield b"body"
+
+    sendmsg_all(client_socket, stream())
+
+    assert client_socket.sendall.call_count == 2
+    client_socket.sendmsg.assert_not_called()
+
+
+@pytest.fixture
+def file_region(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"0123456789" * 100000)
+    with open(path, "rb", buffering=0) as file:
+        yield FileRegion(file, 5, 999990)
+
+
+def test_file_region_slices_and_reads_without_moving_file_position(file_region):
+    region = file_region[10:20]
+
+    assert (region.offset, region.count, len(region)) == (15, 10, 10)
+    assert region.read() == b"5678901234"
+    assert region.read(3) == b"567"
+    assert bytes(file_region[-3:]) == b"234"
+    assert file_region.file.tell() == 0
+
+
+def test_sendmsg_all_sends_file_regions_between_buffers(file_region):
+    # Given a response whose body is left in a file
+    server, client = socket.socketpair()
+    received = []
+    reader = threading.Thread(target=lambda: received.append(read_until_closed(client)))
+    reader.start()
+
+    # When it is sent
+    with server:
+        sendmsg_all(server, [b"head:", file_region, b":tail"])
+    reader.join()
+    client.close()
+
+    # Then I expect the file's bytes to go out in order between the buffers
+    assert received == [b"head:" + file_region.read() + b":tail"]
+
+
+def test_sendfile_some_sends_what_a_non_blocking_socket_takes(file_region):
+    server, client = socket.socketpair()
+    server.setblocking(False)
+
+    with server, client:
+        sent = sendfile_some(server, file_region)
+
+    assert 0 < sent <= len(file_region)
+
+
+def test_sendfile_some_raises_when_file_ends_short(tmp_path):
+    path = tmp_path / "short.bin"
+    path.write_bytes(b"abc")
+    server, client = socket.socketpair()
+
+    with open(path, "rb", buffering=0) as file, server, client:
+        with pytest.raises(OSError, match="3 bytes short"):
+            sendfile_some(server, FileRegion(file, 3, 3))
+
+
+def read_until_closed(client):
+    data = b""
+    while True:
+        chunk = client.recv(65536)
+        if not chunk:
+            return data
+        data += chunk
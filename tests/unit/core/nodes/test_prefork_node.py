@@ -0,0 +1,152 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+import pytest
+
+from edunet.core.applications.simple_http_application import SimpleHTTPApplication
+from edunet.core.networking.handlers.simple_http_connection_handler import (
+    SimpleHTTPConnectionHandler,
+)
+from edunet.core.networking.listeners.listener import Listener
+from edunet.core.networking.listeners.tcp_listener import TCPListener
+from edunet.core.nodes.prefork_node import PreforkNode
+
+
+class CrashingListener(Listener):
+    def accept_connection(self, *args, **kwargs):
+        pass
+
+    def handle_request(self, *args, **kwargs):
+        pass
+
+    def start(self, *args, **kwargs):
+        os._exit(1)
+
+    def stop(self, *args, **kwargs):
+        pass
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def send_request(port):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as client:
+        client.sendall(
+            b"GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n"
+        )
+        response = b""
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                return response
+            response += chunk
+
+
+@pytest.fixture
+def run_node():
+    nodes = []
+
+    def _run(node):
+        thread = threading.Thread(target=node.start)
+        thread.start()
+        nodes.append((node, thread))
+        return node
+
+    yield _run
+
+    for node, thread in nodes:
+        node.stop()
+        thread.join(timeout=15)
+
+
+def test_prefork_node_initialization_success():
+    node = PreforkNode(CrashingListener, workers=3)
+
+    assert node.workers == 3
+    assert node.listener is None
+    assert node.machine_started is False
+    assert node.worker_pids == []
+
+
+def test_prefork_node_defaults_to_one_worker_per_cpu():
+    node = PreforkNode(CrashingListener)
+
+    assert node.workers == (os.cpu_count() or 1)
+
+
+def test_prefork_node_stop_when_not_started(caplog):
+    node = PreforkNode(CrashingListener, workers=1)
+
+    node.stop()
+
+    assert "Machine already stopped. Nothing to do" in caplog.text
+
+
+def test_prefork_node_workers_share_the_port(run_node):
+    port = free_port()
+
+    def make_listener():
+        handler = SimpleHTTPConnectionHandler(SimpleHTTPApplication())
+        return TCPListener("127.0.0.1", port, handler, reuse_port=True)
+
+    node = run_node(PreforkNode(make_listener, workers=2))
+
+    assert wait_for(lambda: len(node.worker_pids) == 2)
+    assert wait_for(lambda: _accepts_connections(port))
+
+    responses = [send_request(port) for _ in range(10)]
+
+    assert all(r.startswith(b"HTTP/1.1 200 OK\r\n") for r in responses)
+
+
+def test_prefork_node_restarts_crashed_workers(run_node, caplog):
+    node = run_node(PreforkNode(CrashingListener, workers=1, restart_delay=0.05))
+
+    assert wait_for(lambda: node.restart_count >= 2)
+    assert "exited with code 1. Restarting it." in caplog.text
+
+
+def test_prefork_node_stop_terminates_workers(run_node):
+    port = free_port()
+
+    def make_listener():
+        handler = SimpleHTTPConnectionHandler(SimpleHTTPApplication())
+        return TCPListener("127.0.0.1", port, handler, reuse_port=True)
+
+    node = PreforkNode(make_listener, workers=2, restart_delay=0.05)
+    thread = threading.Thread(target=node.start)
+    thread.start()
+
+    assert wait_for(lambda: len(node.worker_pids) == 2)
+    assert wait_for(lambda: _accepts_connections(port))
+    processes = list(node._processes)
+
+    node.stop()
+    thread.join(timeout=15)
+
+    assert not thread.is_alive()
+    assert node.restart_count == 0
+    assert all(not process.is_alive() for process in processes)
+    # A worker still booting when SIGTERM arrives may not have its handler installed
+    assert all(process.exitcode in (0, -signal.SIGTERM) for process in processes)
+
+
+def _accepts_connections(port):
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=1):
+            return True
+    except OSError:
+        return False
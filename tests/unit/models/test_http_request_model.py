@@ -3,28 +3,26 @@ from unittest import mock
 import pytest
 
 from edunet.exceptions import HTTPValidationError, HTTPDataModelError
-from edunet.models.http import HTTPRequest
+from edunet.models.http import HTTPHeaders, HTTPRequest
 
 
-@mock.patch("edunet.models.http.validate_and_get_http_request_components")
+@mock.patch("edunet.models.http.split_http_request")
 def test_http_request_model_converts_get_call_from_bytes_successfully(
-    mock_validate_and_get_http_request_components,
+    mock_split_http_request,
 ):
     test_input = b"GET /index.html HTTP/1.1\r\nHost: www.example.com\r\nUser-Agent: Mozilla/5.0\r\nAccept: text/html\r\n\r\n"
 
-    mock_validate_and_get_http_request_components.return_value = (
-        b"GET /index.html HTTP/1.1",
-        {
-            b"Host": b"www.example.com",
-            b"User-Agent": b"Mozilla/5.0",
-            b"Accept": b"text/html",
-        },
+    mock_split_http_request.return_value = (
+        b"GET",
+        b"/index.html",
+        b"HTTP/1.1",
+        b"\r\nHost: www.example.com\r\nUser-Agent: Mozilla/5.0\r\nAccept: text/html",
         b"",
     )
 
     request_model = HTTPRequest.from_bytes(test_input)
 
-    mock_validate_and_get_http_request_components.assert_called_once_with(test_input)
+    mock_split_http_request.assert_called_once_with(test_input)
 
     assert request_model.headers == {
         b"Host": b"www.example.com",
@@ -37,25 +35,23 @@ def test_http_request_model_converts_get_call_from_bytes_successfully(
     assert request_model.body == b""
 
 
-@mock.patch("edunet.models.http.validate_and_get_http_request_components")
+@mock.patch("edunet.models.http.split_http_request")
 def test_http_request_model_converts_post_call_with_body_from_bytes_successfully(
-    mock_validate_and_get_http_request_components,
+    mock_split_http_request,
 ):
     test_input = b"GET /index.html HTTP/1.1\r\nHost: www.example.com\r\nUser-Agent: Mozilla/5.0\r\nAccept: text/html\r\n\r\nHello World"
 
-    mock_validate_and_get_http_request_components.return_value = (
-        b"POST /index.html HTTP/1.1",
-        {
-            b"Host": b"www.example.com",
-            b"User-Agent": b"Mozilla/5.0",
-            b"Accept": b"text/html",
-        },
+    mock_split_http_request.return_value = (
+        b"POST",
+        b"/index.html",
+        b"HTTP/1.1",
+        b"\r\nHost: www.example.com\r\nUser-Agent: Mozilla/5.0\r\nAccept: text/html",
         b"Hello World",
     )
 
     request_model = HTTPRequest.from_bytes(test_input)
 
-    mock_validate_and_get_http_request_components.assert_called_once_with(test_input)
+    mock_split_http_request.assert_called_once_with(test_input)
 
     assert request_model.headers == {
         b"Host": b"www.example.com",
@@ -69,13 +65,130 @@ def test_http_request_model_converts_post_call_with_body_from_bytes_successfully
 
 
 @pytest.mark.parametrize("exc", [AttributeError, HTTPValidationError])
-@mock.patch("edunet.models.http.validate_and_get_http_request_components")
-def test_http_request_model_raises_on_failure(
-    mock_validate_and_get_http_request_components, exc
-):
-    mock_validate_and_get_http_request_components.side_effect = exc("Bad Stuff")
+@mock.patch("edunet.models.http.split_http_request")
+def test_http_request_model_raises_on_failure(mock_split_http_request, exc):
+    mock_split_http_request.side_effect = exc("Bad Stuff")
 
     with pytest.raises(
         HTTPDataModelError, match="Error creating Request object: Bad Stuff"
     ):
         HTTPRequest.from_bytes(b"will fail")
+
+
+@pytest.mark.parametrize(
+    "version, headers, expected",
+    [
+        (b"HTTP/1.1", {}, True),
+        (b"HTTP/1.1", {b"Connection": b"keep-alive"}, True),
+        (b"HTTP/1.1", {b"Connection": b"close"}, False),
+        (b"HTTP/1.1", {b"connection": b"Upgrade, Close"}, False),
+        (b"HTTP/1.0", {}, False),
+        (b"HTTP/1.0", {b"Connection": b"Keep-Alive"}, True),
+    ],
+)
+def test_http_request_model_keep_alive(version, headers, expected):
+    request = HTTPRequest(
+        method=b"GET", uri=b"/", version=version, headers=headers, body=b""
+    )
+
+    assert request.keep_alive is expected
+
+
+def test_http_request_model_splits_path_and_query():
+    request = HTTPRequest(
+        method=b"GET",
+        uri=b"/search?q=edunet&page=2",
+        version=b"HTTP/1.1",
+        headers={},
+        body=b"",
+    )
+
+    assert request.path == b"/search"
+    assert request.query == b"q=edunet&page=2"
+
+    # When the URI is replaced
+    request.uri = b"/about"
+
+    # Then path and query follow it
+    assert request.path == b"/about"
+    assert request.query == b""
+
+
+def test_http_request_model_is_slotted():
+    request = HTTPRequest(
+        method=b"GET", uri=b"/", version=b"HTTP/1.1", headers={}, body=b""
+    )
+
+    assert not hasattr(request, "__dict__")
+    with pytest.raises(AttributeError):
+        request.extra = True
+
+
+def test_http_request_model_compares_and_reprs_like_its_fields():
+    raw = HTTPRequest(
+        method=b"GET",
+        uri=b"/",
+        version=b"HTTP/1.1",
+        headers=HTTPHeaders.from_raw(b"\r\nHost: a"),
+        body=b"",
+    )
+    parsed = HTTPRequest(
+        method=b"GET", uri=b"/", version=b"HTTP/1.1", headers={b"Host": b"a"}, body=b""
+    )
+
+    assert raw == parsed
+    assert raw != HTTPRequest(
+        method=b"GET", uri=b"/", version=b"HTTP/1.1", headers={}, body=b""
+    )
+    assert repr(raw) == (
+        "HTTPRequest(method=b'GET', uri=b'/', version=b'HTTP/1.1', "
+        "headers={b'Host': b'a'}, body=b'')"
+    )
+
+
+def test_http_headers_looks_up_raw_block_without_indexing_it():
+    headers = HTTPHeaders.from_raw(
+        b"\r\nHost: example.com\r\nAccept: text/html\r\naccept: application/json"
+    )
+
+    assert headers[b"HOST"] == b"example.com"
+    assert headers.get(b"accept") == b"application/json"
+    assert headers.get(b"missing", b"default") == b"default"
+    assert headers.get_all(b"Accept") == [b"text/html", b"application/json"]
+    assert headers.get_all(b"missing") == []
+    assert b"Host" in headers
+    assert b"Hos" not in headers
+    assert headers._index is None
+
+    with pytest.raises(KeyError):
+        headers[b"missing"]
+
+
+def test_http_headers_indexes_raw_block_when_needed():
+    headers = HTTPHeaders.from_raw(
+        b"\r\nHost: example.com\r\nAccept: text/html\r\nAccept: application/json"
+    )
+
+    assert dict(headers) == {
+        b"Host": b"example.com",
+        b"Accept": b"application/json",
+    }
+    assert len(headers) == 2
+    assert headers.fields() == [
+        (b"Host", b"example.com"),
+        (b"Accept", b"text/html"),
+        (b"Accept", b"application/json"),
+    ]
+    assert headers._raw is None
+    assert headers.get(b"ACCEPT") == b"application/json"
+    assert headers.get_all(b"Accept") == [b"text/html", b"application/json"]
+
+
+def test_http_headers_from_fields():
+    headers = HTTPHeaders({b"Content-Type": b"text/plain"})
+
+    assert headers[b"content-type"] == b"text/plain"
+    assert headers == {b"Content-Type": b"text/plain"}
+    assert headers == HTTPHeaders.from_raw(b"\r\nContent-Type: text/plain")
+    assert repr(headers) == "{b'Content-Type': b'text/plain'}"
+    assert HTTPHeaders.from_raw(b"") == {}
@@ -1,7 +1,18 @@
+from array import array
+
 import pytest
 
+from edunet.core.networking.scatter_gather import FileRegion
 from edunet.exceptions import HTTPDataModelError
-from edunet.models.http import HTTPResponse
+from edunet.models.http import (
+    _cached_header_line,
+    encode_header_line,
+    encode_status_line,
+    HTTPResponse,
+    HTTPResponseTemplate,
+    MAX_CACHED_HEADER_LINES,
+    STATUS_LINES,
+)
 
 
 def test_http_response_model_converts_get_call_from_bytes_successfully():
@@ -76,7 +87,7 @@ def test_http_response_model_raises_on_typeerror_exception_failure():
     response_model = HTTPResponse(
         status_code=200,
         status_text="OK",
-        body=b"Hello World",
+        body=42,
         http_version="HTTP/1.1",
         content_type="text/html",
         additional_headers=None,
@@ -84,6 +95,219 @@ def test_http_response_model_raises_on_typeerror_exception_failure():
 
     with pytest.raises(
         HTTPDataModelError,
-        match="Error creating response message: 'bytes' object has no attribute 'encode'",
+        match=(
+            "Error creating response message: "
+            "body must be str, bytes-like or an iterable of chunks, not int"
+        ),
     ):
         response_model.to_bytes()
+
+
+@pytest.mark.parametrize(
+    "body", [b"Hello World", bytearray(b"Hello World"), memoryview(b"Hello World")]
+)
+def test_http_response_model_sends_binary_body_as_is(body):
+    response_model = HTTPResponse(status_code=200, status_text="OK", body=body)
+
+    status_line, header_block, body_buffer = response_model.to_buffers()
+
+    assert header_block == b"Content-Length: 11\r\n\r\n"
+    assert body_buffer == b"Hello World"
+    if not isinstance(body, memoryview):
+        assert body_buffer is body
+
+
+def test_http_response_model_frames_non_ascii_body_by_byte_length():
+    response_model = HTTPResponse(status_code=200, status_text="OK", body="héllo ✓")
+
+    assert response_model.to_bytes() == (
+        b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n" + "héllo ✓".encode()
+    )
+
+
+def test_http_response_model_frames_memoryview_body_by_byte_length():
+    body = memoryview(array("I", [1, 2, 3]))
+    response_model = HTTPResponse(status_code=200, status_text="OK", body=body)
+
+    _, header_block, body_buffer = response_model.to_buffers()
+
+    assert header_block == b"Content-Length: %d\r\n\r\n" % body.nbytes
+    assert bytes(body_buffer) == body.tobytes()
+
+
+def test_http_response_model_leaves_file_region_body_in_its_file(tmp_path):
+    path = tmp_path / "body.txt"
+    path.write_bytes(b"Hello World")
+
+    with open(path, "rb", buffering=0) as file:
+        body = FileRegion(file, 6, 5)
+        response_model = HTTPResponse(status_code=200, status_text="OK", body=body)
+
+        _, header_block, body_buffer = response_model.to_buffers()
+
+        assert header_block == b"Content-Length: 5\r\n\r\n"
+        assert body_buffer is body
+        assert response_model.to_bytes().endswith(b"\r\n\r\nWorld")
+
+
+def test_http_response_model_sends_only_the_head_when_head_only():
+    produced = []
+
+    def chunks():
+        produced.append(b"hello")
+        yield b"hello"
+
+    sized = HTTPResponse(status_code=200, status_text="OK", body="Hello World")
+    streamed = HTTPResponse(status_code=200, status_text="OK", body=chunks())
+
+    assert sized.to_buffers(head_only=True) == [
+        b"HTTP/1.1 200 OK\r\n",
+        b"Content-Length: 11\r\n\r\n",
+    ]
+    assert b"".join(streamed.to_buffers(head_only=True)) == (
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+    )
+    assert produced == []
+
+
+def test_http_response_model_serializes_to_separate_buffers():
+    response_model = HTTPResponse(
+        status_code=200,
+        status_text="OK",
+        body="Hello World",
+        content_type="text/html",
+    )
+
+    buffers = response_model.to_buffers()
+
+    assert buffers == [
+        b"HTTP/1.1 200 OK\r\n",
+        b"Content-Length: 11\r\nContent-Type: text/html\r\n\r\n",
+        b"Hello World",
+    ]
+    assert b"".join(buffers) == response_model.to_bytes()
+
+
+def test_encode_status_line_uses_precomputed_table_for_standard_statuses():
+    assert STATUS_LINES[("HTTP/1.1", 404, "Not Found")] == b"HTTP/1.1 404 Not Found\r\n"
+    assert (
+        encode_status_line("HTTP/1.1", 200, "OK")
+        is STATUS_LINES[("HTTP/1.1", 200, "OK")]
+    )
+    assert encode_status_line("HTTP/1.1", 299, "Custom") == b"HTTP/1.1 299 Custom\r\n"
+
+
+def test_encode_header_line_encodes_each_line_once():
+    first = encode_header_line("Content-Type", "text/html")
+
+    assert first == b"Content-Type: text/html\r\n"
+    assert encode_header_line("Content-Type", "text/html") is first
+    # Then I expect values that compare equal across types to stay apart
+    assert encode_header_line("X-Flag", True) == b"X-Flag: True\r\n"
+    assert encode_header_line("X-Flag", 1) == b"X-Flag: 1\r\n"
+
+
+def test_encode_header_line_keeps_recently_used_lines_past_cache_size():
+    # Given a header sent with every response
+    common = encode_header_line("Server", "edunet")
+
+    # When more one-off values than the cache holds are encoded in between
+    for index in range(MAX_CACHED_HEADER_LINES * 2):
+        encode_header_line("ETag", f'"{index}"')
+        assert encode_header_line("Server", "edunet") is common
+
+    # Then I expect the one-off values to have been evicted rather than kept forever
+    first = encode_header_line("ETag", '"0"')
+    assert first == b'ETag: "0"\r\n'
+    assert encode_header_line("ETag", '"0"') is first
+    assert _cached_header_line.cache_info().currsize <= MAX_CACHED_HEADER_LINES
+
+
+def test_http_response_template_serializes_static_parts_once():
+    # Given a template with a content type and a fixed header
+    template = HTTPResponseTemplate(
+        200, "OK", content_type="text/html", headers={"Server": "edunet"}
+    )
+
+    # When responses are created from it
+    response = template.response(body="Hello", additional_headers={"a": "b"})
+
+    # Then I expect them to reuse the template's bytes
+    status_line, header_block, body = response.to_buffers()
+    assert status_line is template.status_line
+    assert header_block == (
+        b"Content-Length: 5\r\nContent-Type: text/html\r\nServer: edunet\r\n"
+        b"a: b\r\n\r\n"
+    )
+    assert body == b"Hello"
+    assert response == HTTPResponse(
+        status_code=200,
+        status_text="OK",
+        body="Hello",
+        content_type="text/html",
+        additional_headers={"a": "b"},
+    )
+
+
+def test_http_response_template_is_bypassed_when_response_status_changes():
+    template = HTTPResponseTemplate(200, "OK", headers={"Server": "edunet"})
+    response = template.response(body="")
+
+    response.status_code, response.status_text = 404, "Not Found"
+
+    assert response.to_bytes() == (
+        b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nServer: edunet\r\n\r\n"
+    )
+
+
+def test_http_response_model_merges_template_and_additional_headers():
+    template = HTTPResponseTemplate(200, "OK", headers={"Server": "edunet", "X-A": "1"})
+    response = template.response(body="", additional_headers={"X-A": "2"})
+
+    assert response.all_headers() == {"Server": "edunet", "X-A": "2"}
+    assert HTTPResponse(200, "OK", body="").all_headers() == {}
+
+
+def test_http_response_model_streams_iterable_body_with_chunked_coding():
+    # Given a body produced by a generator
+    produced = []
+
+    def generate():
+        for chunk in ("Hello", b"", bytearray(b", "), memoryview(b"world!")):
+            produced.append(chunk)
+            yield chunk
+
+    response_model = HTTPResponse(status_code=200, status_text="OK", body=generate())
+
+    # When the response is serialized
+    buffers = iter(response_model.to_buffers())
+
+    # Then I expect the head to be ready before any chunk is produced
+    assert next(buffers) == b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+    assert produced == []
+
+    # Then I expect every non-empty chunk to be framed as it is produced
+    assert next(buffers) == b"5\r\nHello\r\n"
+    assert len(produced) == 1
+    assert list(buffers) == [b"2\r\n, \r\n", b"6\r\nworld!\r\n", b"0\r\n\r\n"]
+
+
+def test_http_response_model_raises_on_invalid_streamed_chunk():
+    response_model = HTTPResponse(status_code=200, status_text="OK", body=[b"ok", 42])
+
+    with pytest.raises(HTTPDataModelError, match="Error streaming response body"):
+        response_model.to_bytes()
+
+
+@pytest.mark.parametrize("body", ["ignored", iter([b"ignored"])])
+def test_http_response_model_sends_not_modified_response_without_body(body):
+    response_model = HTTPResponse(
+        status_code=304,
+        status_text="Not Modified",
+        body=body,
+        additional_headers={"ETag": '"v1"'},
+    )
+
+    assert response_model.to_bytes() == (
+        b'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\n\r\n'
+    )
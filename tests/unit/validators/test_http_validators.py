@@ -1,10 +1,17 @@
+import re
 import string
 
 import pytest
-from hypothesis import given, strategies as st
+from hypothesis import assume, given, strategies as st
 
 from edunet.exceptions import HTTPValidationError
-from edunet.validators.http_validators import validate_and_get_http_request_components
+from edunet.validators.http_validators import (
+    parse_http_request,
+    parse_request_line,
+    split_http_request,
+    validate_and_get_header,
+    validate_and_get_http_request_components,
+)
 
 
 @st.composite
@@ -107,3 +114,140 @@ def test_validate_http_request_strategy(request_input):
     # The second is the expected tuple result to ensure that we not only validated,
     # but we also split it up as expected
     assert res == request_input[1]
+
+
+def test_parse_http_request():
+    assert parse_http_request(
+        b"POST /a b HTTP/1.0\r\nHost: localhost\r\n\r\nbody\r\n\r\nmore"
+    ) == (b"POST", b"/a b", b"HTTP/1.0", {b"Host": b"localhost"}, b"body\r\n\r\nmore")
+
+
+def test_parse_http_request_without_empty_line():
+    assert parse_http_request(b"GET / HTTP/1.1\r\nHost: localhost") == (
+        b"GET",
+        b"/",
+        b"HTTP/1.1",
+        {b"Host": b"localhost"},
+        b"",
+    )
+
+    with pytest.raises(HTTPValidationError, match="Invalid header pattern: b''"):
+        parse_http_request(b"GET / HTTP/1.1\r\n")
+
+
+@pytest.mark.parametrize(
+    "input_request, expected_result",
+    [
+        (b"GET /\r HTTP/1.1\r\n\r\n", "Invalid request line pattern"),
+        (b"GET / HTTP/1.1\r\nA: b\nc\r\n\r\n", "Invalid header pattern: b'A: b\\nc'"),
+        (b"GET / HTTP/1.1\r\nA: b\r\nC: \rd", "Invalid header pattern: b'C: \\rd'"),
+    ],
+)
+def test_parse_http_request_raises_on_stray_line_breaks(input_request, expected_result):
+    with pytest.raises(HTTPValidationError, match=re.escape(expected_result)):
+        parse_http_request(input_request)
+
+
+def test_split_http_request():
+    assert split_http_request(
+        b"POST /a HTTP/1.0\r\nHost: localhost\r\nA: b\r\n\r\nbody\r\n\r\nmore"
+    ) == (
+        b"POST",
+        b"/a",
+        b"HTTP/1.0",
+        b"\r\nHost: localhost\r\nA: b",
+        b"body\r\n\r\nmore",
+    )
+    assert split_http_request(b"GET / HTTP/1.1\r\n\r\n") == (
+        b"GET",
+        b"/",
+        b"HTTP/1.1",
+        b"",
+        b"",
+    )
+
+
+@given(
+    st.lists(
+        st.sampled_from(
+            [b"GET / HTTP/1.1", b"\r\n", b"Host: a", b"A: b: c", b"x", b"\r", b"\n"]
+            + [b": ", b"\r\n\r\n"]
+        ),
+        max_size=8,
+    ).map(b"".join)
+)
+def test_split_http_request_matches_parse_http_request(request):
+    try:
+        method, uri, version, headers, body = parse_http_request(request)
+    except HTTPValidationError:
+        with pytest.raises(HTTPValidationError):
+            split_http_request(request)
+        return
+
+    split_method, split_uri, split_version, block, split_body = split_http_request(
+        request
+    )
+    assert (split_method, split_uri, split_version, split_body) == (
+        method,
+        uri,
+        version,
+        body,
+    )
+    fields = [line.partition(b": ") for line in block.split(b"\r\n")[1:]]
+    assert {name: value for name, _, value in fields} == headers
+
+
+def test_validate_and_get_header():
+    assert validate_and_get_header(b"Host: localhost: 8080") == (
+        b"Host",
+        b"localhost: 8080",
+    )
+
+
+@pytest.mark.parametrize(
+    "validate, line",
+    [
+        (parse_request_line, b"get / HTTP/1.1"),
+        (parse_request_line, b"GET HTTP/1.1"),
+        (parse_request_line, b"GET /\n HTTP/1.1"),
+        (validate_and_get_header, b"Host:localhost"),
+        (validate_and_get_header, b": localhost"),
+        (validate_and_get_header, b"Host: local\rhost"),
+    ],
+)
+def test_validate_single_lines_raise(validate, line):
+    with pytest.raises(HTTPValidationError):
+        validate(line)
+
+
+# The regular expressions requests used to be validated with
+REQUEST_LINE_PATTERN = re.compile(rb"^[A-Z]+ [^\r\n]* HTTP/(1\.[01]|2\.0)$")
+HEADER_PATTERN = re.compile(rb"^[^\r\n]+: [^\r\n]*$")
+
+
+@given(
+    st.lists(
+        st.sampled_from(
+            [b"GET", b"get", b"P0ST", b" ", b"/", b"a", b"HTTP/1.1", b"HTTP/2.0"]
+            + [b"HTTP/3.0", b"\r", b"\n", b":", b": "]
+        ),
+        max_size=8,
+    ).map(b"".join)
+)
+def test_single_pass_validation_matches_regular_expressions(line):
+    # A line ending in a lone newline was let through by "$" in the old expressions
+    assume(not line.endswith(b"\n"))
+
+    try:
+        parse_request_line(line)
+    except HTTPValidationError:
+        assert not REQUEST_LINE_PATTERN.match(line)
+    else:
+        assert REQUEST_LINE_PATTERN.match(line)
+
+    try:
+        assert validate_and_get_header(line) == tuple(line.split(b": ", 1))
+    except HTTPValidationError:
+        assert not HEADER_PATTERN.match(line)
+    else:
+        assert HEADER_PATTERN.match(line)